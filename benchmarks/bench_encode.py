@@ -0,0 +1,39 @@
+"""
+Microbenchmark of the request encoding hot path.
+
+Compares encoding a memory area read the generic way, building a Header and
+a Command per request, against the precompiled command templates used by the
+clients.
+
+    python -m benchmarks.bench_encode
+"""
+
+import timeit
+
+from fins import Command, CommandCode, FinsClient, MemoryArea
+
+
+def encode_generic(client: FinsClient) -> bytes:
+    return Command(
+        code=CommandCode.MEMORY_AREA_READ,
+        data=MemoryArea("D100").raw + (10).to_bytes(2, "big"),
+        header=client._build_header(),
+    ).raw
+
+
+def encode_template(client: FinsClient) -> bytes:
+    return client._memory_area_read_command("D100", 10).raw
+
+
+def main() -> None:
+    client = FinsClient()
+    number = 200_000
+    assert encode_generic(client)[10:] == encode_template(client)[10:]
+    for name, func in [("generic", encode_generic), ("template", encode_template)]:
+        best = min(timeit.repeat(lambda: func(client), number=number, repeat=5))
+        print(f"{name:>10}: {best / number * 1e9:8.0f} ns/request")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Benchmark suite of the codec and of end-to-end request throughput.
+
+Every benchmark reports its throughput in operations per second and the
+p50/p99/p999 latency of a single operation. Codec operations are too fast to
+be timed one by one, their latency samples are averages over small batches.
+End-to-end benchmarks run against a loopback :class:`FinsSimulator`.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare results.json --filter codec
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fins import (
+    Command,
+    CommandCode,
+    FinsClient,
+    Header,
+    MemoryArea,
+    Response,
+    __version__,
+)
+from fins.adapters import MultipleMemoryAreaReadDataAdapter
+from fins.simulator import FinsSimulator
+
+#: Number of codec operations timed together as one latency sample.
+BATCH = 100
+
+#: End-to-end benchmarks, run once per transport.
+END_TO_END = ("single_read", "multiple_read", "block_read_4000", "pipelined_read_x32")
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Returns the ``fraction`` percentile of sorted ``samples``."""
+    index = min(len(samples) - 1, int(fraction * len(samples)))
+    return samples[index]
+
+
+def measure(func: Callable[[], object], duration: float, batch: int = 1) -> Dict:
+    """Call ``func`` for ``duration`` seconds and summarize the timings."""
+    for _ in range(batch):
+        func()  # warm up caches
+    clock = time.perf_counter
+    samples: List[float] = []
+    start = clock()
+    end = start + duration
+    while True:
+        before = clock()
+        for _ in range(batch):
+            func()
+        after = clock()
+        samples.append((after - before) / batch)
+        if after >= end:
+            break
+    elapsed = clock() - start
+    samples.sort()
+    return {
+        "ops_per_sec": len(samples) * batch / elapsed,
+        "p50_us": percentile(samples, 0.5) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+        "p999_us": percentile(samples, 0.999) * 1e6,
+        "samples": len(samples),
+    }
+
+
+def codec_benchmarks() -> List[Tuple[str, Callable[[], object]]]:
+    client = FinsClient()
+    client.close()
+    addresses = [MemoryArea(f"D{word}").raw for word in range(0, 400, 20)]
+    read_command = client._memory_area_read_command("D100", 10)
+    read_response = read_command.raw[:12] + b"\x00\x00" + bytes(20)
+    multiple_addresses = [MemoryArea(f"D{word}") for word in range(20)]
+    multiple_response = b"".join(b"\x82\x00\x00" for _ in multiple_addresses)
+    adapter = MultipleMemoryAreaReadDataAdapter(multiple_addresses)
+    header = Header.default()
+
+    def memory_area_parse() -> None:
+        MemoryArea._parse_addr_string("CIO100.01")
+
+    def memory_area_cached() -> None:
+        MemoryArea("D100")
+
+    def memory_area_bytes() -> None:
+        MemoryArea._parse_addr_bytes(addresses[3])
+
+    def header_encode() -> bytes:
+        return Header.default().raw
+
+    def command_encode() -> bytes:
+        return Command(
+            CommandCode.MEMORY_AREA_READ, addresses[0] + b"\x00\x0a", header
+        ).raw
+
+    def command_template() -> bytes:
+        return client._memory_area_read_command("D100", 10).raw
+
+    def response_decode() -> bytes:
+        response = Response.from_bytes(read_response, read_command)
+        return response.ok and response.data
+
+    def multiple_read_adapter() -> List[bytes]:
+        return adapter(multiple_response)
+
+    return [
+        ("codec.memory_area_parse", memory_area_parse),
+        ("codec.memory_area_cached", memory_area_cached),
+        ("codec.memory_area_bytes", memory_area_bytes),
+        ("codec.header_encode", header_encode),
+        ("codec.command_encode", command_encode),
+        ("codec.command_template", command_template),
+        ("codec.response_decode", response_decode),
+        ("codec.multiple_read_adapter", multiple_read_adapter),
+    ]
+
+
+def end_to_end_benchmarks(
+    client: FinsClient, mode: str
+) -> List[Tuple[str, Callable[[], object], int]]:
+    """Returns ``(name, func, operations per call)`` tuples."""
+    addresses = [f"D{word}" for word in range(0, 400, 20)]
+    pipelined = [f"D{word}" for word in range(32)]
+
+    def single_read() -> None:
+        assert client.memory_area_read("D100").ok
+
+    def multiple_read() -> None:
+        assert client.multiple_memory_area_read(*addresses).ok
+
+    def block_read() -> None:
+        assert client.memory_area_read("D0", 4000).ok
+
+    def pipelined_read() -> None:
+        client.read_many(pipelined, window=8)
+
+    funcs = [single_read, multiple_read, block_read, pipelined_read]
+    operations = [1, 1, 1, len(pipelined)]
+    return [
+        (f"{mode}.{name}", func, count)
+        for name, func, count in zip(END_TO_END, funcs, operations)
+    ]
+
+
+def run(duration: float, selected: Callable[[str], bool]) -> List[Dict]:
+    results = []
+
+    def report(name: str, result: Dict) -> None:
+        result = dict(name=name, **result)
+        results.append(result)
+        print(
+            "{name:<32} {ops_per_sec:>12,.0f} ops/s  p50 {p50_us:9.2f}us  "
+            "p99 {p99_us:9.2f}us  p999 {p999_us:9.2f}us".format(**result)
+        )
+
+    for name, func in codec_benchmarks():
+        if selected(name):
+            report(name, measure(func, duration, BATCH))
+
+    for mode in ("udp", "tcp"):
+        if not any(selected(f"{mode}.{name}") for name in END_TO_END):
+            continue
+        with FinsSimulator(port=0, mode=mode) as simulator:
+            client = FinsClient(*simulator.address, mode=mode, timeout=2)
+            client.connect()
+            for name, func, operations in end_to_end_benchmarks(client, mode):
+                if not selected(name):
+                    continue
+                result = measure(func, duration)
+                result["ops_per_sec"] *= operations
+                report(name, result)
+            client.close()
+    return results
+
+
+def compare(results: List[Dict], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = {result["name"]: result for result in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        old = baseline.get(result["name"])
+        if old is None:
+            continue
+        speedup = result["ops_per_sec"] / old["ops_per_sec"]
+        p99 = result["p99_us"] / old["p99_us"]
+        print(f"{result['name']:<32} {speedup:6.2f}x ops/s  {p99:6.2f}x p99")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--duration", type=float, default=1.0, help="seconds per benchmark"
+    )
+    parser.add_argument("--filter", default="", help="run matching benchmarks only")
+    parser.add_argument("--output", help="write the results to a JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args(argv)
+
+    results = run(args.duration, lambda name: args.filter in name)
+    if args.output:
+        document = {
+            "version": __version__,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,25 @@
+from .adapters import DataType, decode_bits, decode_words, encode_bits, encode_words
+from .async_client import AsyncFinsClient
+from .cache import ReadCache
 from .client import FinsClient
 from .command import Command, CommandCode, SetResetSpec, SetResetSpecCode
-from .exceptions import FinsException
+from .discovery import NodeInfo, NodeScanner
+from .exceptions import CircuitOpenError, FinsException, FinsTimeoutError
+from .fleet import FleetPoller
+from .gateway import FinsGateway
 from .header import Header
+from .historian import Historian
+from .instrumentation import Instrumentation, prometheus_text
+from .layout import Layout
 from .memory import MemoryArea, MemoryAreaCode
+from .planner import ReadPlan, ReadPlanner
+from .resilience import CircuitBreaker, RttEstimator
 from .response import Response
+from .scheduler import PollScheduler
+from .sharded import ShardedPoller, Tag
+from .snapshot import ChangeEvent, Snapshot
+from .tagcache import TagCacheClient, TagCachePublisher
+from .tagtable import TagTable, TagValue
+from .target import Target
 from .version import __version__
+from .writer import WriteBuffer
@@ -1,8 +1,15 @@
 import io
-from typing import List
+import sys
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
 
 from .memory import MemoryArea
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 class BaseDataAdapter:
     def __call__(self, data: bytes) -> bytes:
@@ -25,3 +32,235 @@ class MultipleMemoryAreaReadDataAdapter(BaseDataAdapter):
                 d = buf.read(2)
             values.append(d)
         return values
+
+
+class DataType:
+    """
+    PLC data types stored in consecutive words.
+
+    Values wider than one word are stored by Omron PLCs with the least
+    significant word first, each word being big-endian.
+    """
+
+    INT16 = "INT16"
+    UINT16 = "UINT16"
+    INT32 = "INT32"
+    UINT32 = "UINT32"
+    REAL = "REAL"
+    LREAL = "LREAL"
+    BCD = "BCD"
+
+
+_INT32_CODE = "i" if array("i").itemsize == 4 else "l"
+_UINT32_CODE = _INT32_CODE.upper()
+
+#: Data type -> (array type code, little-endian numpy dtype, words per item).
+DATA_TYPES = {
+    DataType.INT16: ("h", "<i2", 1),
+    DataType.UINT16: ("H", "<u2", 1),
+    DataType.INT32: (_INT32_CODE, "<i4", 2),
+    DataType.UINT32: (_UINT32_CODE, "<u4", 2),
+    DataType.REAL: ("f", "<f4", 2),
+    DataType.LREAL: ("d", "<f8", 4),
+    DataType.BCD: ("H", "<u2", 1),
+}
+
+_BIG_ENDIAN_HOST = sys.byteorder == "big"
+
+
+def _data_type(data_type: str):
+    if data_type not in DATA_TYPES:
+        raise ValueError(f"Unsupported data type: {data_type}")
+    return DATA_TYPES[data_type]
+
+
+def _use_numpy(use_numpy: Optional[bool]) -> bool:
+    if use_numpy is None:
+        return numpy is not None
+    if use_numpy and numpy is None:
+        raise ImportError("numpy is required for use_numpy=True")
+    return use_numpy
+
+
+def swap_word_bytes(data: bytes) -> array:
+    """
+    Swap the two bytes of every word of ``data``.
+
+    This turns the PLC word layout into a plain little-endian layout, for
+    every type: a word-swapped 32-bit value made of two big-endian words
+    becomes a little-endian 32-bit value.
+    """
+    if len(data) % 2:
+        raise ValueError("Data length must be a multiple of the word size")
+    words = array("H")
+    words.frombytes(data)
+    words.byteswap()
+    return words
+
+
+def decode_words(
+    data: bytes, data_type: str = DataType.UINT16, use_numpy: Optional[bool] = None
+) -> Union[array, "numpy.ndarray"]:
+    """
+    Decode a buffer of PLC words into an ``array.array``, or a NumPy array if
+    NumPy is available and ``use_numpy`` is not False.
+
+    BCD words are decoded into their decimal value, e.g. 0x1234 -> 1234.
+    """
+    code, dtype, size = _data_type(data_type)
+    if len(data) % (size * 2):
+        raise ValueError(f"Data length is not a multiple of {data_type} size")
+
+    if _use_numpy(use_numpy):
+        values = numpy.frombuffer(data, dtype=">u2").astype("<u2").view(dtype)
+        if data_type == DataType.BCD:
+            values = from_bcd(values)
+        return values
+
+    values = array(code)
+    values.frombytes(memoryview(swap_word_bytes(data)).cast("B"))
+    if _BIG_ENDIAN_HOST:
+        values.byteswap()
+    if data_type == DataType.BCD:
+        values = array("H", map(from_bcd, values))
+    return values
+
+
+def encode_words(values: Iterable, data_type: str = DataType.UINT16) -> bytes:
+    """
+    Encode values into PLC words, the inverse of :func:`decode_words`.
+    """
+    code, dtype, _ = _data_type(data_type)
+    if data_type == DataType.BCD:
+        values = [to_bcd(value) for value in values]
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.astype(dtype).view("<u2").astype(">u2").tobytes()
+
+    items = array(code, values)
+    if _BIG_ENDIAN_HOST:
+        items.byteswap()
+    return swap_word_bytes(items.tobytes()).tobytes()
+
+
+def to_bcd(value: int) -> int:
+    """Returns the 4-digit BCD word of ``value``, e.g. 1234 -> 0x1234."""
+    if not 0 <= value <= 9999:
+        raise ValueError(f"Value out of BCD range: {value}")
+    return int(str(int(value)), 16)
+
+
+def from_bcd(value):
+    """
+    Returns the decimal value of a BCD word, e.g. 0x1234 -> 1234. Works on
+    NumPy arrays as well.
+    """
+    return (
+        (value >> 12 & 0xF) * 1000
+        + (value >> 8 & 0xF) * 100
+        + (value >> 4 & 0xF) * 10
+        + (value & 0xF)
+    )
+
+
+class WordDataAdapter(BaseDataAdapter):
+    """
+    Decode word data into an array of ``data_type`` values, see
+    :func:`decode_words`.
+    """
+
+    def __init__(
+        self, data_type: str = DataType.UINT16, use_numpy: Optional[bool] = None
+    ) -> None:
+        super().__init__()
+        _data_type(data_type)
+        self.data_type = data_type
+        self.use_numpy = use_numpy
+
+    def __call__(self, data: bytes) -> Union[array, "numpy.ndarray"]:
+        return decode_words(data, self.data_type, self.use_numpy)
+
+
+def bitset(data: bytes) -> int:
+    """
+    Returns word data as an integer whose bit ``16 * n + b`` is bit ``b`` of
+    word ``n``.
+    """
+    return int.from_bytes(swap_word_bytes(data).tobytes(), "little")
+
+
+def decode_bits(
+    data: bytes,
+    offset: int = 0,
+    count: Optional[int] = None,
+    use_numpy: Optional[bool] = None,
+) -> Union[List[bool], "numpy.ndarray"]:
+    """
+    Unpack the bits of word data, bit 0 of the first word first. Returns
+    ``count`` bits starting at bit ``offset``, as a NumPy bool array if NumPy
+    is available and ``use_numpy`` is not False, else as a list of bools.
+    """
+    total = len(data) * 8
+    if count is None:
+        count = total - offset
+    if offset < 0 or count < 0 or offset + count > total:
+        raise ValueError("Bit range exceeds the data")
+
+    if _use_numpy(use_numpy):
+        words = numpy.frombuffer(data, dtype=">u2").astype("<u2")
+        bits = numpy.unpackbits(words.view(numpy.uint8), bitorder="little")
+        return bits[offset : offset + count].view(bool)
+
+    if not count:
+        return []
+    value = bitset(data) >> offset & ((1 << count) - 1)
+    return [digit == "1" for digit in reversed(format(value, f"0{count}b"))]
+
+
+def encode_bits(values: Iterable) -> bytes:
+    """
+    Pack bools into words, the inverse of :func:`decode_bits`. The last word
+    is padded with zero bits.
+    """
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        bits = numpy.asarray(values, dtype=bool)
+        padded = numpy.zeros(-(-len(bits) // 16) * 16, dtype=bool)
+        padded[: len(bits)] = bits
+        packed = numpy.packbits(padded, bitorder="little")
+        return packed.view("<u2").astype(">u2").tobytes()
+
+    digits = "".join("1" if value else "0" for value in values)
+    words = -(-len(digits) // 16)
+    value = int(digits[::-1] or "0", 2)
+    return swap_word_bytes(value.to_bytes(words * 2, "little")).tobytes()
+
+
+class GroupedBitsReadDataAdapter(BaseDataAdapter):
+    """
+    Decode a multiple memory area read of whole words back into the values
+    of the requested addresses, bits being extracted from their word.
+
+    ``targets`` holds ``(item index, bit)`` for every requested address, bit
+    being None to return the item unchanged.
+    """
+
+    def __init__(
+        self,
+        addresses: List[MemoryArea],
+        targets: Sequence[Tuple[int, Optional[int]]],
+    ) -> None:
+        super().__init__()
+        self.items = MultipleMemoryAreaReadDataAdapter(addresses)
+        self.targets = targets
+
+    def __call__(self, data: bytes) -> List[bytes]:
+        items = self.items(data)
+        values: List[bytes] = []
+        for index, bit in self.targets:
+            item = items[index]
+            if bit is None:
+                values.append(item)
+            else:
+                word = (item[0] << 8) | item[1]
+                values.append(b"\x01" if word >> bit & 1 else b"\x00")
+        return values
@@ -0,0 +1,301 @@
+import asyncio
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, Union
+
+from .adapters import MultipleMemoryAreaReadDataAdapter, decode_bits
+from .client import BaseFinsClient
+from .command import Command, SetResetSpec
+from .exceptions import FinsException, FinsTimeoutError
+from .memory import MemoryArea
+from .response import Response
+from .tcp import (
+    ENVELOPE_SIZE,
+    FinsTcpCommand,
+    build_frame,
+    build_node_address_request,
+    check_error,
+    parse_envelope,
+    parse_node_address_response,
+)
+
+
+class _FinsDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client: "AsyncFinsClient") -> None:
+        self._client = client
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self._client._dispatch(data)
+
+    def error_received(self, exc: Exception) -> None:
+        self._client._fail_pending(exc)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._client._fail_pending(exc or ConnectionError("Connection lost"))
+
+
+class AsyncFinsClient(BaseFinsClient):
+    """
+    Asyncio based FINS client.
+
+    Every request gets a fresh service ID (SID) and responses are matched back
+    to their request by that SID, so many requests can be in flight on a
+    single socket at the same time. At most ``max_in_flight`` requests are
+    outstanding, further requests wait for a free slot.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9600,
+        timeout: int = 5,
+        mode: Literal["tcp", "udp"] = "udp",
+        max_in_flight: int = 32,
+    ) -> None:
+        super().__init__(host=host, port=port, timeout=timeout, mode=mode)
+        if not 1 <= max_in_flight <= 256:
+            raise ValueError("max_in_flight must be between 1 and 256")
+        self.max_in_flight = max_in_flight
+
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncFinsClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        if self.mode == "udp":
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _FinsDatagramProtocol(self),
+                remote_addr=(self.host, self.port),
+            )
+        else:
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout
+                )
+                await asyncio.wait_for(self._handshake(), self.timeout)
+            except asyncio.TimeoutError as exc:
+                raise FinsTimeoutError(
+                    f"No response from {self.host}:{self.port}"
+                ) from exc
+            self._reader_task = loop.create_task(self._read_stream())
+
+    async def _handshake(self) -> None:
+        self._writer.write(build_node_address_request())
+        await self._writer.drain()
+        client_node, server_node = parse_node_address_response(
+            *await self._read_tcp_frame()
+        )
+        self.sa1 = client_node & 0xFF
+        self.da1 = server_node & 0xFF
+
+    async def _read_tcp_frame(self) -> Tuple[int, int, bytes]:
+        length, command, error_code = parse_envelope(
+            await self._reader.readexactly(ENVELOPE_SIZE)
+        )
+        payload = await self._reader.readexactly(length - 8)
+        return command, error_code, payload
+
+    async def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+        self._fail_pending(ConnectionError("Client closed"))
+
+    async def send(
+        self, command: Command, adapter: Optional[callable] = None
+    ) -> Response[bytes]:
+        if self._slots is None:
+            raise FinsException("Client is not connected")
+        if self.cache is not None:
+            self.cache.invalidate_command(command)
+        async with self._slots:
+            sid = command.sid
+            if sid in self._pending:
+                sid = self._next_sid()
+                command.sid = sid
+            future = asyncio.get_running_loop().create_future()
+            self._pending[sid] = future
+            instrumentation = self.instrumentation
+            if instrumentation is not None:
+                start = instrumentation.request(self, command)
+            try:
+                self._write(command.raw)
+                data = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError as exc:
+                if instrumentation is not None:
+                    instrumentation.timeout(self, command, start)
+                raise FinsTimeoutError(
+                    f"No response from {self.host}:{self.port}"
+                ) from exc
+            finally:
+                if self._pending.get(sid) is future:
+                    del self._pending[sid]
+        response = Response.from_bytes(data, command=command, adapter=adapter)
+        if instrumentation is not None:
+            instrumentation.response(self, command, response, start)
+        return response
+
+    def _next_sid(self) -> int:
+        for _ in range(256):
+            self.sid = (self.sid + 1) & 0xFF
+            if self.sid not in self._pending:
+                return self.sid
+        raise FinsException("No free service ID available")
+
+    def _write(self, data: bytes) -> None:
+        if self._transport is not None:
+            self._transport.sendto(data)
+        elif self._writer is not None:
+            self._writer.write(build_frame(data))
+        else:
+            raise FinsException("Client is not connected")
+
+    def _dispatch(self, data: bytes) -> None:
+        if len(data) < 14:
+            return
+        future = self._pending.pop(data[9], None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _read_stream(self) -> None:
+        try:
+            while True:
+                command, error_code, payload = await self._read_tcp_frame()
+                check_error(error_code)
+                if command == FinsTcpCommand.FRAME_SEND:
+                    self._dispatch(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._fail_pending(exc)
+
+    async def memory_area_read(
+        self, address: Union[str, bytes], num_items: int = 1
+    ) -> Response[bytes]:
+        cache = self.cache
+        if cache is not None:
+            response = self._cached_read(address, num_items)
+            if response is not None:
+                return response
+            generation = cache.generation(MemoryArea(address))
+        commands = self._memory_area_read_commands(address, num_items)
+        if len(commands) == 1:
+            response = await self.send(commands[0])
+        else:
+            responses = await asyncio.gather(*(self.send(cmd) for cmd in commands))
+            response = self._join_read_responses(list(responses))
+        if cache is not None and response.ok:
+            cache.put(MemoryArea(address), num_items, response.data, generation)
+        return response
+
+    async def memory_area_write(
+        self, address: Union[str, bytes], data: bytes, num_items: int = 1
+    ) -> Response[bytes]:
+        commands = self._memory_area_write_commands(address, data, num_items)
+        if len(commands) == 1:
+            return await self.send(commands[0])
+        responses = await asyncio.gather(*(self.send(cmd) for cmd in commands))
+        return self._join_write_responses(list(responses))
+
+    async def memory_area_fill(
+        self, address: Union[str, bytes], data: bytes, num_items: int = 1
+    ) -> Response[bytes]:
+        cmd = self._memory_area_fill_command(address, data, num_items)
+        return await self.send(cmd)
+
+    async def multiple_memory_area_read(
+        self, *addresses: Union[str, bytes], group_bits: bool = False
+    ) -> Response[List[bytes]]:
+        addrs = [MemoryArea(address) for address in addresses]
+        if group_bits:
+            reads, adapter = self._group_bits(addrs)
+            cmd = self._multiple_memory_area_read_command(reads)
+            return await self.send(cmd, adapter)
+        cmd = self._multiple_memory_area_read_command(addrs)
+        return await self.send(cmd, MultipleMemoryAreaReadDataAdapter(addrs))
+
+    async def read_bits(
+        self,
+        address: Union[str, bytes],
+        count: int = 1,
+        use_numpy: Optional[bool] = None,
+    ) -> Union[List[bool], "numpy.ndarray"]:
+        word, bit, words = self._bit_range(address, count)
+        response = await self.memory_area_read(word, words)
+        if not response.ok:
+            raise FinsException(f"Read failed: {response.status_text}")
+        return decode_bits(response.data, bit, count, use_numpy)
+
+    async def write_bits(
+        self,
+        address: Union[str, bytes],
+        values: Sequence,
+        method: Literal["auto", "word", "bit", "read_modify_write", "force"] = "auto",
+    ) -> Response[bytes]:
+        bits = [bool(value) for value in values]
+        if method == "auto":
+            word, bit, _ = self._bit_range(address, len(bits))
+            method = "word" if not bit and not len(bits) % 16 else "bit"
+        if method == "read_modify_write":
+            word, bit, words = self._bit_range(address, len(bits))
+            response = await self.memory_area_read(word, words)
+            if not response.ok:
+                return response
+            data = self._merge_bits(response.data, bit, bits)
+            return await self.memory_area_write(word, data, words)
+        commands = self._bit_write_commands(address, bits, method)
+        responses = await asyncio.gather(*(self.send(cmd) for cmd in commands))
+        return self._join_write_responses(list(responses))
+
+    async def memory_area_transfer(
+        self,
+        source_address: Union[str, bytes],
+        dest_address: Union[str, bytes],
+        num_items: int = 1,
+    ) -> Response[bytes]:
+        cmd = self._memory_area_transfer_command(
+            source_address, dest_address, num_items
+        )
+        return await self.send(cmd)
+
+    async def run(
+        self,
+        mode: Literal["debug", "monitor", "run"] = "monitor",
+        program_number: bytes = b"\xff\xff",
+    ) -> Response[bytes]:
+        return await self.send(self._run_command(mode, program_number))
+
+    async def stop(self) -> Response[bytes]:
+        return await self.send(self._stop_command())
+
+    async def forced_set_reset(self, *specs: SetResetSpec) -> Response[bytes]:
+        return await self.send(self._forced_set_reset_command(list(specs)))
+
+    async def forced_set_reset_cancel(self) -> Response[bytes]:
+        return await self.send(self._forced_set_reset_cancel_command())
@@ -0,0 +1,243 @@
+"""
+Read-through cache of memory area reads.
+
+A :class:`ReadCache` attached to a client serves ``memory_area_read`` calls
+from earlier reads of the same or of an enclosing range, for a time to live
+configured per area. Every write, fill, transfer or forced set/reset sent by
+the client invalidates the cached ranges it overlaps, and bumps the write
+generation of its area so that reads outstanding at that time are not cached.
+Polling the same tags faster than they change then costs one PLC read per
+time to live instead of one per poll.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from .command import Command, CommandCode
+from .memory import BIT_AREAS_WORD, MemoryArea
+
+#: Area code, first word, first bit and number of items of a cached read.
+Key = Tuple[bytes, int, int, int]
+
+
+def _bit_span(area: bytes, word: int, bit: int, num_items: int):
+    """
+    Returns the word area code and the bit range covered by a read, so that
+    word and bit accesses to the same memory are compared.
+    """
+    if area in BIT_AREAS_WORD:
+        start = word * 16 + bit
+        return BIT_AREAS_WORD[area], start, start + num_items
+    return area, word * 16, (word + num_items) * 16
+
+
+class ReadCache:
+    """
+    Cache of memory area reads with a time to live and LRU eviction.
+
+    Reads are cached for ``ttl`` seconds, or the time to live given in
+    ``area_ttls`` for their area code (bit areas default to the time to live
+    of their word area); a time to live of 0 disables caching. A cached read
+    also serves any read of a range it encloses. At most ``max_entries``
+    reads are kept, the least recently used ones being evicted first.
+
+    The cache can be shared by several threads. Reads racing with writes
+    take the :meth:`generation` of their area before being sent and pass it
+    to :meth:`put`, which drops their data if a write to the area was sent
+    in the meantime.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0.1,
+        area_ttls: Optional[Mapping[bytes, float]] = None,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.ttl = ttl
+        self.area_ttls: Dict[bytes, float] = dict(area_ttls or {})
+        self.max_entries = max_entries
+        self.clock = clock
+
+        #: Number of reads served from the cache.
+        self.hits: int = 0
+        #: Number of reads not served from the cache.
+        self.misses: int = 0
+        #: Number of entries dropped by a write.
+        self.invalidations: int = 0
+        #: Number of entries dropped to bound the cache size.
+        self.evictions: int = 0
+        #: Number of reads not cached because of a concurrent write.
+        self.discarded: int = 0
+
+        # Key -> (expiry, data), least recently used first.
+        self._entries: "OrderedDict[Key, Tuple[float, bytes]]" = OrderedDict()
+        # Area code -> keys cached in this area.
+        self._areas: Dict[bytes, Dict[Key, None]] = {}
+        # Number of writes sent, word area code -> number at its last write,
+        # and number at the last write to every area.
+        self._writes = 0
+        self._generations: Dict[bytes, int] = {}
+        self._cleared = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def area_ttl(self, area: bytes) -> float:
+        """Returns the time to live of reads of ``area``."""
+        ttls = self.area_ttls
+        if area in ttls:
+            return ttls[area]
+        return ttls.get(BIT_AREAS_WORD.get(area), self.ttl)
+
+    def generation(self, address: MemoryArea) -> int:
+        """Returns the write generation of the area of ``address``."""
+        with self._lock:
+            return self._generation(address)
+
+    def _generation(self, address: MemoryArea) -> int:
+        area = BIT_AREAS_WORD.get(address.area, address.area)
+        return max(self._generations.get(area, 0), self._cleared)
+
+    def _remove(self, key: Key) -> None:
+        del self._entries[key]
+        keys = self._areas[key[0]]
+        del keys[key]
+        if not keys:
+            del self._areas[key[0]]
+
+    def get(self, address: MemoryArea, num_items: int) -> Optional[bytes]:
+        """Returns the cached data of a read, None on a miss."""
+        area = address.area
+        word = int.from_bytes(address.word, "big")
+        bit = address.bit[0]
+        key = (area, word, bit, num_items)
+        if area in BIT_AREAS_WORD:
+            start, size = word * 16 + bit, 1
+        else:
+            start, size = word, 2
+        end = start + num_items
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            for cached in self._areas.get(area, ()):
+                first = cached[1] * 16 + cached[2] if size == 1 else cached[1]
+                if first <= start and end <= first + cached[3]:
+                    expiry, data = self._entries[cached]
+                    if expiry <= now:
+                        continue
+                    self._entries.move_to_end(cached)
+                    self.hits += 1
+                    return data[(start - first) * size : (end - first) * size]
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        address: MemoryArea,
+        num_items: int,
+        data: bytes,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache the data of a successful read, unless the write ``generation``
+        of its area taken before sending it has changed since.
+        """
+        area = address.area
+        ttl = self.area_ttl(area)
+        if ttl <= 0:
+            return
+        key = (area, int.from_bytes(address.word, "big"), address.bit[0], num_items)
+        entry = (self.clock() + ttl, bytes(data))
+        with self._lock:
+            if generation is not None and generation != self._generation(address):
+                self.discarded += 1
+                return
+            entries = self._entries
+            if key in entries:
+                entries.move_to_end(key)
+            entries[key] = entry
+            self._areas.setdefault(area, {})[key] = None
+            while len(entries) > self.max_entries:
+                self._remove(next(iter(entries)))
+                self.evictions += 1
+
+    def invalidate(self, address: MemoryArea, num_items: int) -> None:
+        """Drop every cached read overlapping a written range."""
+        with self._lock:
+            self._invalidate(address, num_items)
+
+    def _invalidate(self, address: MemoryArea, num_items: int) -> None:
+        region, start, end = _bit_span(
+            address.area,
+            int.from_bytes(address.word, "big"),
+            address.bit[0],
+            num_items,
+        )
+        self._writes += 1
+        self._generations[region] = self._writes
+        if not self._entries:
+            return
+        stale = []
+        for area, keys in self._areas.items():
+            for key in keys:
+                other, first, last = _bit_span(*key)
+                if other == region and first < end and start < last:
+                    stale.append(key)
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+
+    def invalidate_command(self, command: Command) -> None:
+        """Drop the cached reads that ``command`` may change."""
+        code = command.code
+        if code in (CommandCode.MEMORY_AREA_WRITE, CommandCode.MEMORY_AREA_FILL):
+            data = command.data
+            self.invalidate(MemoryArea(data[:4]), int.from_bytes(data[4:6], "big"))
+        elif code == CommandCode.MEMORY_AREA_TRANSFER:
+            data = command.data
+            self.invalidate(MemoryArea(data[4:8]), int.from_bytes(data[8:10], "big"))
+        elif code == CommandCode.FORCED_SET_RESET:
+            data = command.data
+            spans = [
+                MemoryArea(data[offset + 2 : offset + 6])
+                for offset in range(2, len(data), 6)
+            ]
+            with self._lock:
+                for address in spans:
+                    self._invalidate(address, 1)
+        elif code == CommandCode.FORCED_SET_RESET_CANCEL:
+            with self._lock:
+                self._writes += 1
+                self._cleared = self._writes
+                self.invalidations += len(self._entries)
+                self._clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._areas.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "discarded": self.discarded,
+            }
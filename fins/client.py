@@ -1,14 +1,52 @@
 import socket
-from typing import List, Literal, Optional, Union
+import time
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, Union
 
-from .adapters import MultipleMemoryAreaReadDataAdapter
-from .command import Command, CommandCode, SetResetSpec
+from .adapters import (
+    GroupedBitsReadDataAdapter,
+    MultipleMemoryAreaReadDataAdapter,
+    bitset,
+    decode_bits,
+    encode_bits,
+    swap_word_bytes,
+)
+from .command import (
+    MAX_FORCED_SET_RESET_ITEMS,
+    MAX_MEMORY_AREA_READ_ITEMS,
+    MAX_MEMORY_AREA_WRITE_ITEMS,
+    Command,
+    CommandCode,
+    CommandTemplate,
+    SetResetSpec,
+    SetResetSpecCode,
+)
+from .cache import ReadCache
+from .exceptions import CircuitOpenError, FinsException, FinsTimeoutError
 from .header import Header
-from .memory import MemoryArea
+from .instrumentation import Instrumentation
+from .memory import BIT_AREAS_WORD, WORD_AREAS_BIT, MemoryArea
+from .resilience import IDEMPOTENT_COMMANDS, CircuitBreaker, RttEstimator
 from .response import Response
+from .target import Target
+from .tcp import (
+    FinsTcpCommand,
+    FrameReader,
+    build_frame,
+    build_node_address_request,
+    check_error,
+    parse_node_address_response,
+)
 
 
-class FinsClient:
+class BaseFinsClient:
+    """
+    Connection settings and command builders shared by :class:`FinsClient`
+    and :class:`AsyncFinsClient <fins.async_client.AsyncFinsClient>`.
+
+    Subclasses only need to implement the transport, every ``_*_command``
+    method returns a ready to send :class:`Command`.
+    """
+
     def __init__(
         self,
         host: str = "127.0.0.1",
@@ -16,17 +54,13 @@ class FinsClient:
         timeout: int = 5,
         mode: Literal["tcp", "udp"] = "udp",
     ) -> None:
+        if mode not in ("tcp", "udp"):
+            raise ValueError(f"Unknown client mode: {mode}")
         self.host = host
         self.port = port
         self.timeout = timeout
+        self.mode = mode
         self.buffer_size: int = 4096
-        if mode == "udp":
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        elif mode == "tcp":
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        else:
-            raise ValueError(f"Unknown client mode: {mode}")
-        self._socket.settimeout(self.timeout)
 
         self.dna: int = 0
         self.da1: int = 0
@@ -36,28 +70,59 @@ class FinsClient:
         self.sa2: int = 0
         self.sid: int = 0
 
-    def send(
-        self, command: Command, adapter: Optional[callable] = None
-    ) -> Response[bytes]:
-        self._socket.send(command.raw)
-        data = self._socket.recv(self.buffer_size)
-        return Response(
-            header=Header.from_bytes(data[:10]),
-            command_code=data[10:12],
-            code=data[12:14],
-            data=data[14:],
-            command=command,
-            adapter=adapter,
-        )
+        #: Collects per request metrics when set, see :mod:`fins.instrumentation`.
+        self.instrumentation: Optional[Instrumentation] = None
+        #: Serves repeated memory area reads when set, see :mod:`fins.cache`.
+        self.cache: Optional[ReadCache] = None
 
-    def connect(self) -> None:
-        self._socket.connect((self.host, self.port))
+        self._destination: Optional[Tuple[int, ...]] = None
+        self._templates: Dict[bytes, CommandTemplate] = {}
 
-    def close(self) -> None:
-        self._socket.close()
+    @classmethod
+    def from_target(cls, target: Target, **kwargs) -> "BaseFinsClient":
+        """Build a client for ``target``, using its node addresses."""
+        client = cls(host=target.host, port=target.port, **kwargs)
+        client.dna = target.dna
+        client.da1 = target.da1
+        client.da2 = target.da2
+        client.sna = target.sna
+        client.sa1 = target.sa1
+        client.sa2 = target.sa2
+        return client
 
-    def __del__(self) -> None:
-        self._socket.close()
+    @property
+    def target(self) -> Target:
+        """Returns the current destination and node addresses."""
+        return Target(
+            host=self.host,
+            port=self.port,
+            dna=self.dna,
+            da1=self.da1,
+            da2=self.da2,
+            sna=self.sna,
+            sa1=self.sa1,
+            sa2=self.sa2,
+        )
+
+    def _next_sid(self) -> int:
+        """Returns the service ID to be used by the next command."""
+        return self.sid
+
+    def _template(self, code: bytes, params: str) -> CommandTemplate:
+        """
+        Returns the command template of ``code``. Templates are encoded once
+        per destination and rebuilt when the node addresses change.
+        """
+        destination = (self.dna, self.da1, self.da2, self.sna, self.sa1, self.sa2)
+        if destination != self._destination:
+            self._destination = destination
+            self._templates = {}
+        template = self._templates.get(code)
+        if template is None:
+            header = Header.pack(0x80, 0x00, 0x07, *destination)
+            template = CommandTemplate(header, code, params)
+            self._templates[code] = template
+        return template
 
     def _build_header(self) -> Header:
         return Header(
@@ -70,110 +135,671 @@ class FinsClient:
             sna=self.sna.to_bytes(1, "big"),
             sa1=self.sa1.to_bytes(1, "big"),
             sa2=self.sa2.to_bytes(1, "big"),
-            sid=self.sid.to_bytes(1, "big"),
+            sid=self._next_sid().to_bytes(1, "big"),
         )
 
-    def memory_area_read(
+    def _memory_area_read_command(
         self, address: Union[str, bytes], num_items: int = 1
-    ) -> Response[bytes]:
-        addr = MemoryArea(address)
-        cmd = Command(
-            code=CommandCode.MEMORY_AREA_READ,
-            data=addr.raw + num_items.to_bytes(2, "big"),
-            header=self._build_header(),
-        )
-        return self.send(cmd)
+    ) -> Command:
+        template = self._template(CommandCode.MEMORY_AREA_READ, "4sH")
+        return template.build(self._next_sid(), MemoryArea(address).raw, num_items)
 
-    def memory_area_write(
+    def _memory_area_write_command(
         self, address: Union[str, bytes], data: bytes, num_items: int = 1
-    ) -> Response[bytes]:
-        addr = MemoryArea(address)
-        cmd = Command(
-            code=CommandCode.MEMORY_AREA_WRITE,
-            data=addr.raw + num_items.to_bytes(2, "big") + data,
-            header=self._build_header(),
+    ) -> Command:
+        template = self._template(CommandCode.MEMORY_AREA_WRITE, "4sH")
+        return template.build(
+            self._next_sid(), MemoryArea(address).raw, num_items, data=data
         )
-        return self.send(cmd)
 
-    def memory_area_fill(
-        self, address: Union[str, bytes], data: bytes, num_items: int = 1
-    ) -> Response[bytes]:
+    def _chunks(
+        self, address: Union[str, bytes], num_items: int, max_items: int
+    ) -> List[Tuple[MemoryArea, int, int]]:
+        """
+        Split a range of ``num_items`` into ``(address, offset, count)`` chunks
+        of at most ``max_items`` items.
+        """
         addr = MemoryArea(address)
-        cmd = Command(
-            code=CommandCode.MEMORY_AREA_FILL,
-            data=addr.raw + num_items.to_bytes(2, "big") + data,
-            header=self._build_header(),
+        return [
+            (addr.offset(offset), offset, min(max_items, num_items - offset))
+            for offset in range(0, num_items, max_items)
+        ]
+
+    def _memory_area_read_commands(
+        self, address: Union[str, bytes], num_items: int
+    ) -> List[Command]:
+        if num_items <= MAX_MEMORY_AREA_READ_ITEMS:
+            return [self._memory_area_read_command(address, num_items)]
+        return [
+            self._memory_area_read_command(addr, count)
+            for addr, _, count in self._chunks(
+                address, num_items, MAX_MEMORY_AREA_READ_ITEMS
+            )
+        ]
+
+    def _memory_area_write_commands(
+        self, address: Union[str, bytes], data: bytes, num_items: int
+    ) -> List[Command]:
+        if num_items <= MAX_MEMORY_AREA_WRITE_ITEMS:
+            return [self._memory_area_write_command(address, data, num_items)]
+        if len(data) % num_items:
+            raise ValueError("Data length is not a multiple of num_items")
+        item_size = len(data) // num_items
+        view = memoryview(data)
+        return [
+            self._memory_area_write_command(
+                addr,
+                view[offset * item_size : (offset + count) * item_size],
+                count,
+            )
+            for addr, offset, count in self._chunks(
+                address, num_items, MAX_MEMORY_AREA_WRITE_ITEMS
+            )
+        ]
+
+    def _cached_read(
+        self, address: Union[str, bytes], num_items: int
+    ) -> Optional[Response[bytes]]:
+        """Returns a read answered by the cache, None on a miss."""
+        data = self.cache.get(MemoryArea(address), num_items)
+        if data is None:
+            return None
+        command = self._memory_area_read_command(address, num_items)
+        return Response.local(command, b"\x00\x00", data)
+
+    def _join_read_responses(self, responses: List[Response]) -> Response[bytes]:
+        """
+        Assemble the responses of chunked reads into one response whose data
+        is a view of a single preallocated buffer. The header and command are
+        those of the first chunk. If any chunk failed, its response is
+        returned as is.
+        """
+        if len(responses) == 1:
+            return responses[0]
+        for response in responses:
+            if not response.ok:
+                return response
+        buffer = bytearray(sum(len(response.raw_data) for response in responses))
+        position = 0
+        for response in responses:
+            data = response.raw_data
+            buffer[position : position + len(data)] = data
+            position += len(data)
+        first = responses[0]
+        return Response(
+            header=first.header,
+            command_code=first.command_code,
+            code=first.code,
+            data=memoryview(buffer),
+            command=first.command,
         )
-        return self.send(cmd)
 
-    def multiple_memory_area_read(
-        self, *addresses: Union[str, bytes]
-    ) -> Response[List[bytes]]:
-        data = []
-        for address in addresses:
-            addr = MemoryArea(address)
-            data.append(addr.raw)
+    def _join_write_responses(self, responses: List[Response]) -> Response[bytes]:
+        for response in responses:
+            if not response.ok:
+                return response
+        return responses[-1]
+
+    def _memory_area_fill_command(
+        self, address: Union[str, bytes], data: bytes, num_items: int = 1
+    ) -> Command:
+        template = self._template(CommandCode.MEMORY_AREA_FILL, "4sH")
+        return template.build(
+            self._next_sid(), MemoryArea(address).raw, num_items, data=data
+        )
 
-        cmd = Command(
+    def _multiple_memory_area_read_command(
+        self, addresses: List[MemoryArea]
+    ) -> Command:
+        return Command(
             code=CommandCode.MULTIPLE_MEMORY_AREA_READ,
-            data=b"".join(data),
+            data=b"".join(addr.raw for addr in addresses),
             header=self._build_header(),
         )
-        adapter = MultipleMemoryAreaReadDataAdapter(
-            [MemoryArea(addr) for addr in addresses]
-        )
-        return self.send(cmd, adapter)
 
-    def memory_area_transfer(
+    def _group_bits(
+        self, addresses: Sequence[MemoryArea]
+    ) -> Tuple[List[MemoryArea], GroupedBitsReadDataAdapter]:
+        """
+        Returns the words to read for ``addresses``, every word once, and the
+        adapter extracting the requested bits from them.
+        """
+        reads: List[MemoryArea] = []
+        items: Dict[bytes, int] = {}
+        targets: List[Tuple[int, Optional[int]]] = []
+        for addr in addresses:
+            area = BIT_AREAS_WORD.get(addr.area) if addr.is_bit_set() else None
+            if area is None:
+                key, bit = addr.raw, None
+            else:
+                key, bit = area + addr.word + b"\x00", addr.bit[0]
+            index = items.get(key)
+            if index is None:
+                index = items[key] = len(reads)
+                reads.append(MemoryArea(key))
+            targets.append((index, bit))
+        return reads, GroupedBitsReadDataAdapter(reads, targets)
+
+    def _bit_range(
+        self, address: Union[str, bytes], count: int
+    ) -> Tuple[MemoryArea, int, int]:
+        """
+        Returns the first word, the bit offset in it and the number of words
+        covering ``count`` bits from ``address``.
+        """
+        addr = MemoryArea(address)
+        if addr.is_bit_set():
+            area = BIT_AREAS_WORD.get(addr.area)
+            if area is None:
+                raise ValueError(f"Area {addr.area.hex()} has no word access")
+            bit = addr.bit[0]
+        else:
+            area, bit = addr.area, 0
+        words = (bit + count + 15) // 16
+        return MemoryArea(area + addr.word + b"\x00"), bit, words
+
+    def _bit_write_commands(
+        self, address: Union[str, bytes], bits: List[bool], method: str
+    ) -> List[Command]:
+        """
+        Returns the commands writing ``bits`` with the word, bit or force
+        method, see :meth:`FinsClient.write_bits`.
+        """
+        word, bit, words = self._bit_range(address, len(bits))
+        if method == "word":
+            if bit or len(bits) % 16:
+                raise ValueError("Word writes need whole words of bits")
+            return self._memory_area_write_commands(word, encode_bits(bits), words)
+        first = MemoryArea(WORD_AREAS_BIT[word.area] + word.word + bytes((bit,)))
+        if method == "bit":
+            return self._memory_area_write_commands(first, bytes(bits), len(bits))
+        if method == "force":
+            specs = [
+                SetResetSpec(
+                    (
+                        SetResetSpecCode.FORCED_RELEASED_BIT_ON
+                        if value
+                        else SetResetSpecCode.FORCED_RELEASED_BIT_OFF
+                    ),
+                    first.offset(index),
+                )
+                for index, value in enumerate(bits)
+            ]
+            return [
+                self._forced_set_reset_command(
+                    specs[start : start + MAX_FORCED_SET_RESET_ITEMS]
+                )
+                for start in range(0, len(specs), MAX_FORCED_SET_RESET_ITEMS)
+            ]
+        raise ValueError(f"Unknown bit write method: {method}")
+
+    @staticmethod
+    def _merge_bits(data: bytes, bit: int, bits: List[bool]) -> bytes:
+        """Returns word ``data`` with ``bits`` written from bit ``bit``."""
+        mask = ((1 << len(bits)) - 1) << bit
+        value = bitset(data) & ~mask | bitset(encode_bits(bits)) << bit
+        return swap_word_bytes(value.to_bytes(len(data), "little")).tobytes()
+
+    def _memory_area_transfer_command(
         self,
         source_address: Union[str, bytes],
         dest_address: Union[str, bytes],
         num_items: int = 1,
-    ) -> Response[bytes]:
-        src_addr = MemoryArea(source_address)
-        dest_addr = MemoryArea(dest_address)
-        cmd = Command(
-            code=CommandCode.MEMORY_AREA_TRANSFER,
-            data=src_addr.raw + dest_addr.raw + num_items.to_bytes(2, "big"),
-            header=self._build_header(),
+    ) -> Command:
+        template = self._template(CommandCode.MEMORY_AREA_TRANSFER, "4s4sH")
+        return template.build(
+            self._next_sid(),
+            MemoryArea(source_address).raw,
+            MemoryArea(dest_address).raw,
+            num_items,
         )
-        return self.send(cmd)
 
-    def run(
+    def _run_command(
         self,
         mode: Literal["debug", "monitor", "run"] = "monitor",
         program_number: bytes = b"\xff\xff",
-    ) -> Response[bytes]:
+    ) -> Command:
         modes = {"debug": b"\x01", "monitor": b"\x02", "run": b"\x04"}
-        cmd = Command(
+        return Command(
             code=CommandCode.RUN,
             data=program_number + modes[mode],
             header=self._build_header(),
         )
-        return self.send(cmd)
 
-    def stop(self) -> Response[bytes]:
-        cmd = Command(
+    def _stop_command(self) -> Command:
+        return Command(
             code=CommandCode.STOP,
             header=self._build_header(),
         )
-        return self.send(cmd)
 
-    def forced_set_reset(self, *specs: SetResetSpec) -> Response[bytes]:
+    def _forced_set_reset_command(self, specs: List[SetResetSpec]) -> Command:
         data = []
         for spec in specs:
             data.append(spec.raw)
         num_items = len(data)
-        cmd = Command(
+        return Command(
             code=CommandCode.FORCED_SET_RESET,
             data=num_items.to_bytes(2, "big") + b"".join(data),
             header=self._build_header(),
         )
-        return self.send(cmd)
 
-    def forced_set_reset_cancel(self) -> Response[bytes]:
-        cmd = Command(
+    def _forced_set_reset_cancel_command(self) -> Command:
+        return Command(
             code=CommandCode.FORCED_SET_RESET_CANCEL,
             header=self._build_header(),
         )
+
+
+class FinsClient(BaseFinsClient):
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9600,
+        timeout: int = 5,
+        mode: Literal["tcp", "udp"] = "udp",
+    ) -> None:
+        super().__init__(host=host, port=port, timeout=timeout, mode=mode)
+        self._socket = self._create_socket()
+        self._reader: Optional[FrameReader] = None
+
+        #: Number of outstanding requests used by chunked reads and writes.
+        self.window: int = 8
+        #: Number of times idempotent reads are retransmitted on timeout.
+        self.retries: int = 0
+        #: Adapts the response timeout to the measured round trip time when set.
+        self.rtt: Optional[RttEstimator] = None
+        #: Fails requests fast while the PLC is not responding when set.
+        self.breaker: Optional[CircuitBreaker] = None
+        #: Reconnect automatically when a TCP connection is lost.
+        self.auto_reconnect: bool = True
+
+    def _create_socket(self) -> socket.socket:
+        if self.mode == "udp":
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        return sock
+
+    def send(
+        self, command: Command, adapter: Optional[callable] = None
+    ) -> Response[bytes]:
+        """
+        Send ``command`` and wait for its response. Idempotent reads without
+        a response are retransmitted up to ``retries`` times with a fresh SID,
+        further timeouts raise :class:`FinsTimeoutError`.
+        """
+        breaker = self.breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"{self.host}:{self.port} is not responding")
+        if self.cache is not None:
+            self.cache.invalidate_command(command)
+        retries = self.retries if command.code in IDEMPOTENT_COMMANDS else 0
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = self._exchange(command, adapter, attempt == 0)
+                except OSError as exc:
+                    if self._recover(exc) and attempt < retries:
+                        attempt += 1
+                        command.sid = self._next_sid()
+                        continue
+                    if isinstance(exc, socket.timeout):
+                        raise FinsTimeoutError(
+                            f"No response from {self.host}:{self.port}"
+                        ) from None
+                    raise
+                break
+        except Exception:
+            if breaker is not None:
+                breaker.failure()
+            raise
+        if breaker is not None:
+            breaker.success()
+        return response
+
+    def _exchange(
+        self, command: Command, adapter: Optional[callable], sample: bool = True
+    ) -> Response[bytes]:
+        rtt = self.rtt
+        if rtt is not None:
+            self._socket.settimeout(rtt.timeout)
+            sent = time.perf_counter()
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = instrumentation.request(self, command)
+        sid = command.sid
+        try:
+            self._send_frame(command.raw)
+            while True:
+                data = self._recv_frame()
+                # Drop stale responses, e.g. a late answer to a timed out request.
+                if len(data) >= 14 and data[9] == sid:
+                    break
+        except socket.timeout:
+            if instrumentation is not None:
+                instrumentation.timeout(self, command, start)
+            raise
+        if rtt is not None and sample:
+            rtt.update(time.perf_counter() - sent)
+        response = Response.from_bytes(data, command=command, adapter=adapter)
+        if instrumentation is not None:
+            instrumentation.response(self, command, response, start)
+        return response
+
+    def _recover(self, exc: OSError) -> bool:
+        """
+        Recover from a failed request, backing off the timeout or
+        reconnecting. Returns False if nothing can be sent anymore.
+        """
+        if isinstance(exc, socket.timeout):
+            if self.rtt is not None:
+                self.rtt.backoff()
+            return True
+        if self.mode == "tcp" and self.auto_reconnect:
+            try:
+                self.reconnect()
+            except OSError:
+                return False
+            return True
+        return False
+
+    def send_many(
+        self,
+        commands: Sequence[Command],
+        window: int = 8,
+        adapters: Optional[Sequence[Optional[callable]]] = None,
+    ) -> List[Response]:
+        """
+        Send commands pipelined, keeping up to ``window`` of them outstanding.
+
+        Every command is stamped with a fresh SID before it is sent and the
+        responses are returned in the same order as ``commands``. Responses
+        with an unknown SID, e.g. duplicates or answers to earlier timed out
+        requests, are dropped. Outstanding idempotent reads are retransmitted
+        like in :meth:`send`.
+        """
+        if not 1 <= window <= 255:
+            raise ValueError("window must be between 1 and 255")
+        if adapters is None:
+            adapters = [None] * len(commands)
+        elif len(adapters) != len(commands):
+            raise ValueError("adapters and commands length mismatch")
+        breaker = self.breaker
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"{self.host}:{self.port} is not responding")
+        cache = self.cache
+        if cache is not None:
+            for command in commands:
+                cache.invalidate_command(command)
+
+        instrumentation = self.instrumentation
+        rtt = self.rtt
+        starts: Dict[int, float] = {}
+        # SID -> send time of requests sent once, for RTT samples.
+        sent: Dict[int, float] = {}
+        attempts = [0] * len(commands)
+        responses: List[Optional[Response]] = [None] * len(commands)
+        outstanding: Dict[int, int] = {}
+        next_index = 0
+
+        def transmit(index: int) -> None:
+            cmd = commands[index]
+            sid = self._next_sid()
+            cmd.sid = sid
+            outstanding[sid] = index
+            if instrumentation is not None:
+                starts[sid] = instrumentation.request(self, cmd)
+            if rtt is not None and not attempts[index]:
+                sent[sid] = time.perf_counter()
+            self._send_frame(cmd.raw)
+
+        try:
+            while next_index < len(commands) or outstanding:
+                while next_index < len(commands) and len(outstanding) < window:
+                    transmit(next_index)
+                    next_index += 1
+
+                if rtt is not None:
+                    self._socket.settimeout(rtt.timeout)
+                try:
+                    data = self._recv_frame()
+                except OSError as exc:
+                    lost, outstanding = outstanding, {}
+                    sent.clear()
+                    if instrumentation is not None and isinstance(exc, socket.timeout):
+                        for sid, index in lost.items():
+                            instrumentation.timeout(self, commands[index], starts[sid])
+                    if self._recover(exc) and all(
+                        attempts[index] < self.retries
+                        and commands[index].code in IDEMPOTENT_COMMANDS
+                        for index in lost.values()
+                    ):
+                        for index in sorted(lost.values()):
+                            attempts[index] += 1
+                            transmit(index)
+                        continue
+                    if isinstance(exc, socket.timeout):
+                        raise FinsTimeoutError(
+                            f"No response from {self.host}:{self.port}"
+                        ) from None
+                    raise
+                if len(data) < 14:
+                    continue
+                sid = data[9]
+                index = outstanding.pop(sid, None)
+                if index is None:
+                    continue
+                if sid in sent:
+                    rtt.update(time.perf_counter() - sent.pop(sid))
+                response = responses[index] = Response.from_bytes(
+                    data, command=commands[index], adapter=adapters[index]
+                )
+                if instrumentation is not None:
+                    instrumentation.response(
+                        self, commands[index], response, starts[sid]
+                    )
+        except Exception:
+            if breaker is not None:
+                breaker.failure()
+            raise
+        if breaker is not None:
+            breaker.success()
+        return responses
+
+    def read_many(
+        self,
+        addresses: Sequence[Union[str, bytes]],
+        num_items: int = 1,
+        window: int = 8,
+    ) -> List[Response[bytes]]:
+        """
+        Read ``num_items`` from every address using pipelined requests.
+        """
+        commands = [
+            self._memory_area_read_command(address, num_items) for address in addresses
+        ]
+        return self.send_many(commands, window=window)
+
+    def _next_sid(self) -> int:
+        self.sid = (self.sid + 1) & 0xFF
+        return self.sid
+
+    def _send_frame(self, data: bytes) -> None:
+        if self._reader is None:
+            self._socket.send(data)
+        else:
+            self._socket.sendall(build_frame(data))
+
+    def _recv_frame(self) -> Union[bytes, memoryview]:
+        if self._reader is None:
+            return self._socket.recv(self.buffer_size)
+        while True:
+            command, error_code, payload = self._reader.read_frame()
+            check_error(error_code)
+            if command == FinsTcpCommand.FRAME_SEND:
+                return payload
+
+    def connect(self) -> None:
+        self._socket.connect((self.host, self.port))
+        if self.mode == "tcp":
+            self._handshake()
+
+    def _handshake(self) -> None:
+        """
+        Perform the FINS/TCP node address exchange, the assigned node
+        addresses are used as source and destination node of every frame.
+        """
+        self._reader = FrameReader(self._socket)
+        self._socket.sendall(build_node_address_request())
+        client_node, server_node = parse_node_address_response(
+            *self._reader.read_frame()
+        )
+        self.sa1 = client_node & 0xFF
+        self.da1 = server_node & 0xFF
+
+    def reconnect(self) -> None:
+        """Replace the socket by a new one and connect it again."""
+        self._socket.close()
+        self._socket = self._create_socket()
+        self._reader = None
+        self.connect()
+
+    def close(self) -> None:
+        self._socket.close()
+
+    def __del__(self) -> None:
+        self._socket.close()
+
+    def memory_area_read(
+        self, address: Union[str, bytes], num_items: int = 1
+    ) -> Response[bytes]:
+        """
+        Read ``num_items`` from ``address``. Reads larger than a single frame
+        are split into pipelined requests. With a :attr:`cache`, reads are
+        answered from it when possible.
+        """
+        cache = self.cache
+        if cache is not None:
+            response = self._cached_read(address, num_items)
+            if response is not None:
+                return response
+            generation = cache.generation(MemoryArea(address))
+        commands = self._memory_area_read_commands(address, num_items)
+        if len(commands) == 1:
+            response = self.send(commands[0])
+        else:
+            responses = self.send_many(commands, window=self.window)
+            response = self._join_read_responses(responses)
+        if cache is not None and response.ok:
+            cache.put(MemoryArea(address), num_items, response.data, generation)
+        return response
+
+    def memory_area_write(
+        self, address: Union[str, bytes], data: bytes, num_items: int = 1
+    ) -> Response[bytes]:
+        """
+        Write ``num_items`` to ``address``. Writes larger than a single frame
+        are split into pipelined requests.
+        """
+        commands = self._memory_area_write_commands(address, data, num_items)
+        if len(commands) == 1:
+            return self.send(commands[0])
+        responses = self.send_many(commands, window=self.window)
+        return self._join_write_responses(responses)
+
+    def memory_area_fill(
+        self, address: Union[str, bytes], data: bytes, num_items: int = 1
+    ) -> Response[bytes]:
+        return self.send(self._memory_area_fill_command(address, data, num_items))
+
+    def multiple_memory_area_read(
+        self, *addresses: Union[str, bytes], group_bits: bool = False
+    ) -> Response[List[bytes]]:
+        """
+        Read scattered addresses in one request. With ``group_bits``, bits
+        are read through their word, every word once, instead of one item
+        per bit. The data is the same either way.
+        """
+        addrs = [MemoryArea(address) for address in addresses]
+        if group_bits:
+            reads, adapter = self._group_bits(addrs)
+            return self.send(self._multiple_memory_area_read_command(reads), adapter)
+        cmd = self._multiple_memory_area_read_command(addrs)
+        return self.send(cmd, MultipleMemoryAreaReadDataAdapter(addrs))
+
+    def read_bits(
+        self,
+        address: Union[str, bytes],
+        count: int = 1,
+        use_numpy: Optional[bool] = None,
+    ) -> Union[List[bool], "numpy.ndarray"]:
+        """
+        Read ``count`` consecutive bits from ``address`` by reading the words
+        covering them, 16 bits per word instead of one byte per bit. Returns
+        the bits as returned by :func:`decode_bits <fins.adapters.decode_bits>`.
+        """
+        word, bit, words = self._bit_range(address, count)
+        response = self.memory_area_read(word, words)
+        if not response.ok:
+            raise FinsException(f"Read failed: {response.status_text}")
+        return decode_bits(response.data, bit, count, use_numpy)
+
+    def write_bits(
+        self,
+        address: Union[str, bytes],
+        values: Sequence,
+        method: Literal["auto", "word", "bit", "read_modify_write", "force"] = "auto",
+    ) -> Response[bytes]:
+        """
+        Write consecutive bits from ``address``.
+
+        ``word`` writes whole words and needs word aligned bits, ``bit``
+        writes one byte per bit with the bit area code, ``read_modify_write``
+        reads the covering words and writes them back, which is not atomic,
+        and ``force`` uses forced set/reset specifications that release the
+        bits. ``auto`` picks ``word`` for whole words, ``bit`` otherwise.
+        """
+        bits = [bool(value) for value in values]
+        if method == "auto":
+            word, bit, _ = self._bit_range(address, len(bits))
+            method = "word" if not bit and not len(bits) % 16 else "bit"
+        if method == "read_modify_write":
+            word, bit, words = self._bit_range(address, len(bits))
+            response = self.memory_area_read(word, words)
+            if not response.ok:
+                return response
+            data = self._merge_bits(response.data, bit, bits)
+            return self.memory_area_write(word, data, words)
+        commands = self._bit_write_commands(address, bits, method)
+        if len(commands) == 1:
+            return self.send(commands[0])
+        return self._join_write_responses(self.send_many(commands, self.window))
+
+    def memory_area_transfer(
+        self,
+        source_address: Union[str, bytes],
+        dest_address: Union[str, bytes],
+        num_items: int = 1,
+    ) -> Response[bytes]:
+        cmd = self._memory_area_transfer_command(
+            source_address, dest_address, num_items
+        )
         return self.send(cmd)
+
+    def run(
+        self,
+        mode: Literal["debug", "monitor", "run"] = "monitor",
+        program_number: bytes = b"\xff\xff",
+    ) -> Response[bytes]:
+        return self.send(self._run_command(mode, program_number))
+
+    def stop(self) -> Response[bytes]:
+        return self.send(self._stop_command())
+
+    def forced_set_reset(self, *specs: SetResetSpec) -> Response[bytes]:
+        return self.send(self._forced_set_reset_command(list(specs)))
+
+    def forced_set_reset_cancel(self) -> Response[bytes]:
+        return self.send(self._forced_set_reset_cancel_command())
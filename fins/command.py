@@ -1,4 +1,5 @@
-from typing import Union, Optional
+import struct
+from typing import Optional, Union
 
 from .header import Header
 from .memory import MemoryArea
@@ -54,29 +55,109 @@ class CommandCode:
     FORCED_SET_RESET_CANCEL = b"\x23\x02"
 
 
+#: Maximum number of items of a single memory area read command.
+MAX_MEMORY_AREA_READ_ITEMS = 999
+
+#: Maximum number of items of a single memory area write command.
+MAX_MEMORY_AREA_WRITE_ITEMS = 996
+
+#: Maximum number of addresses of a single multiple memory area read command.
+MAX_MULTIPLE_MEMORY_AREA_READ_ITEMS = 167
+
+#: Maximum number of specifications of a single forced set/reset command.
+MAX_FORCED_SET_RESET_ITEMS = 332
+
+
 class Command:
     """
     A class to encapsulate FINS command.
+
+    A command is either built from its header, code and data, or from an
+    already encoded frame with :meth:`from_raw`, in which case the header is
+    only decoded when accessed.
     """
 
+    __slots__ = ("_header", "_code", "_data", "_raw")
+
     def __init__(
         self, code: bytes, data: bytes = b"", header: Optional[Header] = None
     ) -> None:
         if header is None:
             header = Header.default()
 
-        #: Command header.
-        self.header = header
+        self._header: Optional[Header] = header
+        self._code = code
+        self._data = data
+        self._raw: Optional[bytes] = None
+
+    @classmethod
+    def from_raw(cls, raw: bytes) -> "Command":
+        """Build a command from an encoded FINS frame."""
+        self = cls.__new__(cls)
+        self._header = self._code = self._data = None
+        self._raw = raw
+        return self
+
+    @property
+    def code(self) -> bytes:
+        """Command code, in bytes."""
+        if self._code is None:
+            self._code = self._raw[10:12]
+        return self._code
+
+    @code.setter
+    def code(self, code: bytes) -> None:
+        if self._raw is not None:
+            self._raw = self._raw[:10] + code + self._raw[12:]
+        self._code = code
+
+    @property
+    def data(self) -> bytes:
+        """Command data, in bytes."""
+        if self._data is None:
+            self._data = self._raw[12:]
+        return self._data
+
+    @data.setter
+    def data(self, data: bytes) -> None:
+        if self._raw is not None:
+            self._raw = self._raw[:12] + data
+        self._data = data
 
-        #: Command code, in bytes.
-        self.code = code
+    @property
+    def header(self) -> Header:
+        """Command header."""
+        if self._header is None:
+            self._header = Header.from_bytes(self._raw[:10])
+            self._code = self.code
+            self._data = self.data
+            self._raw = None
+        return self._header
+
+    @header.setter
+    def header(self, header: Header) -> None:
+        self._header = header
+        self._raw = None
 
-        #: Command data, in bytes.
-        self.data = data
+    @property
+    def sid(self) -> int:
+        """Service ID of the command."""
+        if self._raw is not None:
+            return self._raw[9]
+        return self._header.sid[0]
+
+    @sid.setter
+    def sid(self, sid: int) -> None:
+        if self._raw is not None:
+            self._raw = self._raw[:9] + bytes((sid,)) + self._raw[10:]
+        else:
+            self._header.sid = sid.to_bytes(1, "big")
 
     @property
     def raw(self) -> bytes:
         """Returns the content of the command, in bytes."""
+        if self._raw is not None:
+            return self._raw
         return self.header.raw + self.code + self.data
 
     def __repr__(self) -> str:
@@ -86,6 +167,30 @@ class Command:
         return str(self.raw)
 
 
+class CommandTemplate:
+    """
+    A preencoded command of a fixed shape.
+
+    The header and command code are encoded once into a preallocated buffer,
+    building a command only patches the SID and the fixed size parameters,
+    given as a :mod:`struct` format, with ``pack_into``.
+    """
+
+    __slots__ = ("_buffer", "_params")
+
+    def __init__(self, header: bytes, code: bytes, params: str = "") -> None:
+        self._params = struct.Struct(">" + params)
+        self._buffer = bytearray(header + code + bytes(self._params.size))
+
+    def build(self, sid: int, *params, data: bytes = b"") -> Command:
+        buffer = self._buffer
+        buffer[9] = sid
+        self._params.pack_into(buffer, 12, *params)
+        if data:
+            return Command.from_raw(b"".join((buffer, data)))
+        return Command.from_raw(bytes(buffer))
+
+
 class SetResetSpecCode:
     FORCE_RESET = b"\x00\x00"
     FORCE_SET = b"\x00\x01"
@@ -0,0 +1,310 @@
+"""
+Concurrent discovery of FINS nodes.
+
+:class:`NodeScanner` sends a controller data read to every candidate of a
+subnet or node number range from a single UDP socket, with up to
+``max_in_flight`` requests outstanding, and builds an inventory of the nodes
+that answered with their model, version, memory sizes and round trip time.
+A whole /24 is scanned in about one timeout period. It also runs
+standalone::
+
+    python -m fins.discovery 192.168.250.0/24 --timeout 0.5
+"""
+
+import argparse
+import ipaddress
+import selectors
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .command import CommandCode
+from .header import Header
+from .target import Target
+
+#: Model, version, system use and area data of a controller data read response.
+CONTROLLER_DATA = struct.Struct(">20s20s40sHBHBBHBH")
+
+
+@dataclass(frozen=True)
+class NodeInfo:
+    """
+    A node that answered a controller data read.
+
+    Memory sizes are None when the response did not include the area data,
+    and every field but ``target``, ``end_code`` and ``rtt`` is empty when the
+    node answered with an error end code.
+    """
+
+    target: Target
+    #: End code of the response, 0 on success.
+    end_code: int
+    #: Round trip time of the request in seconds.
+    rtt: float
+    model: str = ""
+    version: str = ""
+    #: Program area size in Kwords.
+    program_area_size: Optional[int] = None
+    #: CIO, W, H and A area size in Kbytes.
+    iom_size: Optional[int] = None
+    #: Number of DM words.
+    dm_words: Optional[int] = None
+    #: Timer and counter area size in Kbytes.
+    timer_counter_size: Optional[int] = None
+    #: Number of EM banks.
+    em_banks: Optional[int] = None
+    #: Number of SFC steps and transitions.
+    steps: Optional[int] = None
+    memory_card_type: Optional[int] = None
+    #: Memory card size in Kbytes.
+    memory_card_size: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.end_code
+
+    @classmethod
+    def from_response(cls, target: Target, rtt: float, frame: bytes) -> "NodeInfo":
+        """Parse the response frame of a controller data read."""
+        end_code = int.from_bytes(frame[12:14], "big")
+        data = frame[14:]
+        if end_code or len(data) < 40:
+            return cls(target, end_code, rtt)
+        model = data[:20].rstrip(b"\x00 ").decode("ascii", "replace")
+        version = data[20:40].rstrip(b"\x00 ").decode("ascii", "replace")
+        if len(data) < CONTROLLER_DATA.size:
+            return cls(target, end_code, rtt, model, version)
+        return cls(
+            target,
+            end_code,
+            rtt,
+            model,
+            version,
+            *CONTROLLER_DATA.unpack_from(data)[3:],
+        )
+
+
+def candidates(
+    network: str,
+    nodes: Optional[Iterable[int]] = None,
+    port: int = 9600,
+    **addresses: int,
+) -> List[Target]:
+    """
+    Returns the targets of every host of ``network``, an address or a subnet
+    such as ``"192.168.250.0/24"``.
+
+    Without ``nodes``, the destination node of every host is the last byte of
+    its IP address, as with the automatic address conversion of Omron
+    Ethernet units. Otherwise every node of ``nodes`` is tried on every host,
+    e.g. to find the nodes behind a gateway. Other node addresses, such as
+    ``dna`` or ``sa1``, are passed to every :class:`Target`.
+    """
+    subnet = ipaddress.ip_network(network, strict=False)
+    if subnet.num_addresses <= 2:
+        hosts = list(subnet)
+    else:
+        hosts = list(subnet.hosts())
+    node_list = None if nodes is None else list(nodes)
+    targets = []
+    for host in hosts:
+        for node in node_list or (int(host.packed[-1]),):
+            targets.append(Target(str(host), port, da1=node, **addresses))
+    return targets
+
+
+class NodeScanner:
+    """
+    Scan many candidate nodes from a single bound UDP socket.
+
+    Candidates are probed with a controller data read, at most
+    ``max_in_flight`` at once. Responses are matched back by source address
+    and SID, so that several nodes behind the same address can be probed
+    together. Candidates without a response within ``timeout`` are left out
+    of the inventory.
+    """
+
+    def __init__(
+        self,
+        bind: Tuple[str, int] = ("0.0.0.0", 0),
+        timeout: float = 1.0,
+        max_in_flight: int = 256,
+        buffer_size: int = 4096,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be positive")
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.buffer_size = buffer_size
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(bind)
+        self._socket.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._socket, selectors.EVENT_READ)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Returns the local address of the socket."""
+        return self._socket.getsockname()
+
+    def __enter__(self) -> "NodeScanner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._selector.close()
+        self._socket.close()
+
+    @staticmethod
+    def _probe(target: Target, sid: int) -> bytes:
+        header = Header.pack(
+            0x80,
+            0x00,
+            0x07,
+            target.dna,
+            target.da1,
+            target.da2,
+            target.sna,
+            target.sa1,
+            target.sa2,
+            sid,
+        )
+        return header + CommandCode.CONTROLLER_DATA_READ
+
+    def scan(self, targets: Iterable[Target]) -> List[NodeInfo]:
+        """
+        Probe every target and returns the nodes that answered, in target
+        order. Targets whose host cannot be resolved are skipped.
+        """
+        pending: List[Tuple[int, Target, Tuple[str, int]]] = []
+        for index, target in enumerate(targets):
+            try:
+                address = (socket.gethostbyname(target.host), target.port)
+            except OSError:
+                continue
+            pending.append((index, target, address))
+        pending.reverse()
+
+        found: Dict[int, NodeInfo] = {}
+        # (address, SID) -> (index, target, send time, deadline)
+        in_flight: Dict[Tuple[Tuple[str, int], int], Tuple] = {}
+        # Address -> last SID used
+        sids: Dict[Tuple[str, int], int] = {}
+        waiting: List[Tuple[int, Target, Tuple[str, int]]] = []
+        while pending or in_flight:
+            while pending and len(in_flight) < self.max_in_flight:
+                index, target, address = pending.pop()
+                sid = self._next_sid(address, sids, in_flight)
+                if sid is None:
+                    waiting.append((index, target, address))
+                    continue
+                now = time.monotonic()
+                in_flight[address, sid] = (index, target, now, now + self.timeout)
+                try:
+                    self._socket.sendto(self._probe(target, sid), address)
+                except OSError:
+                    del in_flight[address, sid]
+            pending.extend(reversed(waiting))
+            waiting.clear()
+            if not in_flight:
+                continue
+
+            deadline = min(entry[3] for entry in in_flight.values())
+            if self._selector.select(max(0.0, deadline - time.monotonic())):
+                self._drain(in_flight, found)
+            now = time.monotonic()
+            for key in [key for key, entry in in_flight.items() if entry[3] <= now]:
+                del in_flight[key]
+        return [found[index] for index in sorted(found)]
+
+    @staticmethod
+    def _next_sid(
+        address: Tuple[str, int], sids: Dict[Tuple[str, int], int], in_flight: Dict
+    ) -> Optional[int]:
+        sid = sids.get(address, 0)
+        for _ in range(256):
+            sid = (sid + 1) & 0xFF
+            if (address, sid) not in in_flight:
+                sids[address] = sid
+                return sid
+        return None
+
+    def _drain(self, in_flight: Dict, found: Dict[int, NodeInfo]) -> None:
+        while True:
+            try:
+                data, address = self._socket.recvfrom(self.buffer_size)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionRefusedError:
+                continue
+            if len(data) < 14 or data[10:12] != CommandCode.CONTROLLER_DATA_READ:
+                continue
+            entry = in_flight.pop((address, data[9]), None)
+            if entry is None:
+                continue
+            index, target, sent, _ = entry
+            found[index] = NodeInfo.from_response(target, time.monotonic() - sent, data)
+
+
+def discover(
+    network: str,
+    nodes: Optional[Iterable[int]] = None,
+    port: int = 9600,
+    timeout: float = 1.0,
+    max_in_flight: int = 256,
+    **addresses: int,
+) -> List[NodeInfo]:
+    """Scan the :func:`candidates` of ``network`` and returns the inventory."""
+    with NodeScanner(timeout=timeout, max_in_flight=max_in_flight) as scanner:
+        return scanner.scan(candidates(network, nodes, port, **addresses))
+
+
+def _node_range(value: str) -> range:
+    first, _, last = value.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Discover FINS nodes")
+    parser.add_argument("network", help="address or subnet, e.g. 192.168.250.0/24")
+    parser.add_argument("--port", type=int, default=9600)
+    parser.add_argument(
+        "--nodes",
+        type=_node_range,
+        help="destination node range, e.g. 1-32, default: last byte of the address",
+    )
+    parser.add_argument("--dna", type=int, default=0)
+    parser.add_argument("--sa1", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=1.0, help="seconds")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    inventory = discover(
+        args.network,
+        args.nodes,
+        args.port,
+        timeout=args.timeout,
+        max_in_flight=args.max_in_flight,
+        dna=args.dna,
+        sa1=args.sa1,
+    )
+    for node in inventory:
+        target = node.target
+        line = f"{target.host}:{target.port} node {target.da1} {node.rtt * 1000:.1f} ms"
+        if node.ok:
+            line += f" {node.model} {node.version}"
+            if node.dm_words is not None:
+                line += f" DM {node.dm_words} words, EM {node.em_banks} banks"
+        else:
+            line += f" end code {node.end_code:04x}"
+        print(line)
+    print(f"{len(inventory)} node(s) found")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,13 @@
+import socket
+
+
 class FinsException(Exception):
     pass
+
+
+class FinsTimeoutError(FinsException, socket.timeout):
+    """No response was received in time."""
+
+
+class CircuitOpenError(FinsException):
+    """The target failed repeatedly, requests are rejected without sending."""
@@ -0,0 +1,292 @@
+import selectors
+import socket
+import time
+from collections import deque
+from typing import (
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .client import BaseFinsClient
+from .command import Command
+from .exceptions import CircuitOpenError, FinsException, FinsTimeoutError
+from .planner import ReadPlan
+from .resilience import IDEMPOTENT_COMMANDS, CircuitBreaker, RttEstimator
+from .response import Response
+from .target import Target
+
+#: A request of the fleet poller: (target, command, adapter).
+FleetRequest = Tuple[Target, Command, Optional[callable]]
+
+
+class _Node:
+    def __init__(self, target: Target, address: Tuple[str, int], limit: int) -> None:
+        self.target = target
+        self.address = address
+        self.limit = limit
+        self.builder = BaseFinsClient.from_target(target)
+        self.sid = 0
+        self.rtt: Optional[RttEstimator] = None
+        self.breaker: Optional[CircuitBreaker] = None
+        # (request index, attempt)
+        self.queue: Deque[Tuple[int, int]] = deque()
+        # SID -> (request index, attempt, send time, deadline)
+        self.in_flight: Dict[int, Tuple[int, int, float, float]] = {}
+
+    def next_sid(self) -> int:
+        for _ in range(256):
+            self.sid = (self.sid + 1) & 0xFF
+            if self.sid not in self.in_flight:
+                return self.sid
+        raise FinsException("No free service ID available")
+
+
+class FleetPoller:
+    """
+    Poll many PLCs over a single bound UDP socket.
+
+    Requests to all targets are interleaved on one socket, at most
+    ``max_in_flight`` per target (or the target's own limit), and responses
+    are demultiplexed by source address and SID. Every wake-up drains all
+    pending datagrams with non-blocking receives before sending more
+    requests, which batches syscalls the way ``recvmmsg`` would.
+
+    With ``adaptive_timeout`` the timeout of every target follows its
+    measured round trip time, up to ``timeout``. Idempotent reads that time
+    out are retransmitted up to ``retries`` times. With a
+    ``failure_threshold``, a target that failed that many times in a row is
+    skipped, its requests fail with :class:`CircuitOpenError` right away,
+    until a probe request succeeds again. Only the probe is sent to a
+    half-open target; its other requests are sent once the probe succeeds,
+    or fail if it does not.
+    """
+
+    def __init__(
+        self,
+        bind: Tuple[str, int] = ("0.0.0.0", 0),
+        timeout: float = 2.0,
+        max_in_flight: int = 2,
+        buffer_size: int = 4096,
+        retries: int = 0,
+        adaptive_timeout: bool = False,
+        failure_threshold: Optional[int] = None,
+        reset_timeout: float = 5.0,
+    ) -> None:
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.buffer_size = buffer_size
+        self.retries = retries
+        self.adaptive_timeout = adaptive_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(bind)
+        self._socket.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._socket, selectors.EVENT_READ)
+        self._nodes: Dict[Target, _Node] = {}
+        self._addresses: Dict[Tuple[str, int], _Node] = {}
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Returns the local address of the socket."""
+        return self._socket.getsockname()
+
+    @property
+    def targets(self) -> List[Target]:
+        return list(self._nodes)
+
+    def add_target(self, target: Target) -> None:
+        if target in self._nodes:
+            return
+        address = (socket.gethostbyname(target.host), target.port)
+        if address in self._addresses:
+            raise ValueError(f"Another target already uses {address}")
+        limit = target.max_in_flight or self.max_in_flight
+        node = _Node(target, address, limit)
+        if self.adaptive_timeout:
+            node.rtt = RttEstimator(initial=self.timeout, max_timeout=self.timeout)
+        if self.failure_threshold is not None:
+            node.breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        self._nodes[target] = node
+        self._addresses[address] = node
+
+    def remove_target(self, target: Target) -> None:
+        node = self._nodes.pop(target)
+        del self._addresses[node.address]
+
+    def rtt(self, target: Target) -> Optional[RttEstimator]:
+        """Returns the round trip time estimator of ``target``, if any."""
+        return self._nodes[target].rtt
+
+    def breaker(self, target: Target) -> Optional[CircuitBreaker]:
+        """Returns the circuit breaker of ``target``, if any."""
+        return self._nodes[target].breaker
+
+    def builder(self, target: Target) -> BaseFinsClient:
+        """Returns the command builder of ``target``."""
+        self.add_target(target)
+        return self._nodes[target].builder
+
+    def close(self) -> None:
+        self._selector.close()
+        self._socket.close()
+
+    def __enter__(self) -> "FleetPoller":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def execute(
+        self, requests: Sequence[FleetRequest]
+    ) -> List[Union[Response, FinsException]]:
+        """
+        Send all requests and wait for their responses, returned in request
+        order. Requests without a response within ``timeout`` get a
+        :class:`FinsTimeoutError` instead.
+        """
+        results: List[Union[Response, FinsException, None]] = [None] * len(requests)
+        nodes: List[_Node] = []
+        for index, (target, _, _) in enumerate(requests):
+            self.add_target(target)
+            node = self._nodes[target]
+            if not node.queue:
+                nodes.append(node)
+            node.queue.append((index, 0))
+
+        active = []
+        for node in nodes:
+            if node.breaker is None or node.breaker.allow():
+                active.append(node)
+                continue
+            error = CircuitOpenError(f"{node.target.host}:{node.target.port} is down")
+            for index, _ in node.queue:
+                results[index] = error
+            node.queue.clear()
+
+        while active:
+            now = time.monotonic()
+            for node in active:
+                timeout = self.timeout if node.rtt is None else node.rtt.timeout
+                limit = node.limit
+                if (
+                    node.breaker is not None
+                    and node.breaker.state != CircuitBreaker.CLOSED
+                ):
+                    # Only the probe is sent, the rest waits for its result.
+                    limit = 1
+                while node.queue and len(node.in_flight) < limit:
+                    index, attempt = node.queue.popleft()
+                    command = requests[index][1]
+                    command.sid = node.next_sid()
+                    node.in_flight[command.sid] = (index, attempt, now, now + timeout)
+                    self._socket.sendto(command.raw, node.address)
+
+            deadline = min(
+                entry[3] for node in active for entry in node.in_flight.values()
+            )
+            if self._selector.select(max(0.0, deadline - time.monotonic())):
+                self._drain(requests, results)
+            self._expire(requests, results, active)
+            active = [node for node in active if node.queue or node.in_flight]
+        return results
+
+    def _drain(self, requests: Sequence[FleetRequest], results: List) -> None:
+        while True:
+            try:
+                data, address = self._socket.recvfrom(self.buffer_size)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionRefusedError:
+                continue
+            node = self._addresses.get(address)
+            if node is None or len(data) < 14:
+                continue
+            entry = node.in_flight.pop(data[9], None)
+            if entry is None:
+                continue
+            index, attempt, sent, _ = entry
+            if node.rtt is not None and not attempt:
+                node.rtt.update(time.monotonic() - sent)
+            if node.breaker is not None:
+                node.breaker.success()
+            _, command, adapter = requests[index]
+            results[index] = Response.from_bytes(data, command, adapter)
+
+    def _expire(
+        self, requests: Sequence[FleetRequest], results: List, nodes: List[_Node]
+    ) -> None:
+        now = time.monotonic()
+        for node in nodes:
+            expired = [
+                (sid, entry) for sid, entry in node.in_flight.items() if entry[3] <= now
+            ]
+            if not expired:
+                continue
+            if node.rtt is not None:
+                node.rtt.backoff()
+            for sid, (index, attempt, _, _) in expired:
+                del node.in_flight[sid]
+                command = requests[index][1]
+                if attempt < self.retries and command.code in IDEMPOTENT_COMMANDS:
+                    node.queue.appendleft((index, attempt + 1))
+                    continue
+                if node.breaker is not None:
+                    node.breaker.failure()
+                results[index] = FinsTimeoutError(
+                    f"No response from {node.target.host}:{node.target.port}"
+                )
+            if node.breaker is not None and node.breaker.state == CircuitBreaker.OPEN:
+                error = CircuitOpenError(
+                    f"{node.target.host}:{node.target.port} is down"
+                )
+                for index, _ in node.queue:
+                    results[index] = error
+                node.queue.clear()
+
+    def read_many(
+        self, reads: Sequence[Tuple[Target, Union[str, bytes], int]]
+    ) -> List[Union[Response, FinsException]]:
+        """Execute ``(target, address, num_items)`` memory area reads."""
+        requests = [
+            (
+                target,
+                self.builder(target)._memory_area_read_command(address, count),
+                None,
+            )
+            for target, address, count in reads
+        ]
+        return self.execute(requests)
+
+    def poll(
+        self, plans: Mapping[Target, ReadPlan]
+    ) -> Dict[Target, Dict[Hashable, Optional[bytes]]]:
+        """
+        Execute a read plan on every target at once. Values of failed or timed
+        out requests are None.
+        """
+        requests: List[FleetRequest] = []
+        slices: Dict[Target, slice] = {}
+        for target, plan in plans.items():
+            commands, adapters = plan.commands(self.builder(target))
+            start = len(requests)
+            requests.extend(zip([target] * len(commands), commands, adapters))
+            slices[target] = slice(start, len(requests))
+
+        results = [
+            result if isinstance(result, Response) else None
+            for result in self.execute(requests)
+        ]
+        return {
+            target: plan.scatter(results[slices[target]])
+            for target, plan in plans.items()
+        }
@@ -0,0 +1,536 @@
+"""
+A FINS gateway sharing PLC sessions between many clients.
+
+:class:`FinsGateway` accepts FINS requests over UDP and FINS/TCP and forwards
+them to the PLCs behind it, over one upstream :class:`FinsClient` session per
+PLC. Upstream requests use the SIDs and node addresses of the gateway
+session, responses are rewritten back to the SID and nodes of the client.
+Identical reads queued or in flight are merged into one upstream request,
+repeated reads can be answered from a short lived cache and small memory area
+reads of different clients are batched into multiple memory area reads. It
+runs in background threads or standalone::
+
+    python -m fins.gateway 192.168.1.10 --port 9600 --cache-ttl 0.05
+"""
+
+import argparse
+import itertools
+import queue
+import select
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .adapters import MultipleMemoryAreaReadDataAdapter
+from .client import FinsClient
+from .command import MAX_MULTIPLE_MEMORY_AREA_READ_ITEMS, Command, CommandCode
+from .exceptions import FinsException
+from .header import Header
+from .memory import BIT_AREAS_WORD, WORD_AREAS_BIT, MemoryArea
+from .response import Response
+from .target import Target
+from .tcp import FinsTcpCommand, FrameReader, build_frame, check_error
+
+#: Commands whose response only depends on their parameters, merged and cached.
+READ_COMMANDS = frozenset(
+    (CommandCode.MEMORY_AREA_READ, CommandCode.MULTIPLE_MEMORY_AREA_READ)
+)
+
+#: End code answered when the PLC did not respond.
+RESPONSE_TIMEOUT = b"\x02\x05"
+
+#: Called with the response code, end code and data of a request.
+Reply = Callable[[bytes], None]
+
+
+class _Request:
+    """A request waiting for its upstream response, shared by merged reads."""
+
+    __slots__ = ("key", "waiters")
+
+    def __init__(self, key: bytes, reply: Reply) -> None:
+        #: Command code and parameters.
+        self.key = key
+        self.waiters: List[Reply] = [reply]
+
+    @property
+    def code(self) -> bytes:
+        return self.key[:2]
+
+
+class _Batch:
+    """Memory area reads of several requests sent as one multiple read."""
+
+    __slots__ = ("requests", "addresses", "counts")
+
+    def __init__(self) -> None:
+        self.requests: List[_Request] = []
+        self.addresses: List[MemoryArea] = []
+        self.counts: List[int] = []
+
+    def add(self, request: _Request, count: int) -> None:
+        first = MemoryArea(request.key[2:6])
+        self.requests.append(request)
+        self.addresses.extend(first.offset(index) for index in range(count))
+        self.counts.append(count)
+
+
+class _Upstream:
+    """The session with one PLC and its pending requests."""
+
+    def __init__(self, gateway: "FinsGateway", target: Target) -> None:
+        self.gateway = gateway
+        self.target = target
+        self.client = FinsClient.from_target(
+            target, mode=gateway.upstream_mode, timeout=gateway.timeout
+        )
+        self.client.retries = gateway.retries
+        self.connected = False
+        self.queue: "queue.Queue[_Request]" = queue.Queue()
+        # Command code and parameters -> request queued or in flight.
+        self.pending: Dict[bytes, _Request] = {}
+        # Command code and parameters -> (expiry, response body)
+        self.cache: Dict[bytes, Tuple[float, bytes]] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, key: bytes, reply: Reply) -> None:
+        gateway = self.gateway
+        if key[:2] not in READ_COMMANDS:
+            with self.lock:
+                # Any other command may change the memory of the PLC, reads
+                # queued after it must not be answered by earlier reads.
+                self.pending.clear()
+                self.cache.clear()
+                self.queue.put(_Request(key, reply))
+            return
+        with self.lock:
+            cached = self.cache.get(key) if gateway.cache_ttl else None
+            if cached is None or cached[0] <= time.monotonic():
+                cached = None
+                request = self.pending.get(key)
+                if request is not None:
+                    gateway.merged += 1
+                    request.waiters.append(reply)
+                    return
+                request = self.pending[key] = _Request(key, reply)
+                self.queue.put(request)
+        if cached is not None:
+            gateway.cache_hits += 1
+            reply(cached[1])
+
+    def run(self) -> None:
+        gateway = self.gateway
+        while not gateway._stopping.is_set():
+            try:
+                requests = [self.queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            if gateway.batch_delay:
+                time.sleep(gateway.batch_delay)
+            while True:
+                try:
+                    requests.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.forward(requests)
+        self.client.close()
+
+    def _batch_count(self, request: _Request) -> int:
+        """Returns the number of items of a batchable read, else 0."""
+        key = request.key
+        if key[:2] != CommandCode.MEMORY_AREA_READ or len(key) != 8:
+            return 0
+        if key[2:3] not in BIT_AREAS_WORD and key[2:3] not in WORD_AREAS_BIT:
+            return 0
+        count = int.from_bytes(key[6:8], "big")
+        return count if 0 < count <= self.gateway.batch_items else 0
+
+    def _command(self, key: bytes) -> Command:
+        client = self.client
+        header = Header.pack(
+            0x80,
+            0x00,
+            0x07,
+            client.dna,
+            client.da1,
+            client.da2,
+            client.sna,
+            client.sa1,
+            client.sa2,
+        )
+        return Command.from_raw(header + key)
+
+    def forward(self, requests: List[_Request]) -> None:
+        """Send requests upstream, in order, and answer them."""
+        units: List[Union[_Request, _Batch]] = []
+        batch: Optional[_Batch] = None
+        for request in requests:
+            count = self._batch_count(request)
+            if not count:
+                batch = None
+                units.append(request)
+                continue
+            if batch is None or (
+                len(batch.addresses) + count > MAX_MULTIPLE_MEMORY_AREA_READ_ITEMS
+            ):
+                batch = _Batch()
+                units.append(batch)
+            batch.add(request, count)
+        units = [
+            (
+                unit.requests[0]
+                if isinstance(unit, _Batch) and len(unit.counts) == 1
+                else unit
+            )
+            for unit in units
+        ]
+
+        commands = []
+        for unit in units:
+            if isinstance(unit, _Batch):
+                commands.append(
+                    self.client._multiple_memory_area_read_command(unit.addresses)
+                )
+            else:
+                commands.append(self._command(unit.key))
+        responses = self.send(commands)
+
+        retry: List[_Request] = []
+        for unit, response in zip(units, responses):
+            if not isinstance(unit, _Batch):
+                self.complete(unit, response)
+            elif response is None:
+                for request in unit.requests:
+                    self.complete(request, None)
+            elif not response.ok:
+                # One bad address fails the whole batch, read them one by one.
+                retry.extend(unit.requests)
+            else:
+                self.gateway.batched += len(unit.requests)
+                self.scatter(unit, response)
+        if retry:
+            responses = self.send([self._command(request.key) for request in retry])
+            for request, response in zip(retry, responses):
+                self.complete(request, response)
+
+    def send(self, commands: List[Command]) -> List[Optional[Response]]:
+        client = self.client
+        try:
+            if not self.connected:
+                client.reconnect()
+                self.connected = True
+            responses = client.send_many(commands, self.gateway.window)
+        except (OSError, FinsException):
+            self.connected = client.mode == "udp"
+            return [None] * len(commands)
+        self.gateway.upstream_requests += len(commands)
+        return responses
+
+    def scatter(self, batch: _Batch, response: Response) -> None:
+        values = MultipleMemoryAreaReadDataAdapter(batch.addresses)(response.raw_data)
+        position = 0
+        for request, count in zip(batch.requests, batch.counts):
+            data = b"".join(values[position : position + count])
+            position += count
+            self.finish(request, CommandCode.MEMORY_AREA_READ + b"\x00\x00" + data)
+
+    def complete(self, request: _Request, response: Optional[Response]) -> None:
+        if response is None:
+            self.finish(request, request.code + RESPONSE_TIMEOUT)
+        else:
+            self.finish(request, bytes(response.raw[10:]))
+
+    def finish(self, request: _Request, body: bytes) -> None:
+        """Answer every client waiting for ``request`` with ``body``."""
+        ok = body[2:4] == b"\x00\x00"
+        with self.lock:
+            if request.code in READ_COMMANDS:
+                if self.pending.get(request.key) is request:
+                    del self.pending[request.key]
+                if ok and self.gateway.cache_ttl:
+                    if len(self.cache) >= self.gateway.cache_size:
+                        self.cache.clear()
+                    expiry = time.monotonic() + self.gateway.cache_ttl
+                    self.cache[request.key] = (expiry, body)
+            elif self.cache:
+                # Any other command may change the memory of the PLC.
+                self.cache.clear()
+        for reply in request.waiters:
+            reply(body)
+
+
+class FinsGateway:
+    """
+    Serve FINS clients through shared upstream sessions.
+
+    ``routes`` is a single :class:`Target` serving every request, or a
+    mapping of the destination node number (DA1) requested by clients to
+    the target serving it; requests to other nodes are dropped. FINS/TCP
+    clients are assigned ``node`` as destination node by the handshake.
+
+    Reads identical to a read queued or in flight are merged into it, unless
+    another command to the same PLC was queued in between. With a
+    ``cache_ttl``, successful reads are answered from a cache for that many
+    seconds, any other command clears the cache of its PLC. Memory area
+    reads of at most ``batch_items`` items sent together are batched into
+    multiple memory area reads, ``batch_delay`` lets requests of more
+    clients accumulate before sending. Use port 0 to bind ephemeral ports.
+    """
+
+    def __init__(
+        self,
+        routes: Union[Target, Mapping[int, Target]],
+        host: str = "0.0.0.0",
+        port: int = 9600,
+        modes: Sequence[str] = ("udp", "tcp"),
+        node: int = 1,
+        cache_ttl: float = 0.0,
+        cache_size: int = 4096,
+        batch_items: int = 4,
+        batch_delay: float = 0.0,
+        window: int = 8,
+        upstream_mode: str = "udp",
+        timeout: float = 2.0,
+        retries: int = 0,
+    ) -> None:
+        for mode in modes:
+            if mode not in ("tcp", "udp"):
+                raise ValueError(f"Unknown gateway mode: {mode}")
+        self.routes = routes
+        self.host = host
+        self.port = port
+        self.modes = tuple(modes)
+        self.node = node
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.batch_items = batch_items
+        self.batch_delay = batch_delay
+        self.window = window
+        self.upstream_mode = upstream_mode
+        self.timeout = timeout
+        self.retries = retries
+
+        #: Number of requests received.
+        self.requests: int = 0
+        #: Number of requests sent upstream.
+        self.upstream_requests: int = 0
+        #: Number of reads merged into an identical pending read.
+        self.merged: int = 0
+        #: Number of reads answered from the cache.
+        self.cache_hits: int = 0
+        #: Number of reads answered by a batched multiple read.
+        self.batched: int = 0
+
+        self._upstreams: Dict[Target, _Upstream] = {}
+        self._sockets: Dict[str, socket.socket] = {}
+        self._connections: List[socket.socket] = []
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._client_nodes = itertools.count(node + 1)
+
+    @property
+    def addresses(self) -> Dict[str, Tuple[str, int]]:
+        """Returns the bound address of every mode, only valid once started."""
+        return {mode: sock.getsockname()[:2] for mode, sock in self._sockets.items()}
+
+    def __enter__(self) -> "FinsGateway":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def bind(self) -> None:
+        port = self.port
+        for mode in self.modes:
+            if mode == "udp":
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((self.host, port))
+            if mode == "tcp":
+                sock.listen()
+            # Serve both modes on the same port number.
+            port = sock.getsockname()[1]
+            self._sockets[mode] = sock
+
+    def start(self) -> None:
+        """Bind and serve in background threads."""
+        if self._threads:
+            raise RuntimeError("Gateway is already running")
+        if not self._sockets:
+            self.bind()
+        self._stopping.clear()
+        routes = self.routes
+        targets = [routes] if isinstance(routes, Target) else list(routes.values())
+        for target in targets:
+            if target not in self._upstreams:
+                self._upstreams[target] = _Upstream(self, target)
+        runners: List[Callable[[], None]] = [
+            upstream.run for upstream in self._upstreams.values()
+        ]
+        if "udp" in self._sockets:
+            runners.append(self._serve_udp)
+        if "tcp" in self._sockets:
+            runners.append(self._serve_tcp)
+        for runner in runners:
+            thread = threading.Thread(target=runner, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def serve_forever(self) -> None:
+        """Serve requests until :meth:`stop` is called."""
+        self.start()
+        while not self._stopping.wait(0.5):
+            pass
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+        for sock in self._sockets.values():
+            sock.close()
+        self._sockets = {}
+        self._upstreams = {}
+
+    def _route(self, node: int) -> Optional[_Upstream]:
+        routes = self.routes
+        target = routes if isinstance(routes, Target) else routes.get(node)
+        return None if target is None else self._upstreams.get(target)
+
+    def submit(self, frame: bytes, send: Callable[[bytes], None]) -> None:
+        """
+        Forward a FINS command frame received from a client, its response is
+        passed to ``send`` once available.
+        """
+        if len(frame) < 12 or frame[0] & 0x40:
+            return
+        upstream = self._route(frame[4])
+        if upstream is None:
+            return
+        self.requests += 1
+        if frame[0] & 0x01:
+            # No response required.
+            def reply(body: bytes) -> None:
+                pass
+
+        else:
+            header = b"\xc0\x00\x02" + frame[6:9] + frame[3:6] + frame[9:10]
+
+            def reply(body: bytes) -> None:
+                try:
+                    send(header + body)
+                except OSError:
+                    pass
+
+        upstream.submit(bytes(frame[10:]), reply)
+
+    def _serve_udp(self) -> None:
+        sock = self._sockets["udp"]
+        sock.setblocking(False)
+        while not self._stopping.is_set():
+            readable, _, _ = select.select([sock], [], [], 0.1)
+            # Drain every pending datagram before waiting again.
+            while readable:
+                try:
+                    frame, address = sock.recvfrom(65536)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    continue
+                self.submit(
+                    frame,
+                    lambda response, address=address: sock.sendto(response, address),
+                )
+
+    def _serve_tcp(self) -> None:
+        sock = self._sockets["tcp"]
+        while not self._stopping.is_set():
+            readable, _, _ = select.select([sock], [], [], 0.1)
+            if not readable:
+                continue
+            connection, _ = sock.accept()
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._connections.append(connection)
+            threading.Thread(
+                target=self._serve_connection, args=(connection,), daemon=True
+            ).start()
+
+    def _serve_connection(self, connection: socket.socket) -> None:
+        reader = FrameReader(connection)
+        lock = threading.Lock()
+
+        def send(response: bytes) -> None:
+            with lock:
+                connection.sendall(build_frame(response))
+
+        try:
+            while not self._stopping.is_set():
+                command, error_code, payload = reader.read_frame()
+                check_error(error_code)
+                if command == FinsTcpCommand.NODE_ADDRESS_REQUEST:
+                    client_node = int.from_bytes(payload[:4], "big")
+                    if not client_node:
+                        client_node = next(self._client_nodes) & 0xFF
+                    with lock:
+                        connection.sendall(
+                            build_frame(
+                                client_node.to_bytes(4, "big")
+                                + self.node.to_bytes(4, "big"),
+                                FinsTcpCommand.NODE_ADDRESS_RESPONSE,
+                            )
+                        )
+                elif command == FinsTcpCommand.FRAME_SEND:
+                    self.submit(bytes(payload), send)
+        except (OSError, ValueError, ConnectionError):
+            pass
+        finally:
+            connection.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="FINS gateway")
+    parser.add_argument("plc", help="PLC address, host or host:port")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9600)
+    parser.add_argument("--mode", choices=("udp", "tcp"), action="append")
+    parser.add_argument("--node", type=int, default=1)
+    parser.add_argument("--upstream-mode", choices=("udp", "tcp"), default="udp")
+    parser.add_argument("--cache-ttl", type=float, default=0.0, help="seconds")
+    parser.add_argument("--batch-items", type=int, default=4)
+    parser.add_argument("--batch-delay", type=float, default=0.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=2.0, help="seconds")
+    args = parser.parse_args(argv)
+
+    plc_host, _, plc_port = args.plc.partition(":")
+    gateway = FinsGateway(
+        Target(plc_host, int(plc_port or 9600)),
+        host=args.host,
+        port=args.port,
+        modes=args.mode or ("udp", "tcp"),
+        node=args.node,
+        cache_ttl=args.cache_ttl,
+        batch_items=args.batch_items,
+        batch_delay=args.batch_delay,
+        upstream_mode=args.upstream_mode,
+        timeout=args.timeout,
+    )
+    gateway.bind()
+    for mode, (host, port) in gateway.addresses.items():
+        print(f"Forwarding {mode}://{host}:{port} to {args.plc}")
+    try:
+        gateway.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gateway.stop()
+
+
+if __name__ == "__main__":
+    main()
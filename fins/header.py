@@ -1,5 +1,9 @@
+import struct
 from typing import Iterator
 
+#: Struct of the 10 one-byte header fields.
+HEADER_STRUCT = struct.Struct("10B")
+
 
 class Header:
     """
@@ -7,6 +11,7 @@ class Header:
     """
 
     __attrs__ = ["icf", "rsv", "gct", "dna", "da1", "da2", "sna", "sa1", "sa2", "sid"]
+    __slots__ = tuple(__attrs__)
 
     def __init__(self, **kwargs) -> None:
         for attr in self.__attrs__:
@@ -18,31 +23,33 @@ class Header:
             setattr(self, attr, kwargs[attr])
 
     def __iter__(self) -> Iterator:
-        return iter(self.__dict__)
+        return iter(self.__attrs__)
 
     @property
     def raw(self) -> bytes:
         """
         Returns the raw content of header, in bytes.
         """
-        return (
-            self.icf
-            + self.rsv
-            + self.gct
-            + self.dna
-            + self.da1
-            + self.da2
-            + self.sna
-            + self.sa1
-            + self.sa2
-            + self.sid
+        return b"".join(
+            (
+                self.icf,
+                self.rsv,
+                self.gct,
+                self.dna,
+                self.da1,
+                self.da2,
+                self.sna,
+                self.sa1,
+                self.sa2,
+                self.sid,
+            )
         )
 
     def __repr__(self) -> str:
         return "<FINS Header: {}>".format(self.raw)
 
     def __str__(self) -> str:
-        return str(self.__dict__)
+        return str({attr: getattr(self, attr) for attr in self.__attrs__})
 
     @classmethod
     def from_bytes(cls, data: bytes) -> "Header":
@@ -79,3 +86,22 @@ class Header:
             sa2=b"\x00",
             sid=b"\x00",
         )
+
+    @staticmethod
+    def pack(
+        icf: int = 0x80,
+        rsv: int = 0x00,
+        gct: int = 0x02,
+        dna: int = 0x00,
+        da1: int = 0x00,
+        da2: int = 0x00,
+        sna: int = 0x00,
+        sa1: int = 0x01,
+        sa2: int = 0x00,
+        sid: int = 0x00,
+    ) -> bytes:
+        """
+        Encode header fields given as integers, in a single struct call and
+        without building a Header instance.
+        """
+        return HEADER_STRUCT.pack(icf, rsv, gct, dna, da1, da2, sna, sa1, sa2, sid)
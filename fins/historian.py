@@ -0,0 +1,253 @@
+"""
+Memory-mapped ring buffer historian.
+
+A historian file holds the last ``capacity`` samples of a fixed set of tags,
+stored column by column: one column of timestamps and one column of fixed
+width values per tag. Every record is written twice, at its ring slot and
+``capacity`` slots further, so any window of consecutive samples is
+contiguous in every column and range queries return views of the file
+without copying.
+
+The sample count in the file header is updated after a record is written,
+so readers in other processes only see complete records without taking any
+lock. A reader must check :meth:`Samples.valid` after using samples that
+may have been overwritten by the writer in the meantime.
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .adapters import _use_numpy, numpy
+
+#: Magic, version, capacity, header size, reserved, sample count.
+HEADER = struct.Struct("<8sIIIIQ")
+MAGIC = b"FINSHIST"
+VERSION = 1
+_COUNT_OFFSET = 24
+_ALIGNMENT = 64
+
+#: Column of a tag: byte offset in the file and value width in bytes.
+_Column = Tuple[int, int]
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return -(-offset // alignment) * alignment
+
+
+class Samples:
+    """
+    Consecutive samples ``start`` to ``stop`` (excluded) of a historian.
+
+    ``timestamps`` and every column of ``values`` are views of the historian
+    file: NumPy arrays, tag values being ``(samples, width)`` byte arrays, or
+    flat memoryviews without NumPy.
+    """
+
+    __slots__ = ("historian", "start", "stop", "timestamps", "values")
+
+    def __init__(self, historian: "Historian", start: int, stop: int) -> None:
+        self.historian = historian
+        self.start = start
+        self.stop = stop
+        self.timestamps = historian._timestamps(start, stop)
+        self.values = {
+            name: historian._values(column, start, stop)
+            for name, column in historian._columns.items()
+        }
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def valid(self) -> bool:
+        """Whether no sample was overwritten by the writer since the query."""
+        return self.start >= self.historian.oldest
+
+    def __repr__(self) -> str:
+        return f"<Samples: {self.start} to {self.stop}>"
+
+
+class Historian:
+    """
+    Append timestamped samples of a fixed tag set to a ring buffer file.
+
+    Use :meth:`create` in the process polling the PLC and :meth:`open` in
+    every reader process. Values are appended as raw bytes, e.g. the
+    ``data`` of polled responses, in tag order.
+    """
+
+    def __init__(
+        self, path: str, writable: bool = False, use_numpy: Optional[bool] = None
+    ) -> None:
+        self.path = path
+        self.writable = writable
+        self.use_numpy = _use_numpy(use_numpy)
+        with open(path, "r+b" if writable else "rb") as f:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self._mm = mmap.mmap(f.fileno(), 0, access=access)
+        magic, version, capacity, header_size, _, _ = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a historian file: {path}")
+        names = self._mm.find(b"\x00", HEADER.size)
+        tags = json.loads(self._mm[HEADER.size : names].decode())
+
+        self.capacity = capacity
+        #: Tag name -> value width in bytes.
+        self.tags: Dict[str, int] = {name: width for name, width in tags}
+        self._view = memoryview(self._mm)
+        self._timestamps_offset = header_size
+        self._columns: Dict[str, _Column] = {}
+        offset = header_size + 16 * capacity
+        for name, width in tags:
+            self._columns[name] = (offset, width)
+            offset = _align(offset + 2 * capacity * width)
+        self._record: List[_Column] = list(self._columns.values())
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        tags: Mapping[str, int],
+        capacity: int,
+        use_numpy: Optional[bool] = None,
+    ) -> "Historian":
+        """
+        Create, or truncate, a historian file of ``capacity`` samples of
+        ``tags``, a mapping of tag name to value width in bytes.
+        """
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        if any(width < 1 for width in tags.values()):
+            raise ValueError("Tag widths must be positive")
+        names = json.dumps([[name, width] for name, width in tags.items()])
+        header_size = _align(HEADER.size + len(names.encode()) + 1, _ALIGNMENT)
+        size = header_size + 16 * capacity
+        for width in tags.values():
+            size = _align(size + 2 * capacity * width)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, capacity, header_size, 0, 0))
+            f.write(names.encode())
+            f.truncate(size)
+        return cls(path, writable=True, use_numpy=use_numpy)
+
+    @classmethod
+    def open(cls, path: str, use_numpy: Optional[bool] = None) -> "Historian":
+        """Open a historian file for reading."""
+        return cls(path, use_numpy=use_numpy)
+
+    def __enter__(self) -> "Historian":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the file, which stays mapped as long as views returned by
+        queries are referenced.
+        """
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+
+    @property
+    def count(self) -> int:
+        """Total number of samples appended."""
+        return struct.unpack_from("<Q", self._mm, _COUNT_OFFSET)[0]
+
+    @property
+    def oldest(self) -> int:
+        """
+        Index of the oldest readable sample. The slot of the sample the writer
+        may be writing is not readable.
+        """
+        return max(0, self.count - self.capacity + 1)
+
+    def __len__(self) -> int:
+        return self.count - self.oldest
+
+    def append(self, values: Sequence[bytes], timestamp: Optional[float] = None) -> int:
+        """Append the values of all tags, in tag order, returns the sample index."""
+        if not self.writable:
+            raise ValueError("Historian is open for reading only")
+        if len(values) != len(self._record):
+            raise ValueError(f"Expected {len(self._record)} values")
+        if timestamp is None:
+            timestamp = time.time()
+        index = self.count
+        slot = index % self.capacity
+        mm = self._mm
+        offset = self._timestamps_offset + slot * 8
+        struct.pack_into("d", mm, offset, timestamp)
+        struct.pack_into("d", mm, offset + self.capacity * 8, timestamp)
+        for (offset, width), value in zip(self._record, values):
+            if len(value) != width:
+                raise ValueError(f"Expected {width} bytes, got {len(value)}")
+            offset += slot * width
+            mm[offset : offset + width] = value
+            offset += self.capacity * width
+            mm[offset : offset + width] = value
+        # Publish the record to readers.
+        struct.pack_into("<Q", mm, _COUNT_OFFSET, index + 1)
+        return index
+
+    def _timestamps(self, start: int, stop: int):
+        offset = self._timestamps_offset + (start % self.capacity) * 8
+        view = self._view[offset : offset + (stop - start) * 8]
+        if self.use_numpy:
+            return numpy.frombuffer(view, "d")
+        return view.cast("d")
+
+    def _values(self, column: _Column, start: int, stop: int):
+        offset, width = column
+        offset += (start % self.capacity) * width
+        view = self._view[offset : offset + (stop - start) * width]
+        if self.use_numpy:
+            return numpy.frombuffer(view, "u1").reshape(stop - start, width)
+        return view
+
+    def range(self, start: Optional[int] = None, stop: Optional[int] = None) -> Samples:
+        """
+        Returns samples ``start`` to ``stop`` (excluded), clamped to the
+        readable samples, all of them by default.
+        """
+        count = self.count
+        oldest = max(0, count - self.capacity + 1)
+        start = oldest if start is None else min(max(start, oldest), count)
+        stop = count if stop is None else min(max(stop, start), count)
+        return Samples(self, start, stop)
+
+    def latest(self, num_samples: int) -> Samples:
+        """Returns the last ``num_samples`` samples."""
+        return self.range(self.count - num_samples)
+
+    def query(
+        self, start_time: Optional[float] = None, end_time: Optional[float] = None
+    ) -> Samples:
+        """
+        Returns the samples timestamped from ``start_time`` up to
+        ``end_time`` (excluded), the timestamps must be increasing.
+        """
+        samples = self.range()
+        timestamps = samples.timestamps
+        if self.use_numpy:
+            search = timestamps.searchsorted
+        else:
+
+            def search(value: float) -> int:
+                return bisect.bisect_left(timestamps, value)
+
+        first = samples.start
+        start = first if start_time is None else first + int(search(start_time))
+        stop = samples.stop if end_time is None else first + int(search(end_time))
+        return self.range(start, max(start, stop))
+
+    def __repr__(self) -> str:
+        return "<Historian: {} ({} tags, {} samples)>".format(
+            self.path, len(self.tags), self.capacity
+        )
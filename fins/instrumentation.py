@@ -0,0 +1,297 @@
+"""
+Request instrumentation.
+
+An :class:`Instrumentation` attached to a client counts requests, bytes,
+timeouts and error end codes, and records latency histograms, per command
+code and per target node. Hooks can be run before and after every request,
+and :func:`prometheus_text` exports the metrics in the Prometheus text
+format.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .command import Command, CommandCode
+
+#: Command code -> command name, used as metric label.
+COMMAND_NAMES = {
+    value: name
+    for name, value in reversed(list(vars(CommandCode).items()))
+    if isinstance(value, bytes)
+}
+
+#: Bucket bounds, in seconds, of the exported Prometheus histograms.
+PROMETHEUS_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+#: Called with (client, command) before a request is sent.
+PreSendHook = Callable[[object, Command], None]
+
+#: Called with (client, command, response, elapsed seconds) once a request is
+#: done, the response is None if the request timed out.
+PostSendHook = Callable[[object, Command, Optional[object], float], None]
+
+
+class Histogram:
+    """
+    A log-linear histogram of integer values, in the spirit of HdrHistogram.
+
+    Values below ``2 ** precision`` are counted exactly, larger values in
+    buckets whose width is ``1 / 2 ** (precision - 1)`` of their value, so
+    every percentile is accurate to about 3% with the default precision.
+    """
+
+    def __init__(self, precision: int = 6) -> None:
+        if not 2 <= precision <= 16:
+            raise ValueError("precision must be between 2 and 16")
+        self.precision = precision
+        self._sub = 1 << precision
+        self._half = self._sub >> 1
+        # Enough buckets for 64 bit values.
+        self._counts = [0] * (self._sub + (64 - precision) * self._half)
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        if value < self._sub:
+            return value
+        shift = value.bit_length() - self.precision
+        return self._sub + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _upper(self, index: int) -> int:
+        """Returns the largest value counted in bucket ``index``."""
+        if index < self._sub:
+            return index
+        shift = (index - self._sub) // self._half + 1
+        top = (index - self._sub) % self._half + self._half
+        return ((top + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            raise ValueError("Histogram values must not be negative")
+        self._counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """Returns the value below which ``percent`` of the values fall."""
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def count_below(self, value: int) -> int:
+        """Returns the number of values in buckets entirely below ``value``."""
+        total = 0
+        for index, count in enumerate(self._counts):
+            if count and self._upper(index) < value:
+                total += count
+            elif self._upper(index) >= value:
+                break
+        return total
+
+    def merge(self, other: "Histogram") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms of different precision")
+        for index, count in enumerate(other._counts):
+            if count:
+                self._counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Optional[int]]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+
+class RequestStats:
+    """Counters and latency histogram, in microseconds, of one metric key."""
+
+    __slots__ = (
+        "requests",
+        "responses",
+        "timeouts",
+        "errors",
+        "bytes_sent",
+        "bytes_received",
+        "latency",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.responses = 0
+        self.timeouts = 0
+        #: Number of responses with a non-OK end code.
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = Histogram()
+
+    def snapshot(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "responses": self.responses,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_us": self.latency.snapshot(),
+        }
+
+
+def node_label(client) -> str:
+    """Returns the metric label of the target node of ``client``."""
+    return f"{client.host}:{client.port}/{client.da1}"
+
+
+class Instrumentation:
+    """
+    Collect per request metrics of one or more clients.
+
+    Metrics are keyed by ``(command name, node)`` where the node is
+    ``host:port/node number``. Pre-send hooks run before a request is sent,
+    post-send hooks once it is answered or timed out.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.pre_send: List[PreSendHook] = []
+        self.post_send: List[PostSendHook] = []
+        self._stats: Dict[Tuple[str, str], RequestStats] = {}
+        self._lock = threading.Lock()
+
+    def add_pre_send_hook(self, hook: PreSendHook) -> None:
+        self.pre_send.append(hook)
+
+    def add_post_send_hook(self, hook: PostSendHook) -> None:
+        self.post_send.append(hook)
+
+    def stats(self, client, command: Command) -> RequestStats:
+        code = command.code
+        key = (COMMAND_NAMES.get(code) or code.hex(), node_label(client))
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(key, RequestStats())
+        return stats
+
+    def request(self, client, command: Command) -> float:
+        """Account a request about to be sent, returns its start time."""
+        for hook in self.pre_send:
+            hook(client, command)
+        stats = self.stats(client, command)
+        stats.requests += 1
+        stats.bytes_sent += len(command.raw)
+        return self.clock()
+
+    def response(self, client, command: Command, response, start: float) -> None:
+        """Account the response of a request started at ``start``."""
+        elapsed = self.clock() - start
+        stats = self.stats(client, command)
+        stats.responses += 1
+        stats.bytes_received += len(response.raw)
+        if not response.ok:
+            stats.errors += 1
+        stats.latency.record(int(elapsed * 1e6))
+        for hook in self.post_send:
+            hook(client, command, response, elapsed)
+
+    def timeout(self, client, command: Command, start: float) -> None:
+        """Account a request started at ``start`` that was not answered."""
+        elapsed = self.clock() - start
+        self.stats(client, command).timeouts += 1
+        for hook in self.post_send:
+            hook(client, command, None, elapsed)
+
+    def snapshot(self) -> Dict[Tuple[str, str], Dict]:
+        """Returns a copy of all metrics, keyed by ``(command, node)``."""
+        with self._lock:
+            items = list(self._stats.items())
+        return {key: stats.snapshot() for key, stats in items}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(
+    instrumentation: Instrumentation,
+    prefix: str = "fins",
+    buckets: Sequence[float] = PROMETHEUS_BUCKETS,
+) -> str:
+    """Render the metrics of ``instrumentation`` in Prometheus text format."""
+    with instrumentation._lock:
+        items = sorted(instrumentation._stats.items())
+    counters = [
+        ("requests_total", "requests", "Requests sent."),
+        ("responses_total", "responses", "Responses received."),
+        ("timeouts_total", "timeouts", "Requests without a response in time."),
+        ("errors_total", "errors", "Responses with a non-OK end code."),
+        ("sent_bytes_total", "bytes_sent", "Bytes of FINS frames sent."),
+        ("received_bytes_total", "bytes_received", "Bytes of FINS frames received."),
+    ]
+    lines = []
+    labels = {
+        key: 'command="{}",node="{}"'.format(_escape(key[0]), _escape(key[1]))
+        for key, _ in items
+    }
+    for name, attribute, text in counters:
+        metric = f"{prefix}_{name}"
+        lines.append(f"# HELP {metric} {text}")
+        lines.append(f"# TYPE {metric} counter")
+        for key, stats in items:
+            lines.append(f"{metric}{{{labels[key]}}} {getattr(stats, attribute)}")
+
+    metric = f"{prefix}_request_duration_seconds"
+    lines.append(f"# HELP {metric} Request round trip time.")
+    lines.append(f"# TYPE {metric} histogram")
+    for key, stats in items:
+        histogram = stats.latency
+        for bound in buckets:
+            count = histogram.count_below(int(bound * 1e6) + 1)
+            lines.append(f'{metric}_bucket{{{labels[key]},le="{bound}"}} {count}')
+        lines.append(f'{metric}_bucket{{{labels[key]},le="+Inf"}} {histogram.count}')
+        lines.append(f"{metric}_sum{{{labels[key]}}} {histogram.total / 1e6}")
+        lines.append(f"{metric}_count{{{labels[key]}}} {histogram.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,316 @@
+import struct
+from collections import namedtuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .adapters import (
+    DATA_TYPES,
+    DataType,
+    from_bcd,
+    numpy,
+    swap_word_bytes,
+    to_bcd,
+)
+from .exceptions import FinsException
+
+
+class String:
+    """
+    A string field of ``length`` characters, two characters per word with the
+    first character in the high byte.
+    """
+
+    def __init__(self, length: int, encoding: str = "ascii") -> None:
+        if length < 1:
+            raise ValueError("String length must be positive")
+        self.length = length
+        self.encoding = encoding
+
+    @property
+    def words(self) -> int:
+        return (self.length + 1) // 2
+
+    def __repr__(self) -> str:
+        return "String({})".format(self.length)
+
+
+class Bit:
+    """
+    A single bit field. Without an explicit word offset, a bit field shares
+    the word of a directly preceding bit field.
+    """
+
+    def __init__(self, bit: int) -> None:
+        if not 0 <= bit <= 15:
+            raise ValueError("Bit number must be between 0 and 15")
+        self.bit = bit
+
+    def __repr__(self) -> str:
+        return "Bit({})".format(self.bit)
+
+
+FieldType = Union[str, String, Bit]
+
+#: Struct format of every data type, for the little-endian word swapped layout
+#: produced by :func:`swap_word_bytes <fins.adapters.swap_word_bytes>`.
+_STRUCT_FORMATS = {
+    DataType.INT16: "h",
+    DataType.UINT16: "H",
+    DataType.INT32: "i",
+    DataType.UINT32: "I",
+    DataType.REAL: "f",
+    DataType.LREAL: "d",
+    DataType.BCD: "H",
+}
+
+
+class _Field:
+    def __init__(self, name: str, kind: FieldType, offset: int, slot: int) -> None:
+        self.name = name
+        self.kind = kind
+        self.offset = offset
+        self.slot = slot
+
+
+class Layout:
+    """
+    A fixed record layout over consecutive words, e.g. a recipe or an alarm
+    record stored in DM.
+
+    Fields are declared as ``(name, type)`` or ``(name, type, word_offset)``
+    tuples, where type is a :class:`DataType <fins.adapters.DataType>`,
+    :class:`String` or :class:`Bit`. Fields without offset are placed right
+    after the previous one. The layout is compiled once to a
+    :class:`struct.Struct` so that many records are decoded in a single C
+    loop.
+
+    Records are returned as named tuples, or as a NumPy structured array by
+    the ``*_array`` methods. Gaps between fields are written as zeros.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[Tuple],
+        name: str = "Record",
+        size: Optional[int] = None,
+    ) -> None:
+        self._fields: List[_Field] = []
+        # Storage slots, (byte offset, struct format, numpy dtype).
+        slots: List[Tuple[int, str, str]] = []
+        bit_slots: Dict[int, int] = {}
+        next_word = 0
+        previous: Optional[_Field] = None
+        for spec in fields:
+            field_name, kind = spec[0], spec[1]
+            offset = spec[2] if len(spec) > 2 else None
+            if isinstance(kind, Bit):
+                if offset is None:
+                    if previous is not None and isinstance(previous.kind, Bit):
+                        offset = previous.offset
+                    else:
+                        offset = next_word
+                if offset not in bit_slots:
+                    bit_slots[offset] = len(slots)
+                    slots.append((offset * 2, "H", "<u2"))
+                slot = bit_slots[offset]
+                words = 1
+            elif isinstance(kind, String):
+                offset = next_word if offset is None else offset
+                words = kind.words
+                slot = len(slots)
+                slots.append((offset * 2, f"{words * 2}s", f"S{words * 2}"))
+            elif kind in _STRUCT_FORMATS:
+                offset = next_word if offset is None else offset
+                words = DATA_TYPES[kind][2]
+                slot = len(slots)
+                slots.append((offset * 2, _STRUCT_FORMATS[kind], DATA_TYPES[kind][1]))
+            else:
+                raise ValueError(f"Unsupported field type: {kind}")
+            previous = _Field(field_name, kind, offset, slot)
+            self._fields.append(previous)
+            next_word = max(next_word, offset + words)
+
+        if size is None:
+            size = next_word
+        elif size < next_word:
+            raise ValueError("Layout size is smaller than its fields")
+        #: Size of a record, in words.
+        self.size = size
+        #: Record class, a named tuple of the field names.
+        self.record = namedtuple(name, [field.name for field in self._fields])
+
+        self._compile(slots)
+
+    def _compile(self, slots: List[Tuple[int, str, str]]) -> None:
+        order = sorted(range(len(slots)), key=lambda index: slots[index][0])
+        fmt = ["<"]
+        position = 0
+        for index in order:
+            byte_offset, slot_format, _ = slots[index]
+            if byte_offset < position:
+                raise ValueError("Layout fields overlap")
+            fmt.append("x" * (byte_offset - position))
+            fmt.append(slot_format)
+            position = byte_offset + struct.calcsize("<" + slot_format)
+        fmt.append("x" * (self.size * 2 - position))
+        self._struct = struct.Struct("".join(fmt))
+        self._slots = slots
+        # Slot index -> position in the unpacked tuple.
+        self._positions = {slot: position for position, slot in enumerate(order)}
+        self._order = order
+        self._simple = (
+            all(
+                not isinstance(field.kind, (String, Bit)) and field.kind != DataType.BCD
+                for field in self._fields
+            )
+            and [field.slot for field in self._fields] == order
+        )
+
+    @property
+    def fields(self) -> List[str]:
+        return [field.name for field in self._fields]
+
+    def unpack(self, data: bytes) -> List[Any]:
+        """Decode consecutive records from word data."""
+        if len(data) % self._struct.size:
+            raise ValueError("Data length is not a multiple of the record size")
+        rows = self._struct.iter_unpack(swap_word_bytes(data))
+        make = self.record._make
+        if self._simple:
+            return [make(row) for row in rows]
+        getters = [self._getter(field) for field in self._fields]
+        return [make([getter(row) for getter in getters]) for row in rows]
+
+    def _getter(self, field: _Field):
+        position = self._positions[field.slot]
+        kind = field.kind
+        if isinstance(kind, Bit):
+            bit = kind.bit
+            return lambda row: bool(row[position] >> bit & 1)
+        if isinstance(kind, String):
+            return lambda row: _decode_string(row[position], kind)
+        if kind == DataType.BCD:
+            return lambda row: from_bcd(row[position])
+        return lambda row: row[position]
+
+    def pack(self, records: Sequence[Union[Sequence, Mapping]]) -> bytes:
+        """Encode records, named tuples, sequences or mappings, to word data."""
+        if numpy is not None and isinstance(records, numpy.ndarray):
+            records = records.tolist()
+        buffer = bytearray(self._struct.size * len(records))
+        for index, record in enumerate(records):
+            if isinstance(record, Mapping):
+                record = [record[field.name] for field in self._fields]
+            elif len(record) != len(self._fields):
+                raise ValueError("Record length does not match the layout")
+            values: List[Any] = [0] * len(self._slots)
+            for field, value in zip(self._fields, record):
+                kind = field.kind
+                if isinstance(kind, Bit):
+                    if value:
+                        values[field.slot] |= 1 << kind.bit
+                elif isinstance(kind, String):
+                    values[field.slot] = _encode_string(value, kind)
+                elif kind == DataType.BCD:
+                    values[field.slot] = to_bcd(value)
+                else:
+                    values[field.slot] = value
+            self._struct.pack_into(
+                buffer,
+                index * self._struct.size,
+                *[values[slot] for slot in self._order],
+            )
+        return swap_word_bytes(buffer).tobytes()
+
+    def unpack_array(self, data: bytes) -> "numpy.ndarray":
+        """Decode consecutive records into a NumPy structured array."""
+        if numpy is None:
+            raise ImportError("numpy is required for structured arrays")
+        if len(data) % self._struct.size:
+            raise ValueError("Data length is not a multiple of the record size")
+        wire = numpy.frombuffer(data, dtype=">u2").astype("<u2")
+        rows = wire.view(
+            numpy.dtype(
+                {
+                    "names": [f"s{index}" for index in range(len(self._slots))],
+                    "formats": [slot[2] for slot in self._slots],
+                    "offsets": [slot[0] for slot in self._slots],
+                    "itemsize": self.size * 2,
+                }
+            )
+        )
+        result = numpy.empty(len(rows), dtype=self.dtype)
+        for field in self._fields:
+            column = rows[f"s{field.slot}"]
+            kind = field.kind
+            if isinstance(kind, Bit):
+                result[field.name] = column >> kind.bit & 1
+            elif isinstance(kind, String):
+                width = kind.words * 2
+                swapped = numpy.ascontiguousarray(column).view("<u2").byteswap()
+                result[field.name] = swapped.view(f"S{width}")
+            elif kind == DataType.BCD:
+                result[field.name] = from_bcd(column)
+            else:
+                result[field.name] = column
+        return result
+
+    @property
+    def dtype(self) -> "numpy.dtype":
+        """NumPy dtype of the structured arrays returned by this layout."""
+        if numpy is None:
+            raise ImportError("numpy is required for structured arrays")
+        formats = []
+        for field in self._fields:
+            kind = field.kind
+            if isinstance(kind, Bit):
+                formats.append((field.name, "?"))
+            elif isinstance(kind, String):
+                formats.append((field.name, f"S{kind.length}"))
+            else:
+                formats.append((field.name, DATA_TYPES[kind][1][1:]))
+        return numpy.dtype(formats)
+
+    def read(self, client, address: Union[str, bytes], count: int = 1) -> List[Any]:
+        """Read ``count`` consecutive records starting at ``address``."""
+        return self.unpack(self._read(client, address, count))
+
+    def read_array(
+        self, client, address: Union[str, bytes], count: int = 1
+    ) -> "numpy.ndarray":
+        """Read ``count`` consecutive records into a NumPy structured array."""
+        return self.unpack_array(self._read(client, address, count))
+
+    def write(self, client, address: Union[str, bytes], records: Sequence):
+        """Write consecutive records starting at ``address``."""
+        return client.memory_area_write(
+            address, self.pack(records), self.size * len(records)
+        )
+
+    def _read(self, client, address: Union[str, bytes], count: int) -> bytes:
+        response = client.memory_area_read(address, self.size * count)
+        if not response.ok:
+            raise FinsException(f"Read failed: {response.status_text}")
+        return response.data
+
+    def __repr__(self) -> str:
+        return "<Layout: {} ({} words)>".format(self.record.__name__, self.size)
+
+
+def _decode_string(raw: bytes, kind: String) -> str:
+    value = bytearray(len(raw))
+    value[0::2] = raw[1::2]
+    value[1::2] = raw[0::2]
+    return value[: kind.length].rstrip(b"\x00").decode(kind.encoding, "replace")
+
+
+def _encode_string(value: Union[str, bytes], kind: String) -> bytes:
+    if isinstance(value, str):
+        value = value.encode(kind.encoding)
+    if len(value) > kind.length:
+        raise ValueError(f"String longer than {kind.length} characters")
+    value = value.ljust(kind.words * 2, b"\x00")
+    # Pre-swap so the words come out right after the layout swap.
+    swapped = bytearray(len(value))
+    swapped[0::2] = value[1::2]
+    swapped[1::2] = value[0::2]
+    return bytes(swapped)
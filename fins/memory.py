@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Tuple, Union
 
 
@@ -132,6 +133,16 @@ AREAS_WORDS = {
     MemoryAreaCode.DATA_MEMORY_WORD,
 }
 
+#: Word area code that contains the bits of a bit area code.
+BIT_AREAS_WORD = {
+    prefix.bit: prefix.word
+    for prefix in MEMORY_AREAS_PREFIX.values()
+    if prefix.bit is not None
+}
+
+#: Bit area code that addresses the bits of a word area code.
+WORD_AREAS_BIT = {word: bit for bit, word in BIT_AREAS_WORD.items()}
+
 AREAS_BITS = {
     MemoryAreaCode.CIO_BIT,
     MemoryAreaCode.WORK_BIT,
@@ -141,6 +152,13 @@ AREAS_BITS = {
 }
 
 
+#: Compiled pattern of memory address strings, e.g. CIO100.1, D0, W22.
+ADDRESS_PATTERN = re.compile(r"(?P<area>[A-Z]+)?(?P<word>\d+)(\.(?P<bit>\d+))?")
+
+#: Number of parsed addresses kept by the address cache.
+ADDRESS_CACHE_SIZE = 8192
+
+
 class MemoryArea:
     """
     A class to encapsulate memory address.
@@ -152,29 +170,56 @@ class MemoryArea:
 
     If input value is already in bytes, parse the matching area code, word, and
     its bit.
+
+    Memory areas are immutable and hashable values. Parsed addresses are kept
+    in a bounded LRU cache, so building the same address again returns the
+    same instance without parsing it again.
     """
 
-    def __init__(self, value: Union[str, bytes]) -> None:
+    __slots__ = ("area", "word", "bit", "raw", "_use_bit")
+
+    def __new__(cls, value: Union[str, bytes, "MemoryArea"]) -> "MemoryArea":
+        if type(value) is str:
+            return _from_string(value)
+        if isinstance(value, MemoryArea):
+            return value
         if isinstance(value, str):
-            area, word, bit, use_bit = self._parse_addr_string(value)
-        elif isinstance(value, bytes):
-            area, word, bit, use_bit = self._parse_addr_bytes(value)
-        else:
-            raise TypeError(f"Unsupported type: {type(value)}")
+            return _from_string(value)
+        if isinstance(value, bytes):
+            return _from_bytes(value)
+        raise TypeError(f"Unsupported type: {type(value)}")
+
+    @classmethod
+    def _create(cls, area: bytes, word: bytes, bit: bytes, use_bit: bool):
+        self = object.__new__(cls)
+        object.__setattr__(self, "area", area)
+        object.__setattr__(self, "word", word)
+        object.__setattr__(self, "bit", bit)
+        object.__setattr__(self, "raw", area + word + bit)
+        object.__setattr__(self, "_use_bit", use_bit)
+        return self
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("MemoryArea is immutable")
 
-        self.area: bytes = area
-        self.word: bytes = word
-        self.bit: bytes = bit
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MemoryArea):
+            return NotImplemented
+        return self.raw == other.raw and self._use_bit == other._use_bit
 
-        self._use_bit: bool = use_bit
+    def __hash__(self) -> int:
+        return hash(self.raw)
 
-    def _parse_addr_string(self, value: str) -> Tuple[bytes, bytes, bytes, bytes]:
-        regex = re.compile(r"(?P<area>[A-Z]+)?(?P<word>\d+)(\.(?P<bit>\d+))?")
-        match = regex.match(value)
+    def __reduce__(self):
+        return _create_memory_area, (self.area, self.word, self.bit, self._use_bit)
+
+    @staticmethod
+    def _parse_addr_string(value: str) -> Tuple[bytes, bytes, bytes, bool]:
+        match = ADDRESS_PATTERN.match(value)
         if match:
-            area = match.groupdict()["area"]
-            address = match.groupdict()["word"]
-            bit = match.groupdict()["bit"]
+            area = match.group("area")
+            address = match.group("word")
+            bit = match.group("bit")
         else:
             raise ValueError("Invalid memory address format")
         if area is not None and area not in MEMORY_AREAS_PREFIX:
@@ -198,7 +243,8 @@ class MemoryArea:
         word = int(address).to_bytes(2, "big")
         return area, word, bit, use_bit
 
-    def _parse_addr_bytes(self, value: bytes) -> Tuple[bytes, bytes, bytes, bytes]:
+    @staticmethod
+    def _parse_addr_bytes(value: bytes) -> Tuple[bytes, bytes, bytes, bool]:
         if len(value) != 4:
             raise ValueError("Insufficient address bytes length")
         area = value[0:1]
@@ -207,11 +253,6 @@ class MemoryArea:
         use_bit = area in AREAS_BITS
         return area, word, bit, use_bit
 
-    @property
-    def raw(self) -> bytes:
-        """Returns the raw content of the memory, in bytes."""
-        return self.area + self.word + self.bit
-
     def __repr__(self) -> str:
         return "<MemoryArea: {}>".format(self.raw)
 
@@ -221,3 +262,32 @@ class MemoryArea:
 
     def is_bit_set(self) -> bool:
         return self._use_bit
+
+    def offset(self, items: int) -> "MemoryArea":
+        """
+        Returns the address ``items`` words, or bits for bit addresses, after
+        this one.
+        """
+        word = int.from_bytes(self.word, "big")
+        bit = self.bit[0]
+        if self._use_bit:
+            word, bit = divmod(word * 16 + bit + items, 16)
+        else:
+            word += items
+        return MemoryArea(self.area + word.to_bytes(2, "big") + bytes([bit]))
+
+
+def _create_memory_area(
+    area: bytes, word: bytes, bit: bytes, use_bit: bool
+) -> MemoryArea:
+    return MemoryArea._create(area, word, bit, use_bit)
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _from_string(value: str) -> MemoryArea:
+    return MemoryArea._create(*MemoryArea._parse_addr_string(value))
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _from_bytes(value: bytes) -> MemoryArea:
+    return MemoryArea._create(*MemoryArea._parse_addr_bytes(value))
@@ -0,0 +1,236 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .adapters import MultipleMemoryAreaReadDataAdapter
+from .command import (
+    MAX_MEMORY_AREA_READ_ITEMS,
+    MAX_MULTIPLE_MEMORY_AREA_READ_ITEMS,
+    Command,
+)
+from .memory import BIT_AREAS_WORD, MemoryArea
+from .response import Response
+
+#: Where to find a value in a response: (key, item, bit). ``item`` is a byte
+#: offset for spans and an item index for multiple reads, ``bit`` is None for
+#: word values.
+Target = Tuple[Hashable, int, Optional[int]]
+
+
+@dataclass
+class ReadSpan:
+    """A contiguous memory area read covering one or more addresses."""
+
+    area: bytes
+    start: int
+    count: int
+    targets: List[Target] = field(default_factory=list)
+
+    @property
+    def address(self) -> bytes:
+        return self.area + self.start.to_bytes(2, "big") + b"\x00"
+
+
+@dataclass
+class MultipleRead:
+    """A multiple memory area read packing scattered addresses."""
+
+    addresses: List[MemoryArea] = field(default_factory=list)
+    targets: List[Target] = field(default_factory=list)
+
+
+class ReadPlan:
+    """
+    A precomputed set of FINS requests reading a set of addresses.
+
+    A plan is immutable and can be executed any number of times, the results
+    are scattered back to a dict keyed by the planned addresses. Values are
+    2 bytes for word addresses and 1 byte (``b"\\x00"`` or ``b"\\x01"``) for
+    bit addresses, the same format as returned by
+    :meth:`FinsClient.memory_area_read`. Addresses whose request failed are
+    mapped to None.
+    """
+
+    def __init__(self, spans: List[ReadSpan], multiples: List[MultipleRead]) -> None:
+        self.spans = spans
+        self.multiples = multiples
+
+    def __len__(self) -> int:
+        """Returns the number of requests needed to execute the plan."""
+        return len(self.spans) + len(self.multiples)
+
+    def __repr__(self) -> str:
+        return "<ReadPlan: {} spans, {} multiple reads>".format(
+            len(self.spans), len(self.multiples)
+        )
+
+    def commands(self, client) -> Tuple[List[Command], List[Optional[callable]]]:
+        """Returns the commands and their adapters, built by ``client``."""
+        commands: List[Command] = []
+        adapters: List[Optional[callable]] = []
+        for span in self.spans:
+            commands.append(client._memory_area_read_command(span.address, span.count))
+            adapters.append(None)
+        for multiple in self.multiples:
+            commands.append(
+                client._multiple_memory_area_read_command(multiple.addresses)
+            )
+            adapters.append(MultipleMemoryAreaReadDataAdapter(multiple.addresses))
+        return commands, adapters
+
+    def execute(self, client, window: int = 8) -> Dict[Hashable, Optional[bytes]]:
+        """Execute the plan with pipelined requests on a :class:`FinsClient`."""
+        commands, adapters = self.commands(client)
+        return self.scatter(client.send_many(commands, window, adapters))
+
+    async def execute_async(self, client) -> Dict[Hashable, Optional[bytes]]:
+        """Execute the plan concurrently on an :class:`AsyncFinsClient`."""
+        commands, adapters = self.commands(client)
+        responses = await asyncio.gather(
+            *(client.send(cmd, adapter) for cmd, adapter in zip(commands, adapters))
+        )
+        return self.scatter(responses)
+
+    def scatter(self, responses: Sequence[Response]) -> Dict[Hashable, Optional[bytes]]:
+        """
+        Map the responses of :meth:`commands`, in the same order, back to the
+        planned addresses. A response may be None if its request failed.
+        """
+        values: Dict[Hashable, Optional[bytes]] = {}
+        for span, response in zip(self.spans, responses[: len(self.spans)]):
+            data = response.data if response is not None and response.ok else None
+            for key, offset, bit in span.targets:
+                if data is None:
+                    values[key] = None
+                elif bit is None:
+                    values[key] = bytes(data[offset : offset + 2])
+                else:
+                    word = (data[offset] << 8) | data[offset + 1]
+                    values[key] = b"\x01" if word >> bit & 1 else b"\x00"
+        for multiple, response in zip(self.multiples, responses[len(self.spans) :]):
+            items = response.data if response is not None and response.ok else None
+            for key, index, bit in multiple.targets:
+                if items is None:
+                    values[key] = None
+                elif bit is None:
+                    values[key] = bytes(items[index])
+                else:
+                    word = int.from_bytes(items[index], "big")
+                    values[key] = b"\x01" if word >> bit & 1 else b"\x00"
+        return values
+
+    def end_codes(self, responses: Sequence[Response]) -> Dict[Hashable, int]:
+        """
+        Returns the end code of every planned address whose request failed
+        with an error end code, for the responses of :meth:`commands`.
+        """
+        codes: Dict[Hashable, int] = {}
+        groups = [span.targets for span in self.spans]
+        groups += [multiple.targets for multiple in self.multiples]
+        for targets, response in zip(groups, responses):
+            if response is None or response.ok:
+                continue
+            code = int.from_bytes(response.code, "big")
+            for key, _, _ in targets:
+                codes[key] = code
+        return codes
+
+
+class ReadPlanner:
+    """
+    Coalesce arbitrary addresses into a minimal set of FINS read requests.
+
+    Words of the same area are merged into contiguous memory area read spans
+    as long as the hole between two requested words is at most ``max_gap``
+    words. Bit addresses are read through the word containing them. Spans
+    covering less than ``min_span`` requested words are not worth their own
+    request and are packed into multiple memory area read commands instead.
+    """
+
+    def __init__(
+        self,
+        max_gap: int = 8,
+        min_span: int = 2,
+        max_span: int = MAX_MEMORY_AREA_READ_ITEMS,
+        max_multiple_items: int = MAX_MULTIPLE_MEMORY_AREA_READ_ITEMS,
+    ) -> None:
+        if max_gap < 0:
+            raise ValueError("max_gap must not be negative")
+        if not 1 <= max_span <= MAX_MEMORY_AREA_READ_ITEMS:
+            raise ValueError(
+                f"max_span must be between 1 and {MAX_MEMORY_AREA_READ_ITEMS}"
+            )
+        if not 1 <= max_multiple_items <= MAX_MULTIPLE_MEMORY_AREA_READ_ITEMS:
+            raise ValueError(
+                "max_multiple_items must be between 1 and "
+                f"{MAX_MULTIPLE_MEMORY_AREA_READ_ITEMS}"
+            )
+        self.max_gap = max_gap
+        self.min_span = min_span
+        self.max_span = max_span
+        self.max_multiple_items = max_multiple_items
+
+    def plan(self, addresses: Iterable[Union[str, bytes]]) -> ReadPlan:
+        # Word area -> word -> [(key, bit)]
+        areas: Dict[bytes, Dict[int, List[Tuple[Hashable, Optional[int]]]]] = {}
+        # Bits of areas without a known word area are read as they are.
+        raw_bits: List[Tuple[Hashable, MemoryArea]] = []
+        seen = set()
+        for key in addresses:
+            if key in seen:
+                continue
+            seen.add(key)
+            addr = MemoryArea(key)
+            word = int.from_bytes(addr.word, "big")
+            if addr.is_bit_set():
+                area = BIT_AREAS_WORD.get(addr.area)
+                if area is None:
+                    raw_bits.append((key, addr))
+                    continue
+                bit = addr.bit[0]
+            else:
+                area, bit = addr.area, None
+            areas.setdefault(area, {}).setdefault(word, []).append((key, bit))
+
+        spans: List[ReadSpan] = []
+        leftovers: List[Tuple[MemoryArea, List[Target]]] = []
+        for area, words in areas.items():
+            for group in self._group_words(sorted(words)):
+                if len(group) < self.min_span:
+                    for word in group:
+                        addr = MemoryArea(area + word.to_bytes(2, "big") + b"\x00")
+                        targets = [(key, 0, bit) for key, bit in words[word]]
+                        leftovers.append((addr, targets))
+                    continue
+                span = ReadSpan(
+                    area=area, start=group[0], count=group[-1] - group[0] + 1
+                )
+                for word in group:
+                    offset = (word - span.start) * 2
+                    span.targets.extend((key, offset, bit) for key, bit in words[word])
+                spans.append(span)
+        for key, addr in raw_bits:
+            leftovers.append((addr, [(key, 0, None)]))
+
+        multiples: List[MultipleRead] = []
+        for start in range(0, len(leftovers), self.max_multiple_items):
+            multiple = MultipleRead()
+            for addr, targets in leftovers[start : start + self.max_multiple_items]:
+                index = len(multiple.addresses)
+                multiple.addresses.append(addr)
+                multiple.targets.extend((key, index, bit) for key, _, bit in targets)
+            multiples.append(multiple)
+        return ReadPlan(spans, multiples)
+
+    def _group_words(self, words: List[int]) -> List[List[int]]:
+        groups: List[List[int]] = []
+        for word in words:
+            if (
+                groups
+                and word - groups[-1][-1] - 1 <= self.max_gap
+                and word - groups[-1][0] < self.max_span
+            ):
+                groups[-1].append(word)
+            else:
+                groups.append([word])
+        return groups
@@ -0,0 +1,150 @@
+"""
+Adaptive timeouts and circuit breaking.
+
+:class:`RttEstimator` derives the response timeout of a target from its
+measured round trip times, the way TCP computes its retransmission timeout
+(RFC 6298). :class:`CircuitBreaker` stops sending to a target after repeated
+failures and lets a single probe through once in a while.
+"""
+
+import time
+from typing import Callable, Optional
+
+from .command import CommandCode
+
+#: Commands that can be retransmitted safely, as sending them twice has no
+#: side effect.
+IDEMPOTENT_COMMANDS = frozenset(
+    (
+        CommandCode.MEMORY_AREA_READ,
+        CommandCode.MULTIPLE_MEMORY_AREA_READ,
+        CommandCode.PARAMETER_AREA_READ,
+        CommandCode.DATA_LINK_TABLE_READ,
+        CommandCode.PROGRAM_AREA_READ,
+        CommandCode.CONTROLLER_DATA_READ,
+        CommandCode.CONNECTION_DATA_READ,
+        CommandCode.CONTROLLER_STATUS_READ,
+        CommandCode.NETWORK_STATUS_READ,
+        CommandCode.CYCLE_TIME_READ,
+        CommandCode.CLOCK_READ,
+        CommandCode.ERROR_LOG_READ,
+        CommandCode.FILE_NAME_READ,
+        CommandCode.SINGLE_FILE_READ,
+    )
+)
+
+
+class RttEstimator:
+    """
+    Smoothed round trip time (SRTT) and its variation (RTTVAR) of a target.
+
+    The timeout starts at ``initial`` and then follows
+    ``SRTT + max(granularity, 4 * RTTVAR)``, clamped between ``min_timeout``
+    and ``max_timeout``. Every timeout doubles it until the next sample.
+    Samples of retransmitted requests must not be fed, as their response
+    cannot be matched to one transmission (Karn's algorithm).
+    """
+
+    def __init__(
+        self,
+        initial: float = 1.0,
+        min_timeout: float = 0.05,
+        max_timeout: float = 5.0,
+        granularity: float = 0.001,
+    ) -> None:
+        if not 0 < min_timeout <= max_timeout:
+            raise ValueError("min_timeout must be positive and below max_timeout")
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.granularity = granularity
+        self.srtt: Optional[float] = None
+        self.rttvar: Optional[float] = None
+        self._timeout = self._clamp(initial)
+
+    def _clamp(self, timeout: float) -> float:
+        return min(self.max_timeout, max(self.min_timeout, timeout))
+
+    @property
+    def timeout(self) -> float:
+        """Current response timeout, in seconds."""
+        return self._timeout
+
+    def update(self, rtt: float) -> None:
+        """Feed a measured round trip time, in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self._timeout = self._clamp(self.srtt + max(self.granularity, 4 * self.rttvar))
+
+    def backoff(self) -> None:
+        """Double the timeout after a request timed out."""
+        self._timeout = self._clamp(self._timeout * 2)
+
+    def __repr__(self) -> str:
+        return "<RttEstimator: srtt={} timeout={:.3f}s>".format(
+            self.srtt, self._timeout
+        )
+
+
+class CircuitBreaker:
+    """
+    Reject requests to a target that failed ``failure_threshold`` times in a
+    row.
+
+    An open breaker lets one probe request through every ``reset_timeout``
+    seconds. A successful probe closes the breaker, a failed one keeps it
+    open for another ``reset_timeout``. A probe whose result is never
+    recorded does not block the breaker: another probe is let through after
+    ``reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        #: Number of consecutive failures.
+        self.failures: int = 0
+        #: Number of requests rejected while open.
+        self.rejected: int = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state != self.CLOSED:
+            now = self.clock()
+            if now - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._opened_at = now
+                return True
+        self.rejected += 1
+        return False
+
+    def success(self) -> None:
+        self.failures = 0
+        self.state = self.CLOSED
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = self.clock()
+
+    def __repr__(self) -> str:
+        return "<CircuitBreaker: {} ({} failures)>".format(self.state, self.failures)
@@ -1,5 +1,4 @@
-from functools import cached_property
-from typing import Generic, Optional, TypeVar
+from typing import Generic, Optional, TypeVar, Union
 
 from .command import Command
 from .header import Header
@@ -7,13 +6,30 @@ from .response_codes import RESPONSE_CODES
 
 T = TypeVar("T")
 
+_MISSING = object()
+
 
 class Response(Generic[T]):
     """
     The :class:`Response <Response>` object, which contains a FINS's response to
     a request.
+
+    A response built by :meth:`from_bytes` keeps the received frame and only
+    decodes its parts when they are accessed. Data is exposed as a
+    ``memoryview`` of the frame, so it is never copied.
     """
 
+    __slots__ = (
+        "_buffer",
+        "_header",
+        "_command_code",
+        "_code",
+        "_data",
+        "_command",
+        "_adapter",
+        "_value",
+    )
+
     def __init__(
         self,
         header: Header,
@@ -23,23 +39,67 @@ class Response(Generic[T]):
         command: Command,
         adapter: Optional[callable] = None,
     ) -> None:
+        self._buffer = None
         self._header = header
         self._command_code = command_code
         self._code = code
         self._command = command
         self._data = data
         self._adapter = adapter
+        self._value = _MISSING
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: Union[bytes, memoryview],
+        command: Command,
+        adapter: Optional[callable] = None,
+    ) -> "Response":
+        """
+        Build a new Response instance from a received FINS frame, without
+        copying nor decoding it.
+        """
+        self = cls.__new__(cls)
+        self._buffer = memoryview(data)
+        self._header = self._command_code = self._code = self._data = None
+        self._command = command
+        self._adapter = adapter
+        self._value = _MISSING
+        return self
+
+    @classmethod
+    def local(cls, command: Command, code: bytes, data: bytes) -> "Response":
+        """
+        Build the response to ``command`` without sending it, e.g. to answer
+        it from a cache. The header is the one the destination node would send.
+        """
+        raw = command.raw
+        header = Header.from_bytes(b"\xc0\x00\x02" + raw[6:9] + raw[3:6] + raw[9:10])
+        return cls(header, command.code, code, data, command)
 
     @property
     def header(self) -> Header:
+        if self._header is None:
+            self._header = Header.from_bytes(bytes(self._buffer[:10]))
         return self._header
 
+    @property
+    def sid(self) -> int:
+        """Returns the service ID, without decoding the header."""
+        if self._buffer is not None:
+            return self._buffer[9]
+        return self._header.sid[0]
+
     @property
     def command_code(self) -> bytes:
+        if self._command_code is None:
+            self._command_code = bytes(self._buffer[10:12])
         return self._command_code
 
     @property
     def code(self) -> bytes:
+        if self._code is None:
+            self._code = bytes(self._buffer[12:14])
         return self._code
 
     @property
@@ -47,10 +107,12 @@ class Response(Generic[T]):
         return self._command
 
     @property
-    def raw_data(self) -> bytes:
+    def raw_data(self) -> Union[bytes, memoryview]:
+        if self._data is None:
+            self._data = self._buffer[14:]
         return self._data
 
-    @cached_property
+    @property
     def data(self) -> T:
         """
         Returns a friendly data format that has been transformed by adapter
@@ -60,11 +122,15 @@ class Response(Generic[T]):
             return self.raw_data
         if not self.ok:
             return b""
-        return self._adapter(self.raw_data)
+        if self._value is _MISSING:
+            self._value = self._adapter(self.raw_data)
+        return self._value
 
     @property
-    def raw(self) -> bytes:
+    def raw(self) -> Union[bytes, memoryview]:
         """Returns the raw content of the response, in bytes."""
+        if self._buffer is not None:
+            return self._buffer
         return self.header.raw + self.command_code + self.code + self.raw_data
 
     @property
@@ -72,7 +138,9 @@ class Response(Generic[T]):
         """
         Returns True if :attr:`status_code` is 0x0000 (Normal completion).
         """
-        return self.code == b"\x00\x00"
+        if self._code is None:
+            return self._buffer[12] == 0 and self._buffer[13] == 0
+        return self._code == b"\x00\x00"
 
     @property
     def status_text(self) -> str:
@@ -87,4 +155,4 @@ class Response(Generic[T]):
         return "<FINS Response: {}>".format(self.code)
 
     def __str__(self) -> str:
-        return str(self.raw)
+        return str(bytes(self.raw))
@@ -0,0 +1,227 @@
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Hashable, List, Optional, Sequence
+
+from .adapters import DataType, _data_type, decode_words
+from .exceptions import FinsException
+from .planner import ReadPlan, ReadPlanner
+
+#: Callback receiving the changed values of a subscription, keyed by address.
+ChangeCallback = Callable[[Dict[Hashable, bytes]], None]
+
+
+class Subscription:
+    """
+    A group of addresses polled every ``interval`` seconds.
+
+    The callback only receives the addresses whose value changed since the
+    previous scan. With a ``deadband``, word values decoded as ``data_type``,
+    a single word numeric type, must move by more than the deadband to count
+    as a change.
+    """
+
+    def __init__(
+        self,
+        addresses: Sequence[Hashable],
+        interval: float,
+        callback: ChangeCallback,
+        deadband: Optional[float] = None,
+        data_type: str = DataType.UINT16,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if deadband is not None:
+            if deadband < 0:
+                raise ValueError("deadband must not be negative")
+            if _data_type(data_type)[2] != 1:
+                raise ValueError(
+                    f"deadband requires a single word data type, got {data_type}"
+                )
+        self.addresses = list(addresses)
+        self.interval = interval
+        self.callback = callback
+        self.deadband = deadband
+        self.data_type = data_type
+
+        #: Monotonic time of the next scan.
+        self.next_due: float = 0.0
+        #: Number of scan periods missed because the scheduler was late.
+        self.misses: int = 0
+        #: Number of addresses that could not be read.
+        self.errors: int = 0
+        #: Number of scans that failed on a transport or protocol error.
+        self.failures: int = 0
+        #: Last reported value of every address.
+        self.values: Dict[Hashable, bytes] = {}
+
+    def _changes(self, values: Dict[Hashable, Optional[bytes]]) -> Dict:
+        changes = {}
+        for address in self.addresses:
+            value = values.get(address)
+            if value is None:
+                self.errors += 1
+                continue
+            last = self.values.get(address)
+            if last == value:
+                continue
+            if last is not None and self.deadband is not None and len(value) == 2:
+                old = decode_words(last, self.data_type, use_numpy=False)[0]
+                new = decode_words(value, self.data_type, use_numpy=False)[0]
+                if abs(new - old) <= self.deadband:
+                    continue
+            self.values[address] = value
+            changes[address] = value
+        return changes
+
+    def __repr__(self) -> str:
+        return "<Subscription: {} addresses every {}s>".format(
+            len(self.addresses), self.interval
+        )
+
+
+class PollScheduler:
+    """
+    Poll subscribed addresses on a shared :class:`FinsClient`.
+
+    All subscriptions due in the same tick are merged into a single
+    :class:`ReadPlan <fins.planner.ReadPlan>`, so overlapping subscriptions
+    never read the same address twice. Plans are cached per set of
+    addresses. A subscription that could not be served within its interval
+    counts a deadline miss and skips the missed scans instead of catching up.
+
+    A tick failing on a transport or protocol error, such as a timeout, counts
+    a failure on every due subscription and polling goes on; with a
+    ``backoff``, these subscriptions are not scanned again for that many
+    seconds.
+    """
+
+    def __init__(
+        self,
+        client,
+        planner: Optional[ReadPlanner] = None,
+        window: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+        backoff: float = 0.0,
+    ) -> None:
+        self.client = client
+        self.planner = planner or ReadPlanner()
+        self.window = window
+        self.clock = clock
+        self.backoff = backoff
+
+        #: Number of ticks that issued requests.
+        self.ticks: int = 0
+        #: Total number of missed scan periods.
+        self.misses: int = 0
+        #: Number of ticks that failed on a transport or protocol error.
+        self.failures: int = 0
+        #: Exception of the last failed tick, if any.
+        self.last_error: Optional[Exception] = None
+        #: Exception that stopped the background thread, if any.
+        self.error: Optional[BaseException] = None
+
+        self._subscriptions: List[Subscription] = []
+        self._plans: Dict[FrozenSet, ReadPlan] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(
+        self,
+        addresses: Sequence[Hashable],
+        interval: float,
+        callback: ChangeCallback,
+        deadband: Optional[float] = None,
+        data_type: str = DataType.UINT16,
+    ) -> Subscription:
+        subscription = Subscription(addresses, interval, callback, deadband, data_type)
+        subscription.next_due = self.clock()
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.remove(subscription)
+
+    def next_due(self) -> Optional[float]:
+        """Returns when the next subscription is due, None if there is none."""
+        with self._lock:
+            if not self._subscriptions:
+                return None
+            return min(sub.next_due for sub in self._subscriptions)
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """
+        Scan every due subscription once, returns the number of subscriptions
+        that were due.
+        """
+        if now is None:
+            now = self.clock()
+        with self._lock:
+            due = [sub for sub in self._subscriptions if sub.next_due <= now]
+        if not due:
+            return 0
+
+        addresses = frozenset(address for sub in due for address in sub.addresses)
+        try:
+            values = self._plan(addresses).execute(self.client, self.window)
+        except (OSError, FinsException) as exc:
+            self.failures += 1
+            self.last_error = exc
+            values = None
+        self.ticks += 1
+
+        for sub in due:
+            missed = int((now - sub.next_due) // sub.interval)
+            if missed:
+                sub.misses += missed
+                self.misses += missed
+            sub.next_due += (missed + 1) * sub.interval
+            if values is None:
+                sub.failures += 1
+                sub.errors += len(sub.addresses)
+                sub.next_due = max(sub.next_due, now + self.backoff)
+                continue
+            changes = sub._changes(values)
+            if changes:
+                sub.callback(changes)
+        return len(due)
+
+    def _plan(self, addresses: FrozenSet) -> ReadPlan:
+        plan = self._plans.get(addresses)
+        if plan is None:
+            if len(self._plans) >= 64:
+                self._plans.clear()
+            plan = self._plans[addresses] = self.planner.plan(addresses)
+        return plan
+
+    def run(self) -> None:
+        """Poll subscriptions until :meth:`stop` is called."""
+        while not self._stop.is_set():
+            self.poll()
+            next_due = self.next_due()
+            delay = 0.1 if next_due is None else next_due - self.clock()
+            if delay > 0:
+                self._stop.wait(delay)
+
+    def start(self) -> None:
+        """Run the scheduler in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("Scheduler is already running")
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run_thread, daemon=True)
+        self._thread.start()
+
+    def _run_thread(self) -> None:
+        try:
+            self.run()
+        except BaseException as exc:
+            self.error = exc
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
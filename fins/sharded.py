@@ -0,0 +1,241 @@
+"""
+Multi-process sharded polling.
+
+A :class:`ShardedPoller` splits the polled targets across worker processes.
+Each worker reads its targets with a :class:`FinsClient` and planned
+requests, decodes the values and writes them to a shared
+:class:`TagTable <fins.tagtable.TagTable>`, which the parent and any other
+process read without copying.
+"""
+
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from .adapters import DataType, _data_type, swap_word_bytes
+from .client import FinsClient
+from .exceptions import FinsException
+from .memory import MemoryArea
+from .planner import ReadPlanner
+from .tagtable import TagTable, TagValue
+from .target import Target
+
+
+@dataclass(frozen=True)
+class Tag:
+    """
+    A value polled from ``address`` of ``target``.
+
+    Without ``data_type``, the raw value of a word or bit address is polled.
+    Otherwise the words holding a ``data_type`` value are polled and decoded.
+    """
+
+    name: str
+    target: Target
+    address: str
+    data_type: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.data_type is None:
+            return
+        if self.data_type == DataType.BCD:
+            raise ValueError("BCD tags are not supported")
+        _data_type(self.data_type)
+        if MemoryArea(self.address).is_bit_set():
+            raise ValueError("Decoded tags must have a word address")
+
+    @property
+    def words(self) -> List[bytes]:
+        """Returns the addresses read for this tag."""
+        address = MemoryArea(self.address)
+        count = _data_type(self.data_type)[2] if self.data_type else 1
+        return [address.offset(index).raw for index in range(count)]
+
+    @property
+    def width(self) -> int:
+        """Returns the size of the value in bytes."""
+        if self.data_type is None:
+            return 1 if MemoryArea(self.address).is_bit_set() else 2
+        return _data_type(self.data_type)[2] * 2
+
+
+def shard(tags: Sequence[Tag], shards: int) -> List[List[Tag]]:
+    """
+    Split ``tags`` in at most ``shards`` groups of whole targets, balancing
+    the number of tags per group.
+    """
+    by_target: Dict[Target, List[Tag]] = {}
+    for tag in tags:
+        by_target.setdefault(tag.target, []).append(tag)
+    groups: List[List[Tag]] = [[] for _ in range(min(shards, len(by_target)))]
+    for target_tags in sorted(by_target.values(), key=len, reverse=True):
+        min(groups, key=len).extend(target_tags)
+    return groups
+
+
+def _poll_shard(
+    table_name: str,
+    tags: List[Tag],
+    interval: float,
+    window: int,
+    client_options: Dict,
+    stop,
+) -> None:
+    """Worker process main loop, polling ``tags`` until ``stop`` is set."""
+    table = TagTable.attach(table_name, use_numpy=False)
+    planner = ReadPlanner()
+    by_target: Dict[Target, List[Tag]] = {}
+    for tag in tags:
+        by_target.setdefault(tag.target, []).append(tag)
+    polls = []
+    for target, target_tags in by_target.items():
+        client = FinsClient.from_target(target, **client_options)
+        plan = planner.plan({word for tag in target_tags for word in tag.words})
+        slots = [
+            (table.slot(tag.name), tag.words, tag.data_type) for tag in target_tags
+        ]
+        polls.append([client, plan, slots, False])
+
+    next_due = time.monotonic()
+    try:
+        while not stop.is_set():
+            for poll in polls:
+                client, plan, slots, connected = poll
+                try:
+                    if not connected:
+                        client.reconnect()
+                        poll[3] = True
+                    commands, adapters = plan.commands(client)
+                    responses = client.send_many(commands, window, adapters)
+                except (OSError, FinsException):
+                    poll[3] = client.mode == "udp"
+                    continue
+                now = time.time()
+                values = plan.scatter(responses)
+                end_codes = plan.end_codes(responses)
+                for slot, words, data_type in slots:
+                    parts = [values.get(word) for word in words]
+                    if None in parts:
+                        # Keep the last value, flagged with the end code.
+                        codes = [end_codes[word] for word in words if word in end_codes]
+                        if codes:
+                            table.write(slot, None, now, codes[0])
+                        continue
+                    data = b"".join(parts)
+                    if data_type is not None:
+                        data = swap_word_bytes(data).tobytes()
+                    table.write(slot, data, now)
+            next_due += interval
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                stop.wait(delay)
+            else:
+                next_due = time.monotonic()
+    finally:
+        for client, _, _, _ in polls:
+            client.close()
+        table.close()
+
+
+class ShardedPoller:
+    """
+    Poll tags every ``interval`` seconds in ``processes`` worker processes.
+
+    Targets are split across the workers, all tags of a target being polled
+    by the same worker, and values are published to a shared
+    :class:`TagTable <fins.tagtable.TagTable>`. Tags that fail to be read
+    keep their last value and timestamp. Other processes attach to the table
+    with ``TagTable.attach(poller.name)``.
+    """
+
+    def __init__(
+        self,
+        tags: Sequence[Tag],
+        interval: float = 1.0,
+        processes: Optional[int] = None,
+        window: int = 8,
+        name: Optional[str] = None,
+        start_method: Optional[str] = None,
+        **client_options,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        names = [tag.name for tag in tags]
+        if len(set(names)) != len(names):
+            raise ValueError("Tag names must be unique")
+        self.tags = list(tags)
+        self.interval = interval
+        self.processes = processes or os.cpu_count() or 1
+        self.window = window
+        self.client_options = client_options
+        #: Tags polled by every worker.
+        self.shards = shard(self.tags, self.processes)
+
+        self._context = multiprocessing.get_context(start_method)
+        self._requested_name = name
+        self._stop = self._context.Event()
+        self._workers: List[multiprocessing.Process] = []
+        #: Table of the polled values, created by :meth:`start`.
+        self.table: Optional[TagTable] = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the shared memory table."""
+        if self.table is None:
+            raise RuntimeError("Poller is not running")
+        return self.table.name
+
+    def __enter__(self) -> "ShardedPoller":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Create the table and start the worker processes."""
+        if self.table is not None:
+            raise RuntimeError("Poller is already running")
+        self.table = TagTable.create(
+            {tag.name: tag.width for tag in self.tags},
+            self._requested_name,
+            {tag.name: tag.data_type for tag in self.tags if tag.data_type},
+        )
+        self._stop.clear()
+        for tags in self.shards:
+            worker = self._context.Process(
+                target=_poll_shard,
+                args=(
+                    self.table.name,
+                    tags,
+                    self.interval,
+                    self.window,
+                    self.client_options,
+                    self._stop,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers and destroy the table."""
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+        self._workers = []
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+
+    def read(self, name: str) -> TagValue:
+        """Returns a consistent copy of the last value of a tag."""
+        return self.table.read(name)
+
+    def view(self, name: str):
+        """Returns the value of a tag without copying, see :meth:`TagTable.view`."""
+        return self.table.view(name)
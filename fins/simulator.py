@@ -0,0 +1,598 @@
+"""
+A local FINS PLC simulator.
+
+:class:`FinsSimulator` answers FINS commands over UDP or TCP from an in-memory
+model of the CIO, W, H, A, D and EM areas, with configurable latency, jitter,
+packet loss and error end codes. It runs in a background thread of the current
+process or standalone::
+
+    python -m fins.simulator --port 9600 --mode udp --latency 0.002
+"""
+
+import argparse
+import heapq
+import itertools
+import random
+import select
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Tuple, Union
+
+from .command import CommandCode, SetResetSpecCode
+from .discovery import CONTROLLER_DATA
+from .memory import BIT_AREAS_WORD, MemoryArea, MemoryAreaCode
+from .response_codes import RESPONSE_CODES
+from .tcp import FinsTcpCommand, FrameReader, build_frame, check_error
+from .version import __version__
+
+#: Number of words of every simulated word area.
+AREA_SIZES = {
+    MemoryAreaCode.CIO_WORD: 6144,
+    MemoryAreaCode.WORK_WORD: 512,
+    MemoryAreaCode.HOLDING_WORD: 1536,
+    MemoryAreaCode.AUXILIARY_WORD: 1152,
+    MemoryAreaCode.DATA_MEMORY_WORD: 32768,
+}
+AREA_SIZES.update(
+    (bytes((code,)), 32768)
+    for code in itertools.chain(range(0xA0, 0xB0), range(0x60, 0x69))
+)
+
+#: Word area of every bit area code, including the EM banks.
+BIT_AREAS = dict(BIT_AREAS_WORD)
+BIT_AREAS.update(
+    (bytes((bit,)), bytes((word,)))
+    for bit, word in itertools.chain(
+        zip(range(0x20, 0x30), range(0xA0, 0xB0)),
+        zip(range(0xE0, 0xE9), range(0x60, 0x69)),
+    )
+)
+
+
+class EndCode:
+    NORMAL = b"\x00\x00"
+    UNDEFINED_COMMAND = b"\x04\x01"
+    COMMAND_TOO_SHORT = b"\x10\x02"
+    INCORRECT_FORMAT = b"\x10\x04"
+    INVALID_AREA = b"\x11\x01"
+    INACCESSIBLE_ADDRESS = b"\x11\x03"
+    RANGE_EXCEEDED = b"\x11\x04"
+    PARAMETER_ERROR = b"\x11\x0c"
+
+
+class _CommandError(Exception):
+    def __init__(self, end_code: bytes) -> None:
+        super().__init__(RESPONSE_CODES.get(end_code, "Unknown"))
+        self.end_code = end_code
+
+
+_ADDRESS = struct.Struct(">BHB")
+_READ = struct.Struct(">BHBH")
+_TRANSFER = struct.Struct(">BHBBHBH")
+
+
+class PlcMemory:
+    """
+    Word addressed memory of the simulated PLC.
+
+    Every word area is a ``bytearray`` holding big-endian words, bit area
+    codes address the bits of their word area. EM banks are allocated on
+    first access. Forced bits keep their value when written.
+    """
+
+    def __init__(self, sizes: Optional[Dict[bytes, int]] = None) -> None:
+        self.sizes = dict(AREA_SIZES if sizes is None else sizes)
+        self._areas: Dict[bytes, bytearray] = {}
+        # Word area -> word -> (forced mask, forced values)
+        self._forced: Dict[bytes, Dict[int, Tuple[int, int]]] = {}
+
+    def area(self, code: bytes) -> bytearray:
+        """Returns the storage of a word area, raises for unknown areas."""
+        area = self._areas.get(code)
+        if area is None:
+            size = self.sizes.get(code)
+            if size is None:
+                raise _CommandError(EndCode.INVALID_AREA)
+            area = self._areas[code] = bytearray(size * 2)
+        return area
+
+    def _locate(self, code: bytes, word: int, bit: int, count: int):
+        if code in BIT_AREAS:
+            area = self.area(BIT_AREAS[code])
+            if bit > 15:
+                raise _CommandError(EndCode.PARAMETER_ERROR)
+            start, end = word * 16 + bit, word * 16 + bit + count
+            if end > len(area) * 8:
+                raise _CommandError(EndCode.RANGE_EXCEEDED)
+            return area, start, end, True
+        area = self.area(code)
+        if bit:
+            raise _CommandError(EndCode.PARAMETER_ERROR)
+        if word * 2 >= len(area):
+            raise _CommandError(EndCode.INACCESSIBLE_ADDRESS)
+        if (word + count) * 2 > len(area):
+            raise _CommandError(EndCode.RANGE_EXCEEDED)
+        return area, word * 2, (word + count) * 2, False
+
+    def read_raw(self, code: bytes, word: int, bit: int, count: int) -> bytes:
+        area, start, end, bits = self._locate(code, word, bit, count)
+        if not bits:
+            return bytes(area[start:end])
+        return bytes(
+            area[(i >> 4) * 2 + (i & 15 < 8)] >> (i & 7) & 1 for i in range(start, end)
+        )
+
+    def write_raw(self, code: bytes, word: int, bit: int, count: int, data) -> None:
+        area, start, end, bits = self._locate(code, word, bit, count)
+        if bits:
+            if len(data) != count:
+                raise _CommandError(EndCode.INCORRECT_FORMAT)
+            for i, value in zip(range(start, end), data):
+                self._set_bit(area, i, value)
+            word_area, first, last = BIT_AREAS[code], start >> 4, (end - 1) >> 4
+        else:
+            if len(data) != end - start:
+                raise _CommandError(EndCode.INCORRECT_FORMAT)
+            area[start:end] = data
+            word_area, first, last = code, start // 2, end // 2 - 1
+        self._apply_forced(word_area, first, last)
+
+    def fill_raw(self, code: bytes, word: int, bit: int, count: int, value) -> None:
+        if code in BIT_AREAS or len(value) != 2:
+            raise _CommandError(EndCode.INCORRECT_FORMAT)
+        self.write_raw(code, word, bit, count, bytes(value) * count)
+
+    @staticmethod
+    def _set_bit(area: bytearray, index: int, value: int) -> None:
+        position = (index >> 4) * 2 + (index & 15 < 8)
+        mask = 1 << (index & 7)
+        if value:
+            area[position] |= mask
+        else:
+            area[position] &= ~mask & 0xFF
+
+    def _apply_forced(self, code: bytes, first: int, last: int) -> None:
+        forced = self._forced.get(code)
+        if not forced:
+            return
+        area = self._areas[code]
+        for word, (mask, values) in forced.items():
+            if first <= word <= last:
+                current = int.from_bytes(area[word * 2 : word * 2 + 2], "big")
+                current = (current & ~mask) | values
+                area[word * 2 : word * 2 + 2] = current.to_bytes(2, "big")
+
+    def force(self, spec: bytes, code: bytes, word: int, bit: int) -> None:
+        """Apply a forced set/reset specification to a bit address."""
+        word_area = BIT_AREAS.get(code)
+        if word_area is None or bit > 15:
+            raise _CommandError(EndCode.INVALID_AREA)
+        area, index, _, _ = self._locate(code, word, bit, 1)
+        forced = self._forced.setdefault(word_area, {})
+        mask, values = forced.pop(word, (0, 0))
+        bit_mask = 1 << bit
+        mask &= ~bit_mask
+        values &= ~bit_mask
+        if spec in (SetResetSpecCode.FORCE_SET, SetResetSpecCode.FORCE_RESET):
+            mask |= bit_mask
+            if spec == SetResetSpecCode.FORCE_SET:
+                values |= bit_mask
+            self._set_bit(area, index, spec == SetResetSpecCode.FORCE_SET)
+        elif spec == SetResetSpecCode.FORCED_RELEASED_BIT_ON:
+            self._set_bit(area, index, 1)
+        elif spec == SetResetSpecCode.FORCED_RELEASED_BIT_OFF:
+            self._set_bit(area, index, 0)
+        elif spec != SetResetSpecCode.FORCED_RELEASED:
+            raise _CommandError(EndCode.PARAMETER_ERROR)
+        if mask:
+            forced[word] = (mask, values)
+
+    def release_all(self) -> None:
+        """Release every forced bit, keeping their current values."""
+        self._forced.clear()
+
+    def is_forced(self, address: Union[str, bytes]) -> bool:
+        addr = MemoryArea(address)
+        word_area = BIT_AREAS.get(addr.area, addr.area)
+        mask, _ = self._forced.get(word_area, {}).get(
+            int.from_bytes(addr.word, "big"), (0, 0)
+        )
+        return bool(mask >> addr.bit[0] & 1)
+
+    def read(self, address: Union[str, bytes], num_items: int = 1) -> bytes:
+        """Read ``num_items`` words, or bits, starting at ``address``."""
+        code, word, bit = _ADDRESS.unpack(MemoryArea(address).raw)
+        return self.read_raw(bytes((code,)), word, bit, num_items)
+
+    def write(self, address: Union[str, bytes], data: bytes) -> None:
+        """Write words, or one byte per bit, starting at ``address``."""
+        addr = MemoryArea(address)
+        code, word, bit = _ADDRESS.unpack(addr.raw)
+        count = len(data) if addr.area in BIT_AREAS else len(data) // 2
+        self.write_raw(bytes((code,)), word, bit, count, data)
+
+
+class FinsSimulator:
+    """
+    A simulated PLC answering FINS commands over UDP or TCP.
+
+    Supported commands are memory area read, write, fill, multiple read and
+    transfer, run, stop, forced set/reset, forced set/reset cancel and
+    controller data read, other commands are answered with an undefined
+    command end code. Frames addressed to another node than ``node`` (or 0)
+    are ignored. Every response
+    is delayed by ``latency`` plus a uniform random ``jitter``, dropped with
+    probability ``loss``, and replaced by one of ``error_codes`` with
+    probability ``error_rate``. Use port 0 to bind an ephemeral port.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9600,
+        mode: Literal["tcp", "udp"] = "udp",
+        node: int = 1,
+        memory: Optional[PlcMemory] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        loss: float = 0.0,
+        error_rate: float = 0.0,
+        error_codes: Sequence[bytes] = (b"\x02\x05",),
+        seed: Optional[int] = None,
+    ) -> None:
+        if mode not in ("tcp", "udp"):
+            raise ValueError("Invalid mode. Please set mode as tcp or udp.")
+        for code in error_codes:
+            if code not in RESPONSE_CODES:
+                raise ValueError(f"Unknown end code: {code!r}")
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.node = node
+        self.memory = memory or PlcMemory()
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.error_rate = error_rate
+        self.error_codes = list(error_codes)
+
+        #: Operating mode of the simulated CPU.
+        self.cpu_mode = "program"
+        #: Model and version returned by controller data reads.
+        self.model = "FINS-SIMULATOR"
+        self.version = __version__
+        #: Number of requests received.
+        self.requests: int = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._handlers: Dict[bytes, Callable[[memoryview], bytes]] = {
+            CommandCode.MEMORY_AREA_READ: self._memory_area_read,
+            CommandCode.MEMORY_AREA_WRITE: self._memory_area_write,
+            CommandCode.MEMORY_AREA_FILL: self._memory_area_fill,
+            CommandCode.MULTIPLE_MEMORY_AREA_READ: self._multiple_memory_area_read,
+            CommandCode.MEMORY_AREA_TRANSFER: self._memory_area_transfer,
+            CommandCode.RUN: self._run,
+            CommandCode.STOP: self._stop,
+            CommandCode.FORCED_SET_RESET: self._forced_set_reset,
+            CommandCode.FORCED_SET_RESET_CANCEL: self._forced_set_reset_cancel,
+            CommandCode.CONTROLLER_DATA_READ: self._controller_data_read,
+        }
+        self._socket: Optional[socket.socket] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connections: List[socket.socket] = []
+        self._client_nodes = itertools.count(self.node + 1)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Returns the bound address, only valid once started."""
+        return self._socket.getsockname()[:2]
+
+    def __enter__(self) -> "FinsSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def bind(self) -> None:
+        if self.mode == "udp":
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        else:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.host, self.port))
+        if self.mode == "tcp":
+            self._socket.listen()
+
+    def start(self) -> None:
+        """Bind and serve in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("Simulator is already running")
+        self.bind()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        for connection in self._connections:
+            connection.close()
+        self._connections.clear()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def drop_connections(self) -> None:
+        """Close every TCP connection, e.g. to test reconnects."""
+        for connection in list(self._connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+        self._connections.clear()
+
+    def serve_forever(self) -> None:
+        """Serve requests until :meth:`stop` is called."""
+        if self._socket is None:
+            self.bind()
+        if self.mode == "udp":
+            self._serve_udp()
+        else:
+            self._serve_tcp()
+
+    def _delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        return self.latency + self._random.uniform(0.0, self.jitter)
+
+    def _serve_udp(self) -> None:
+        sock = self._socket
+        # Delayed responses: (due, sequence, frame, address)
+        delayed: List[Tuple[float, int, bytes, tuple]] = []
+        sequence = itertools.count()
+        sock.setblocking(False)
+        while not self._stopping.is_set():
+            timeout = 0.1
+            if delayed:
+                timeout = min(timeout, max(0.0, delayed[0][0] - time.monotonic()))
+            readable, _, _ = select.select([sock], [], [], timeout)
+            # Drain every pending datagram before waiting again.
+            while readable:
+                try:
+                    frame, address = sock.recvfrom(65536)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    continue
+                response = self.handle(frame)
+                if response is None:
+                    continue
+                delay = self._delay()
+                if delay:
+                    due = time.monotonic() + delay
+                    heapq.heappush(delayed, (due, next(sequence), response, address))
+                else:
+                    sock.sendto(response, address)
+            now = time.monotonic()
+            while delayed and delayed[0][0] <= now:
+                _, _, response, address = heapq.heappop(delayed)
+                sock.sendto(response, address)
+
+    def _serve_tcp(self) -> None:
+        while not self._stopping.is_set():
+            readable, _, _ = select.select([self._socket], [], [], 0.1)
+            if not readable:
+                continue
+            connection, _ = self._socket.accept()
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._connections.append(connection)
+            threading.Thread(
+                target=self._serve_connection, args=(connection,), daemon=True
+            ).start()
+
+    def _serve_connection(self, connection: socket.socket) -> None:
+        reader = FrameReader(connection)
+        try:
+            while not self._stopping.is_set():
+                command, error_code, payload = reader.read_frame()
+                check_error(error_code)
+                if command == FinsTcpCommand.NODE_ADDRESS_REQUEST:
+                    client_node = int.from_bytes(payload[:4], "big")
+                    if not client_node:
+                        client_node = next(self._client_nodes) & 0xFF
+                    connection.sendall(
+                        build_frame(
+                            client_node.to_bytes(4, "big")
+                            + self.node.to_bytes(4, "big"),
+                            FinsTcpCommand.NODE_ADDRESS_RESPONSE,
+                        )
+                    )
+                elif command == FinsTcpCommand.FRAME_SEND:
+                    response = self.handle(bytes(payload))
+                    if response is not None:
+                        delay = self._delay()
+                        if delay:
+                            time.sleep(delay)
+                        connection.sendall(build_frame(response))
+        except (OSError, ValueError, ConnectionError):
+            pass
+        finally:
+            connection.close()
+            try:
+                self._connections.remove(connection)
+            except ValueError:
+                pass
+
+    def handle(self, frame: bytes) -> Optional[bytes]:
+        """
+        Returns the response to a FINS command frame, None if the request is
+        lost or is not a valid command.
+        """
+        if len(frame) < 12 or frame[0] & 0x40 or frame[4] not in (0, self.node):
+            return None
+        with self._lock:
+            self.requests += 1
+        if self.loss and self._random.random() < self.loss:
+            return None
+        code = frame[10:12]
+        if self.error_rate and self._random.random() < self.error_rate:
+            end_code, data = self._random.choice(self.error_codes), b""
+        else:
+            handler = self._handlers.get(code)
+            try:
+                if handler is None:
+                    raise _CommandError(EndCode.UNDEFINED_COMMAND)
+                with self._lock:
+                    data = handler(memoryview(frame)[12:])
+                end_code = EndCode.NORMAL
+            except _CommandError as exc:
+                end_code, data = exc.end_code, b""
+            except struct.error:
+                end_code, data = EndCode.COMMAND_TOO_SHORT, b""
+        header = bytes(
+            (0xC0, 0x00, 0x02)
+            + tuple(frame[6:9])  # destination: the source of the request
+            + tuple(frame[3:6])
+            + (frame[9],)
+        )
+        return b"".join((header, code, end_code, data))
+
+    def _memory_area_read(self, data: memoryview) -> bytes:
+        code, word, bit, count = _READ.unpack(data[:6])
+        return self.memory.read_raw(bytes((code,)), word, bit, count)
+
+    def _memory_area_write(self, data: memoryview) -> bytes:
+        code, word, bit, count = _READ.unpack(data[:6])
+        self.memory.write_raw(bytes((code,)), word, bit, count, data[6:])
+        return b""
+
+    def _memory_area_fill(self, data: memoryview) -> bytes:
+        code, word, bit, count = _READ.unpack(data[:6])
+        self.memory.fill_raw(bytes((code,)), word, bit, count, data[6:])
+        return b""
+
+    def _multiple_memory_area_read(self, data: memoryview) -> bytes:
+        if not data or len(data) % 4:
+            raise _CommandError(EndCode.INCORRECT_FORMAT)
+        items = []
+        for code, word, bit in _ADDRESS.iter_unpack(data):
+            area = bytes((code,))
+            items.append(area)
+            items.append(self.memory.read_raw(area, word, bit, 1))
+        return b"".join(items)
+
+    def _memory_area_transfer(self, data: memoryview) -> bytes:
+        src, src_word, src_bit, dst, dst_word, dst_bit, count = _TRANSFER.unpack(
+            data[:10]
+        )
+        if bytes((src,)) in BIT_AREAS or bytes((dst,)) in BIT_AREAS:
+            raise _CommandError(EndCode.INVALID_AREA)
+        words = self.memory.read_raw(bytes((src,)), src_word, src_bit, count)
+        self.memory.write_raw(bytes((dst,)), dst_word, dst_bit, count, words)
+        return b""
+
+    def _run(self, data: memoryview) -> bytes:
+        modes = {0x01: "debug", 0x02: "monitor", 0x04: "run"}
+        mode = modes.get(data[2], None) if len(data) > 2 else "monitor"
+        if mode is None:
+            raise _CommandError(EndCode.PARAMETER_ERROR)
+        self.cpu_mode = mode
+        return b""
+
+    def _stop(self, data: memoryview) -> bytes:
+        self.cpu_mode = "program"
+        return b""
+
+    def _forced_set_reset(self, data: memoryview) -> bytes:
+        (count,) = struct.unpack(">H", data[:2])
+        if len(data) != 2 + count * 6:
+            raise _CommandError(EndCode.INCORRECT_FORMAT)
+        for offset in range(2, len(data), 6):
+            code, word, bit = _ADDRESS.unpack(data[offset + 2 : offset + 6])
+            spec = bytes(data[offset : offset + 2])
+            self.memory.force(spec, bytes((code,)), word, bit)
+        return b""
+
+    def _forced_set_reset_cancel(self, data: memoryview) -> bytes:
+        self.memory.release_all()
+        return b""
+
+    def _controller_data_read(self, data: memoryview) -> bytes:
+        sizes = self.memory.sizes
+        iom_words = sum(
+            sizes.get(code, 0)
+            for code in (
+                MemoryAreaCode.CIO_WORD,
+                MemoryAreaCode.WORK_WORD,
+                MemoryAreaCode.HOLDING_WORD,
+                MemoryAreaCode.AUXILIARY_WORD,
+            )
+        )
+        em_banks = sum(0xA0 <= code[0] < 0xB0 for code in sizes)
+        return CONTROLLER_DATA.pack(
+            self.model.encode("ascii").ljust(20),
+            self.version.encode("ascii").ljust(20),
+            b"",
+            0,
+            min(iom_words * 2 // 1024, 0xFF),
+            min(sizes.get(MemoryAreaCode.DATA_MEMORY_WORD, 0), 0xFFFF),
+            0,
+            em_banks,
+            0,
+            0,
+            0,
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Simulated FINS PLC")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9600)
+    parser.add_argument("--mode", choices=("udp", "tcp"), default="udp")
+    parser.add_argument("--node", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability")
+    parser.add_argument(
+        "--error-code",
+        action="append",
+        help="end code in hex, e.g. 0205, may be given several times",
+    )
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    error_codes = [bytes.fromhex(code) for code in args.error_code or ["0205"]]
+    simulator = FinsSimulator(
+        host=args.host,
+        port=args.port,
+        mode=args.mode,
+        node=args.node,
+        latency=args.latency,
+        jitter=args.jitter,
+        loss=args.loss,
+        error_rate=args.error_rate,
+        error_codes=error_codes,
+        seed=args.seed,
+    )
+    simulator.bind()
+    host, port = simulator.address
+    print(f"Simulating FINS PLC on {args.mode}://{host}:{port}")
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
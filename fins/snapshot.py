@@ -0,0 +1,134 @@
+import time
+from typing import Callable, List, Literal, NamedTuple, Optional, Union
+
+from .adapters import _use_numpy, numpy
+from .exceptions import FinsException
+from .memory import WORD_AREAS_BIT, MemoryArea
+
+#: Number of words compared at once by the pure Python diff.
+_BLOCK_WORDS = 64
+
+
+class ChangeEvent(NamedTuple):
+    """A word or bit whose value changed between two reads."""
+
+    #: Word address, or bit address for bit granularity.
+    address: MemoryArea
+    #: Previous value, a word as an int or a bit as a bool.
+    old: Union[int, bool]
+    #: New value.
+    new: Union[int, bool]
+    #: Time of the read that detected the change.
+    timestamp: float
+
+
+class Snapshot:
+    """
+    The last read of a word range, diffed against every new read.
+
+    The previous read is kept as one contiguous buffer. A new read equal to
+    it is detected with a single buffer comparison and yields no event;
+    otherwise only the changed words are located (vectorized with NumPy,
+    block by block without) and turned into :class:`ChangeEvent`, per word
+    or per bit depending on ``granularity``. The first read only sets the
+    baseline.
+    """
+
+    def __init__(
+        self,
+        address: Union[str, bytes],
+        num_items: int,
+        granularity: Literal["word", "bit"] = "word",
+        use_numpy: Optional[bool] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.address = MemoryArea(address)
+        if self.address.is_bit_set():
+            raise ValueError("Snapshots cover words, not bits")
+        if granularity not in ("word", "bit"):
+            raise ValueError(f"Unknown granularity: {granularity}")
+        if granularity == "bit" and self.address.area not in WORD_AREAS_BIT:
+            raise ValueError("Area has no bit addresses")
+        self.num_items = num_items
+        self.granularity = granularity
+        self.use_numpy = _use_numpy(use_numpy)
+        self.clock = clock
+
+        #: Last read words, None before the first read.
+        self.data: Optional[bytes] = None
+        #: Time of the last read.
+        self.timestamp: Optional[float] = None
+
+    def read(self, client) -> List[ChangeEvent]:
+        """Reads the range with ``client`` and returns the changes."""
+        response = client.memory_area_read(self.address, self.num_items)
+        if not response.ok:
+            raise FinsException(f"Read failed: {response.status_text}")
+        return self.update(response.data)
+
+    def diff(self, data: bytes) -> List[int]:
+        """Returns the offsets of the words of ``data`` that changed."""
+        old = self.data
+        if old is None or old == data:
+            return []
+        if len(data) != len(old):
+            raise ValueError("Data length does not match the snapshot")
+        if self.use_numpy:
+            changed = numpy.frombuffer(old, ">u2") != numpy.frombuffer(data, ">u2")
+            return numpy.flatnonzero(changed).tolist()
+        new = memoryview(data).cast("B")
+        offsets = []
+        step = _BLOCK_WORDS * 2
+        for start in range(0, len(old), step):
+            end = start + step
+            if old[start:end] != new[start:end]:
+                offsets.extend(
+                    index // 2
+                    for index in range(start, min(end, len(old)), 2)
+                    if old[index : index + 2] != new[index : index + 2]
+                )
+        return offsets
+
+    def update(
+        self, data: bytes, timestamp: Optional[float] = None
+    ) -> List[ChangeEvent]:
+        """Stores a new read of the range and returns its changes."""
+        if len(data) != self.num_items * 2:
+            raise ValueError("Data length does not match the snapshot")
+        if timestamp is None:
+            timestamp = self.clock()
+        offsets = self.diff(data)
+        old, new = self.data, bytes(data)
+        self.data, self.timestamp = new, timestamp
+        if not offsets:
+            return []
+
+        events: List[ChangeEvent] = []
+        first = int.from_bytes(self.address.word, "big")
+        for offset in offsets:
+            before = int.from_bytes(old[offset * 2 : offset * 2 + 2], "big")
+            after = int.from_bytes(new[offset * 2 : offset * 2 + 2], "big")
+            if self.granularity == "word":
+                address = self.address.offset(offset)
+                events.append(ChangeEvent(address, before, after, timestamp))
+                continue
+            word = (first + offset).to_bytes(2, "big")
+            changed = before ^ after
+            area = WORD_AREAS_BIT[self.address.area]
+            for bit in range(16):
+                if changed >> bit & 1:
+                    address = MemoryArea(area + word + bytes((bit,)))
+                    events.append(
+                        ChangeEvent(
+                            address,
+                            bool(before >> bit & 1),
+                            bool(after >> bit & 1),
+                            timestamp,
+                        )
+                    )
+        return events
+
+    def __repr__(self) -> str:
+        return "<Snapshot: {} x{} ({})>".format(
+            self.address.raw.hex(), self.num_items, self.granularity
+        )
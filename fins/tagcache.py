@@ -0,0 +1,246 @@
+"""
+Shared memory cache of the latest values of a PLC.
+
+A single :class:`TagCachePublisher` polls the subscribed memory ranges of a
+PLC and publishes the value, timestamp and end code of each one to a
+:class:`TagTable <fins.tagtable.TagTable>`. Any number of local consumers
+then read them with a :class:`TagCacheClient`, which has the same
+``memory_area_read`` signature as :class:`FinsClient` and only goes to the
+PLC, through an optional fallback client, for values that are not cached or
+are too old.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .client import BaseFinsClient
+from .exceptions import FinsException
+from .memory import BIT_AREAS_WORD, MemoryArea
+from .response import Response
+from .tagtable import TagTable
+
+#: A subscribed range: an address, or an address and a number of items.
+Subscription = Union[str, bytes, Tuple[Union[str, bytes], int]]
+
+
+def cache_key(address: Union[str, bytes], num_items: int = 1) -> str:
+    """Returns the tag name of a cached range."""
+    return f"{MemoryArea(address).raw.hex()}/{num_items}"
+
+
+def _item_range(address: MemoryArea, num_items: int) -> Tuple[int, int, int]:
+    """Returns the first item index, past the last item index and item size."""
+    word = int.from_bytes(address.word, "big")
+    if address.area in BIT_AREAS_WORD:
+        start = word * 16 + address.bit[0]
+        return start, start + num_items, 1
+    return word, word + num_items, 2
+
+
+class TagCachePublisher:
+    """
+    Poll subscribed ranges every ``interval`` seconds and publish them.
+
+    All ranges are read with pipelined requests on ``client``. A read
+    failing with an end code publishes the end code and keeps the last value,
+    a poll timing out publishes nothing so that the cached values age.
+    """
+
+    def __init__(
+        self,
+        client,
+        subscriptions: Sequence[Subscription],
+        interval: float = 1.0,
+        name: Optional[str] = None,
+        window: int = 8,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.client = client
+        self.interval = interval
+        self.window = window
+        self.ranges: List[Tuple[MemoryArea, int]] = []
+        for subscription in subscriptions:
+            if isinstance(subscription, tuple):
+                address, num_items = subscription
+            else:
+                address, num_items = subscription, 1
+            self.ranges.append((MemoryArea(address), num_items))
+        tags = {
+            cache_key(address.raw, num_items): num_items * _item_range(address, 1)[2]
+            for address, num_items in self.ranges
+        }
+        self.table = TagTable.create(tags, name)
+        self._slots = [
+            self.table.slot(cache_key(address.raw, num_items))
+            for address, num_items in self.ranges
+        ]
+
+        #: Number of polls done.
+        self.polls: int = 0
+        #: Number of polls that failed on a transport error.
+        self.errors: int = 0
+        #: Exception that stopped the background thread, if any.
+        self.error: Optional[BaseException] = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the shared memory segment."""
+        return self.table.name
+
+    def __enter__(self) -> "TagCachePublisher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def poll(self) -> bool:
+        """Read and publish every range once, returns whether it succeeded."""
+        client = self.client
+        batches = [
+            client._memory_area_read_commands(address.raw, num_items)
+            for address, num_items in self.ranges
+        ]
+        commands = [command for batch in batches for command in batch]
+        try:
+            responses = client.send_many(commands, self.window)
+        except (OSError, FinsException):
+            self.errors += 1
+            return False
+        now = time.time()
+        position = 0
+        for slot, batch in zip(self._slots, batches):
+            response = client._join_read_responses(
+                responses[position : position + len(batch)]
+            )
+            position += len(batch)
+            if response.ok:
+                self.table.write(slot, response.data, now)
+            else:
+                self.table.write(slot, None, now, int.from_bytes(response.code, "big"))
+        self.polls += 1
+        return True
+
+    def run(self) -> None:
+        """Poll until :meth:`stop` is called."""
+        next_due = time.monotonic()
+        while not self._stop.is_set():
+            self.poll()
+            next_due += self.interval
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_due = time.monotonic()
+
+    def start(self) -> None:
+        """Poll in a background thread."""
+        if self._thread is not None:
+            raise RuntimeError("Publisher is already running")
+        self._stop.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run_thread, daemon=True)
+        self._thread.start()
+
+    def _run_thread(self) -> None:
+        try:
+            self.run()
+        except BaseException as exc:
+            self.error = exc
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self) -> None:
+        """Stop polling and destroy the shared memory segment."""
+        self.stop()
+        self.table.close()
+
+
+class TagCacheClient:
+    """
+    Serve reads from the cache published under ``name``.
+
+    A read is served from the cache when a subscribed range covers it and
+    was published less than ``max_age`` seconds ago, including reads that
+    failed with an end code. Otherwise it is sent with ``client`` if given,
+    else :class:`FinsException` is raised.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_age: float = 1.0,
+        client=None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.table = TagTable.attach(name, use_numpy=False)
+        self.max_age = max_age
+        self.client = client
+        self.clock = clock
+        self.builder = BaseFinsClient()
+
+        #: Number of reads served from the cache.
+        self.hits: int = 0
+        #: Number of reads not served from the cache.
+        self.misses: int = 0
+
+        # Area code -> (first item, past the last item, item size, slot)
+        self._ranges: Dict[bytes, List[Tuple[int, int, int, int]]] = {}
+        for key, slot in self.table.slots.items():
+            raw, num_items = key.split("/")
+            address = MemoryArea(bytes.fromhex(raw))
+            start, end, size = _item_range(address, int(num_items))
+            self._ranges.setdefault(address.area, []).append((start, end, size, slot))
+
+    def __enter__(self) -> "TagCacheClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.table.close()
+
+    def _lookup(self, address: MemoryArea, num_items: int):
+        """Returns the slot covering a range and the byte offsets in its value."""
+        slot = self.table.slots.get(cache_key(address.raw, num_items))
+        if slot is not None:
+            return slot, 0, None
+        start, end, size = _item_range(address, num_items)
+        for first, last, _, slot in self._ranges.get(address.area, ()):
+            if first <= start and end <= last:
+                return slot, (start - first) * size, (end - first) * size
+        return None
+
+    def memory_area_read(
+        self, address: Union[str, bytes], num_items: int = 1
+    ) -> Response[bytes]:
+        """
+        Read ``num_items`` from ``address``, like
+        :meth:`FinsClient.memory_area_read`.
+        """
+        addr = MemoryArea(address)
+        found = self._lookup(addr, num_items)
+        if found is not None:
+            slot, start, end = found
+            value = self.table.read(slot)
+            if value.timestamp and self.clock() - value.timestamp <= self.max_age:
+                self.hits += 1
+                command = self.builder._memory_area_read_command(addr.raw, num_items)
+                return Response.local(
+                    command,
+                    value.end_code.to_bytes(2, "big"),
+                    value.value[start:end] if not value.end_code else b"",
+                )
+        self.misses += 1
+        if self.client is None:
+            raise FinsException(f"No fresh cached value for {addr.raw.hex()}")
+        return self.client.memory_area_read(address, num_items)
@@ -0,0 +1,259 @@
+"""
+Shared memory tag table.
+
+A :class:`TagTable` is a ``multiprocessing.shared_memory`` segment holding
+one fixed slot per tag: a sequence counter, the timestamp and end code of the
+last update and the value. The name to slot index is stored in the segment,
+so any process can attach to a table knowing only its name.
+
+Every slot has a single writer. The writer makes the sequence counter odd
+while it updates a slot and even again once done, so readers detect torn
+reads without taking any lock: :meth:`TagTable.read` retries them, zero-copy
+readers using :meth:`TagTable.view` check :meth:`TagTable.unchanged`.
+"""
+
+import json
+import os
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .adapters import _data_type, _use_numpy, numpy
+from .exceptions import FinsException
+
+#: Magic, version, number of slots, header size.
+HEADER = struct.Struct("<8sIII")
+MAGIC = b"FINSTAGS"
+VERSION = 1
+
+#: Sequence counter, timestamp and end code of a slot, followed by its value.
+SLOT = struct.Struct("<QdH6x")
+_SEQUENCE = struct.Struct("<Q")
+_STATE = struct.Struct("<dH")
+
+#: Number of attempts of a read racing with the writer.
+READ_ATTEMPTS = 1000
+
+Key = Union[str, int]
+
+#: Whether shared memory segments are tracked by the resource tracker.
+_TRACKED = os.name == "posix"
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Open an existing segment without tracking it. The resource tracker of a
+    process destroys the segments it tracks when the process exits, which
+    must only happen to the segments it owns.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    memory = shared_memory.SharedMemory(name)
+    if _TRACKED:
+        resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return -(-offset // alignment) * alignment
+
+
+class TagValue(NamedTuple):
+    """A consistent copy of a slot."""
+
+    value: bytes
+    #: Time of the last update, 0 if the slot was never written.
+    timestamp: float
+    #: End code of the response of the last update.
+    end_code: int
+    #: Number of updates of the slot, times 2.
+    sequence: int
+
+
+class TagTable:
+    """
+    Latest values of a fixed set of tags in shared memory.
+
+    Use :meth:`create` in the process owning the table and :meth:`attach`
+    everywhere else. Tags declared with a ``data_type`` hold decoded values
+    in little-endian layout, as decoded by
+    :func:`decode_words <fins.adapters.decode_words>`; other tags hold raw
+    PLC data.
+    """
+
+    def __init__(
+        self,
+        memory: shared_memory.SharedMemory,
+        owner: bool = False,
+        use_numpy: Optional[bool] = None,
+    ) -> None:
+        self.memory = memory
+        self.owner = owner
+        self.use_numpy = _use_numpy(use_numpy)
+        self._buf = memory.buf
+        magic, version, _, header_size = HEADER.unpack_from(self._buf)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a tag table: {memory.name}")
+        end = bytes(self._buf[HEADER.size : header_size]).index(b"\x00")
+        index = json.loads(bytes(self._buf[HEADER.size : HEADER.size + end]))
+
+        #: Tag name -> slot index.
+        self.slots: Dict[str, int] = {}
+        #: Data type of every slot, None for raw data.
+        self.data_types: List[Optional[str]] = []
+        self._layout: List[Tuple[int, int]] = []
+        offset = header_size
+        for slot, (name, width, data_type) in enumerate(index):
+            self.slots[name] = slot
+            self.data_types.append(data_type)
+            self._layout.append((offset, width))
+            offset = _align(offset + SLOT.size + width)
+
+    @classmethod
+    def create(
+        cls,
+        tags: Mapping[str, int],
+        name: Optional[str] = None,
+        data_types: Optional[Mapping[str, str]] = None,
+        use_numpy: Optional[bool] = None,
+    ) -> "TagTable":
+        """
+        Create a table of ``tags``, a mapping of tag name to value width in
+        bytes, in a new shared memory segment.
+        """
+        data_types = data_types or {}
+        for data_type in data_types.values():
+            _data_type(data_type)
+        index = [[tag, width, data_types.get(tag)] for tag, width in tags.items()]
+        if any(width < 1 for width in tags.values()):
+            raise ValueError("Tag widths must be positive")
+        encoded = json.dumps(index).encode()
+        header_size = _align(HEADER.size + len(encoded) + 1)
+        size = header_size
+        for width in tags.values():
+            size = _align(size + SLOT.size + width)
+        memory = shared_memory.SharedMemory(name, create=True, size=size)
+        HEADER.pack_into(memory.buf, 0, MAGIC, VERSION, len(index), header_size)
+        memory.buf[HEADER.size : HEADER.size + len(encoded)] = encoded
+        return cls(memory, owner=True, use_numpy=use_numpy)
+
+    @classmethod
+    def attach(cls, name: str, use_numpy: Optional[bool] = None) -> "TagTable":
+        """Attach to the table named ``name`` created by another process."""
+        return cls(_attach(name), use_numpy=use_numpy)
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def __enter__(self) -> "TagTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._layout)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.slots
+
+    def close(self) -> None:
+        """Detach from the table, the owner also destroys it."""
+        self._buf = None
+        try:
+            self.memory.close()
+        except BufferError:
+            # Views are still referenced, the segment is unmapped with them.
+            pass
+        if self.owner:
+            self.owner = False
+            self._unlink()
+
+    def _unlink(self) -> None:
+        memory = self.memory
+        if _TRACKED and sys.version_info < (3, 13):
+            # Processes sharing our resource tracker, such as multiprocessing
+            # workers, untracked the segment when attaching.
+            resource_tracker.register(memory._name, "shared_memory")
+        try:
+            memory.unlink()
+        except FileNotFoundError:
+            # Already destroyed, only stop tracking it.
+            if _TRACKED:
+                resource_tracker.unregister(memory._name, "shared_memory")
+
+    def slot(self, key: Key) -> int:
+        """Returns the slot index of a tag name, or ``key`` if already one."""
+        return key if isinstance(key, int) else self.slots[key]
+
+    def write(
+        self,
+        key: Key,
+        value: Optional[bytes],
+        timestamp: float,
+        end_code: int = 0,
+    ) -> None:
+        """
+        Update a slot. A None ``value`` only updates the timestamp and end
+        code, keeping the last value, e.g. for a failed read.
+        """
+        offset, width = self._layout[self.slot(key)]
+        if value is not None and len(value) != width:
+            raise ValueError(f"Expected {width} bytes, got {len(value)}")
+        buf = self._buf
+        sequence = _SEQUENCE.unpack_from(buf, offset)[0]
+        _SEQUENCE.pack_into(buf, offset, sequence + 1)
+        _STATE.pack_into(buf, offset + 8, timestamp, end_code)
+        if value is not None:
+            start = offset + SLOT.size
+            buf[start : start + width] = value
+        _SEQUENCE.pack_into(buf, offset, sequence + 2)
+
+    def sequence(self, key: Key) -> int:
+        """Returns the sequence counter of a slot, odd during an update."""
+        return _SEQUENCE.unpack_from(self._buf, self._layout[self.slot(key)][0])[0]
+
+    def unchanged(self, key: Key, sequence: int) -> bool:
+        """
+        Whether a slot was not updated since its counter was ``sequence``, so
+        that what was read from a view in between is consistent.
+        """
+        return not sequence & 1 and self.sequence(key) == sequence
+
+    def read(self, key: Key) -> TagValue:
+        """Returns a consistent copy of a slot."""
+        offset, width = self._layout[self.slot(key)]
+        buf = self._buf
+        start = offset + SLOT.size
+        for _ in range(READ_ATTEMPTS):
+            sequence, timestamp, end_code = SLOT.unpack_from(buf, offset)
+            if sequence & 1:
+                continue
+            value = bytes(buf[start : start + width])
+            if _SEQUENCE.unpack_from(buf, offset)[0] == sequence:
+                return TagValue(value, timestamp, end_code, sequence)
+        raise FinsException(f"Slot {key} is continuously being written")
+
+    def read_all(self) -> Dict[str, TagValue]:
+        """Returns a consistent copy of every slot, keyed by tag name."""
+        return {name: self.read(slot) for name, slot in self.slots.items()}
+
+    def view(self, key: Key):
+        """
+        Returns the value of a slot without copying: a NumPy array of its data
+        type, or of bytes for raw data, or a memoryview without NumPy.
+        """
+        slot = self.slot(key)
+        offset, width = self._layout[slot]
+        view = self._buf[offset + SLOT.size : offset + SLOT.size + width]
+        data_type = self.data_types[slot]
+        if self.use_numpy:
+            return numpy.frombuffer(
+                view, _data_type(data_type)[1] if data_type else "u1"
+            )
+        return view.cast(_data_type(data_type)[0]) if data_type else view
+
+    def __repr__(self) -> str:
+        return f"<TagTable: {self.name} ({len(self)} tags)>"
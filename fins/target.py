@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Target:
+    """
+    Network location and FINS node addresses of a PLC.
+
+    Targets are hashable and can be used as dict keys.
+    """
+
+    host: str
+    port: int = 9600
+    dna: int = 0
+    da1: int = 0
+    da2: int = 0
+    sna: int = 0
+    sa1: int = 1
+    sa2: int = 0
+
+    #: Maximum number of outstanding requests, None to use the poller default.
+    max_in_flight: Optional[int] = None
@@ -0,0 +1,142 @@
+"""
+FINS/TCP transport helpers.
+
+Over TCP every FINS frame is wrapped in a 16-byte envelope::
+
+    "FINS" | length (4) | command (4) | error code (4) | payload
+
+where ``length`` counts the bytes following the length field. Before sending
+FINS frames the client has to request a node address from the server.
+"""
+
+import socket
+import struct
+from typing import Tuple
+
+from .exceptions import FinsException
+
+FINS_TCP_MAGIC = b"FINS"
+
+ENVELOPE = struct.Struct(">4sIII")
+
+#: Size of the FINS/TCP envelope, in bytes.
+ENVELOPE_SIZE = ENVELOPE.size
+
+#: Upper bound of a sane envelope length, protects against garbage input.
+MAX_FRAME_LENGTH = 0x10000
+
+
+class FinsTcpCommand:
+    NODE_ADDRESS_REQUEST = 0
+    NODE_ADDRESS_RESPONSE = 1
+    FRAME_SEND = 2
+    FRAME_SEND_ERROR = 3
+    CONNECTION_CONFIRMATION = 6
+
+
+FINS_TCP_ERROR_CODES = {
+    0x00: "Normal",
+    0x01: "The header is not 'FINS' (ASCII code)",
+    0x02: "The data length is too long",
+    0x03: "The command is not supported",
+    0x20: "All connections are in use",
+    0x21: "The specified node is already connected",
+    0x22: "Attempt to access a protected node from an unspecified IP address",
+    0x23: "The client FINS node address is out of range",
+    0x24: "The same FINS node address is being used by the client and server",
+    0x25: "All the node addresses available for allocation have been used",
+}
+
+
+def build_frame(payload: bytes, command: int = FinsTcpCommand.FRAME_SEND) -> bytes:
+    """Wrap ``payload`` in a FINS/TCP envelope."""
+    return ENVELOPE.pack(FINS_TCP_MAGIC, 8 + len(payload), command, 0) + payload
+
+
+def build_node_address_request(client_node: int = 0) -> bytes:
+    """
+    Returns the node address request frame. A ``client_node`` of 0 asks the
+    server to assign the client node address automatically.
+    """
+    return build_frame(
+        client_node.to_bytes(4, "big"), FinsTcpCommand.NODE_ADDRESS_REQUEST
+    )
+
+
+def parse_envelope(data: bytes, offset: int = 0) -> Tuple[int, int, int]:
+    """
+    Parse an envelope and returns its ``(length, command, error_code)``.
+    """
+    magic, length, command, error_code = ENVELOPE.unpack_from(data, offset)
+    if magic != FINS_TCP_MAGIC:
+        raise FinsException("Invalid FINS/TCP frame header")
+    if not 8 <= length <= MAX_FRAME_LENGTH:
+        raise FinsException(f"Invalid FINS/TCP frame length: {length}")
+    return length, command, error_code
+
+
+def parse_node_address_response(
+    command: int, error_code: int, payload: bytes
+) -> Tuple[int, int]:
+    """
+    Returns ``(client_node, server_node)`` from a node address response.
+    """
+    check_error(error_code)
+    if command != FinsTcpCommand.NODE_ADDRESS_RESPONSE or len(payload) < 8:
+        raise FinsException("Unexpected FINS/TCP node address response")
+    client_node = int.from_bytes(payload[0:4], "big")
+    server_node = int.from_bytes(payload[4:8], "big")
+    return client_node, server_node
+
+
+def check_error(error_code: int) -> None:
+    if error_code:
+        text = FINS_TCP_ERROR_CODES.get(error_code, "Unknown")
+        raise FinsException(f"FINS/TCP error {error_code:#x}: {text}")
+
+
+class FrameReader:
+    """
+    Reassemble FINS/TCP frames from a stream socket.
+
+    Data is received with ``recv_into`` straight into a preallocated
+    ``bytearray`` and complete frames are returned as ``memoryview`` slices of
+    it, so payloads are never copied. As returned frames may still be
+    referenced by responses, a full buffer is never rewound; a fresh one is
+    allocated instead and only the incomplete tail is moved into it.
+    """
+
+    def __init__(self, sock: socket.socket, buffer_size: int = 65536) -> None:
+        self._socket = sock
+        self._buffer_size = buffer_size
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    def read_frame(self) -> Tuple[int, int, memoryview]:
+        """
+        Read the next frame and returns its ``(command, error_code, payload)``.
+        """
+        self._fill(ENVELOPE_SIZE)
+        length, command, error_code = parse_envelope(self._buffer, self._start)
+        size = 8 + length
+        self._fill(size)
+        payload = self._view[self._start + ENVELOPE_SIZE : self._start + size]
+        self._start += size
+        return command, error_code, payload
+
+    def _fill(self, size: int) -> None:
+        while self._end - self._start < size:
+            if self._start + size > len(self._buffer):
+                pending = self._end - self._start
+                buffer = bytearray(max(self._buffer_size, size))
+                buffer[:pending] = self._view[self._start : self._end]
+                self._buffer = buffer
+                self._view = memoryview(buffer)
+                self._start = 0
+                self._end = pending
+            received = self._socket.recv_into(self._view[self._end :])
+            if received == 0:
+                raise ConnectionError("Connection closed by peer")
+            self._end += received
@@ -0,0 +1,228 @@
+import threading
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from .command import MAX_MEMORY_AREA_WRITE_ITEMS, Command
+from .memory import BIT_AREAS_WORD, WORD_AREAS_BIT, MemoryArea
+from .response import Response
+
+
+class PendingWrite:
+    """
+    A buffered write, completed when its buffer is flushed.
+
+    ``ok`` tells whether every frame carrying a value of this write succeeded.
+    Values overwritten by a later write before the flush are not sent, a
+    write whose values were all overwritten is ``superseded`` and counts as
+    successful.
+    """
+
+    __slots__ = ("address", "num_items", "done", "response", "exception")
+
+    def __init__(self, address: MemoryArea, num_items: int) -> None:
+        self.address = address
+        self.num_items = num_items
+        #: Whether the write was flushed.
+        self.done = False
+        #: First failed response of the frames of this write, else the last one.
+        self.response: Optional[Response] = None
+        #: Exception raised while sending the frames of this write, if any.
+        self.exception: Optional[BaseException] = None
+
+    @property
+    def superseded(self) -> bool:
+        return self.done and self.response is None and self.exception is None
+
+    @property
+    def ok(self) -> bool:
+        if not self.done or self.exception is not None:
+            return False
+        return self.response is None or self.response.ok
+
+    def __repr__(self) -> str:
+        state = "ok" if self.ok else "failed" if self.done else "pending"
+        return "<PendingWrite: {} x{} ({})>".format(
+            self.address.raw.hex(), self.num_items, state
+        )
+
+
+class _Run:
+    __slots__ = ("area", "start", "values", "writes")
+
+    def __init__(self, area: bytes, start: int) -> None:
+        self.area = area
+        self.start = start
+        self.values: List[bytes] = []
+        self.writes: Set[PendingWrite] = set()
+
+    @property
+    def address(self) -> bytes:
+        if self.area in BIT_AREAS_WORD:
+            word, bit = divmod(self.start, 16)
+            return self.area + word.to_bytes(2, "big") + bytes((bit,))
+        return self.area + self.start.to_bytes(2, "big") + b"\x00"
+
+
+class WriteBuffer:
+    """
+    Accumulate writes and send them in as few frames as possible.
+
+    Writes to the same item are deduplicated, the last value wins. On
+    :meth:`flush`, contiguous items of the same area are merged into single
+    memory area write frames, runs of at least ``min_fill`` identical words
+    are sent as one memory area fill instead. Bit area writes are sent after
+    word area writes, so a bit write overrides an earlier write to its word,
+    and a word write drops the earlier writes to its bits. With an ``interval``, :meth:`start` flushes the buffer
+    periodically in a background thread, the client must then not be used by
+    other threads at the same time.
+    """
+
+    def __init__(
+        self,
+        client,
+        interval: Optional[float] = None,
+        window: int = 8,
+        min_fill: int = 4,
+    ) -> None:
+        self.client = client
+        self.interval = interval
+        self.window = window
+        self.min_fill = min_fill
+
+        #: Number of buffered writes.
+        self.writes: int = 0
+        #: Number of frames sent.
+        self.frames: int = 0
+
+        # Area code -> item index -> (value, write)
+        self._pending: Dict[bytes, Dict[int, Tuple[bytes, PendingWrite]]] = {}
+        self._writes: List[PendingWrite] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "WriteBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+        self.flush()
+
+    def __len__(self) -> int:
+        """Returns the number of pending items."""
+        return sum(len(items) for items in self._pending.values())
+
+    def write(
+        self, address: Union[str, bytes], data: bytes, num_items: int = 1
+    ) -> PendingWrite:
+        """
+        Buffer a write of ``num_items`` to ``address``, with the same
+        arguments as :meth:`FinsClient.memory_area_write`.
+        """
+        addr = MemoryArea(address)
+        size = 1 if addr.area in BIT_AREAS_WORD else 2
+        if len(data) != num_items * size:
+            raise ValueError(f"Expected {num_items * size} bytes of data")
+        word = int.from_bytes(addr.word, "big")
+        start = word * 16 + addr.bit[0] if size == 1 else word
+        pending = PendingWrite(addr, num_items)
+        with self._lock:
+            bits = self._pending.get(WORD_AREAS_BIT.get(addr.area))
+            if bits:
+                for index in range(start * 16, (start + num_items) * 16):
+                    bits.pop(index, None)
+            items = self._pending.setdefault(addr.area, {})
+            for index in range(num_items):
+                items[start + index] = (
+                    bytes(data[index * size : (index + 1) * size]),
+                    pending,
+                )
+            self._writes.append(pending)
+            self.writes += 1
+        return pending
+
+    def _runs(self, area: bytes, items: Dict[int, Tuple[bytes, PendingWrite]]):
+        runs: List[_Run] = []
+        for index in sorted(items):
+            value, pending = items[index]
+            run = runs[-1] if runs else None
+            if (
+                run is None
+                or index != run.start + len(run.values)
+                or len(run.values) >= MAX_MEMORY_AREA_WRITE_ITEMS
+            ):
+                run = _Run(area, index)
+                runs.append(run)
+            run.values.append(value)
+            run.writes.add(pending)
+        return runs
+
+    def _command(self, run: _Run) -> Command:
+        client = self.client
+        values = run.values
+        if (
+            run.area not in BIT_AREAS_WORD
+            and len(values) >= self.min_fill
+            and values.count(values[0]) == len(values)
+        ):
+            return client._memory_area_fill_command(run.address, values[0], len(values))
+        return client._memory_area_write_command(
+            run.address, b"".join(values), len(values)
+        )
+
+    def flush(self) -> List[PendingWrite]:
+        """
+        Send all pending writes, returns them in the order they were buffered.
+        Transport errors are raised after being recorded on the writes.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                writes, self._writes = self._writes, []
+            runs: List[_Run] = []
+            for area in sorted(pending, key=lambda area: area in BIT_AREAS_WORD):
+                runs.extend(self._runs(area, pending[area]))
+            commands = [self._command(run) for run in runs]
+            responses: List[Response] = []
+            try:
+                if commands:
+                    responses = self.client.send_many(commands, self.window)
+                    self.frames += len(commands)
+            except Exception as exc:
+                for run in runs:
+                    for write in run.writes:
+                        write.exception = exc
+                raise
+            else:
+                for run, response in zip(runs, responses):
+                    for write in run.writes:
+                        if write.response is None or write.response.ok:
+                            write.response = response
+            finally:
+                for write in writes:
+                    write.done = True
+            return writes
+
+    def start(self) -> None:
+        """Flush every ``interval`` seconds in a background thread."""
+        if self.interval is None:
+            raise ValueError("No flush interval configured")
+        if self._thread is not None:
+            raise RuntimeError("Write buffer is already running")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                # The failure is reported on the pending writes.
+                pass
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
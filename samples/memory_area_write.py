@@ -6,7 +6,7 @@ def main() -> None:
     client.connect()
     response = client.memory_area_write("CIO100.1", b"\x01")
 
-    print("Data:", response.data)
+    print("Data:", bytes(response.data))
     print("Code:", response.code)
     print("Status text:", response.status_text)
 
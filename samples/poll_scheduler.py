@@ -0,0 +1,29 @@
+import time
+
+from fins import FinsClient, PollScheduler
+
+
+def on_change(changes) -> None:
+    for address, value in changes.items():
+        print(address, "->", int.from_bytes(value, "big"))
+
+
+def main() -> None:
+    client = FinsClient(host="192.168.250.1")
+    client.connect()
+
+    scheduler = PollScheduler(client)
+    scheduler.subscribe(["D0", "D1", "D2"], 0.1, on_change)
+    scheduler.subscribe(["D100"], 1.0, on_change, deadband=5)
+    scheduler.start()
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        scheduler.stop()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
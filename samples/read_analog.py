@@ -2,7 +2,7 @@ import binascii
 import datetime
 import time
 
-from fins import FinsClient
+from fins import DataType, FinsClient, decode_words
 
 
 def main() -> None:
@@ -11,13 +11,13 @@ def main() -> None:
 
     try:
         while True:
-            response = client.memory_area_read("D0")
+            response = client.memory_area_read("D0", 8)
             print(
                 datetime.datetime.now(),
                 "response:",
                 binascii.hexlify(response.raw, b" ", 2),
-                "value:",
-                int.from_bytes(response.data, "big"),
+                "values:",
+                list(decode_words(response.data, DataType.INT16)),
                 "status:",
                 response.code,
             )
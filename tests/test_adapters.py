@@ -0,0 +1,81 @@
+import struct
+import unittest
+
+from fins.adapters import DataType, WordDataAdapter, decode_words, encode_words, numpy
+
+
+class DecodeWordsTest(unittest.TestCase):
+    def test_int16(self) -> None:
+        data = b"\x00\x01\xff\xff\x80\x00"
+        self.assertEqual(
+            list(decode_words(data, DataType.INT16, False)), [1, -1, -32768]
+        )
+        self.assertEqual(
+            list(decode_words(data, DataType.UINT16, False)), [1, 65535, 32768]
+        )
+
+    def test_word_swapped_32bit(self) -> None:
+        # 0x12345678 is stored low word first.
+        data = b"\x56\x78\x12\x34"
+        self.assertEqual(list(decode_words(data, DataType.UINT32, False)), [0x12345678])
+        self.assertEqual(
+            list(decode_words(b"\xff\xfe\xff\xff", DataType.INT32, False)), [-2]
+        )
+
+        real = struct.pack(">f", 1.5)
+        values = decode_words(real[2:] + real[:2], DataType.REAL, False)
+        self.assertEqual(list(values), [1.5])
+
+    def test_lreal(self) -> None:
+        raw = struct.pack(">d", -2.25)
+        data = raw[6:8] + raw[4:6] + raw[2:4] + raw[0:2]
+        self.assertEqual(list(decode_words(data, DataType.LREAL, False)), [-2.25])
+
+    def test_bcd(self) -> None:
+        self.assertEqual(
+            list(decode_words(b"\x12\x34\x00\x99", DataType.BCD, False)), [1234, 99]
+        )
+
+    def test_invalid_length(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_words(b"\x00\x01", DataType.REAL, False)
+
+    def test_adapter(self) -> None:
+        adapter = WordDataAdapter(DataType.INT16, use_numpy=False)
+        self.assertEqual(list(adapter(b"\xff\xfe")), [-2])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self) -> None:
+        data = encode_words([1.5, -3.25], DataType.REAL)
+        values = decode_words(data, DataType.REAL, True)
+        self.assertEqual(values.tolist(), [1.5, -3.25])
+        self.assertEqual(decode_words(b"\x12\x34", DataType.BCD, True).tolist(), [1234])
+
+
+class EncodeWordsTest(unittest.TestCase):
+    def test_roundtrip(self) -> None:
+        for data_type, values in [
+            (DataType.INT16, [-1, 2, 300]),
+            (DataType.UINT16, [0, 65535]),
+            (DataType.INT32, [-70000, 70000]),
+            (DataType.UINT32, [0x12345678]),
+            (DataType.REAL, [1.5, -0.25]),
+            (DataType.LREAL, [1e100, -3.5]),
+            (DataType.BCD, [1234, 9999, 0]),
+        ]:
+            data = encode_words(values, data_type)
+            self.assertEqual(list(decode_words(data, data_type, False)), values)
+
+    def test_word_order(self) -> None:
+        self.assertEqual(
+            encode_words([0x12345678], DataType.UINT32), b"\x56\x78\x12\x34"
+        )
+        self.assertEqual(encode_words([1234], DataType.BCD), b"\x12\x34")
+
+    def test_bcd_range(self) -> None:
+        with self.assertRaises(ValueError):
+            encode_words([10000], DataType.BCD)
+
+
+if __name__ == "__main__":
+    unittest.main()
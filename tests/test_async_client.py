@@ -0,0 +1,115 @@
+import asyncio
+import socket
+import unittest
+
+from fins.async_client import AsyncFinsClient
+from fins.exceptions import FinsException, FinsTimeoutError
+from fins.simulator import FinsSimulator
+
+
+class AsyncFinsClientTest(unittest.TestCase):
+    mode = "udp"
+
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0, mode=self.mode, seed=1)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        for word in range(64):
+            self.simulator.memory.write(f"D{word}", word.to_bytes(2, "big"))
+
+    def run_client(self, scenario, **kwargs):
+        async def main():
+            client = AsyncFinsClient(*self.simulator.address, mode=self.mode, **kwargs)
+            await client.connect()
+            try:
+                return await scenario(client)
+            finally:
+                await client.close()
+
+        return asyncio.run(main())
+
+    def test_concurrent_reads(self) -> None:
+        self.simulator.jitter = 0.02
+
+        async def scenario(client):
+            return await asyncio.gather(
+                *(client.memory_area_read(f"D{word}") for word in range(64))
+            )
+
+        responses = self.run_client(scenario, timeout=2, max_in_flight=16)
+        for word, response in enumerate(responses):
+            self.assertTrue(response.ok)
+            self.assertEqual(response.sid, response.command.sid)
+            self.assertEqual(bytes(response.data), word.to_bytes(2, "big"))
+        self.assertEqual(len({response.sid for response in responses}), 64)
+
+    def test_timeout_releases_sid(self) -> None:
+        self.simulator.loss = 1.0
+
+        async def scenario(client):
+            results = await asyncio.gather(
+                *(client.memory_area_read(f"D{word}") for word in range(4)),
+                return_exceptions=True,
+            )
+            pending = dict(client._pending)
+            self.simulator.loss = 0.0
+            return results, pending, await client.memory_area_read("D5")
+
+        results, pending, response = self.run_client(
+            scenario, timeout=0.1, max_in_flight=2
+        )
+        for result in results:
+            self.assertIsInstance(result, FinsTimeoutError)
+        self.assertEqual(pending, {})
+        self.assertEqual(bytes(response.data), b"\x00\x05")
+
+    def test_late_response_is_ignored(self) -> None:
+        self.simulator.latency = 0.15
+
+        async def scenario(client):
+            with self.assertRaises(FinsTimeoutError):
+                await client.memory_area_read("D1")
+            self.simulator.latency = 0.0
+            await asyncio.sleep(0.2)
+            return await client.memory_area_read("D2")
+
+        response = self.run_client(scenario, timeout=0.05)
+        self.assertEqual(bytes(response.data), b"\x00\x02")
+
+    def test_not_connected(self) -> None:
+        client = AsyncFinsClient()
+        command = client._memory_area_read_command("D0", 1)
+        with self.assertRaises(FinsException):
+            asyncio.run(client.send(command))
+        with self.assertRaises(ValueError):
+            AsyncFinsClient(max_in_flight=0)
+
+
+class AsyncFinsClientTcpTest(AsyncFinsClientTest):
+    mode = "tcp"
+
+    def test_handshake(self) -> None:
+        async def scenario(client):
+            return client.sa1, client.da1
+
+        self.assertEqual(self.run_client(scenario), (2, self.simulator.node))
+
+    def test_handshake_timeout(self) -> None:
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        self.addCleanup(server.close)
+        client = AsyncFinsClient(*server.getsockname(), timeout=0.1, mode="tcp")
+
+        async def main():
+            try:
+                await client.connect()
+            finally:
+                await client.close()
+
+        with self.assertRaises(FinsTimeoutError):
+            asyncio.run(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+
+from fins.adapters import bitset, decode_bits, encode_bits, numpy
+from fins.async_client import AsyncFinsClient
+from fins.client import FinsClient
+from fins.simulator import FinsSimulator
+
+
+class BitCodecTest(unittest.TestCase):
+    def test_decode_bits(self) -> None:
+        data = bytes.fromhex("12348001")
+        bits = decode_bits(data, use_numpy=False)
+        self.assertEqual(
+            [i for i, bit in enumerate(bits) if bit], [2, 4, 5, 9, 12, 16, 31]
+        )
+        self.assertEqual(decode_bits(data, 3, 3, use_numpy=False), [False, True, True])
+        self.assertEqual(bitset(data), 0x80011234)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_decode_bits_numpy(self) -> None:
+        data = bytes.fromhex("12348001")
+        self.assertEqual(
+            decode_bits(data, 1, 20, use_numpy=True).tolist(),
+            decode_bits(data, 1, 20, use_numpy=False),
+        )
+        self.assertEqual(encode_bits(decode_bits(data)), data)
+
+    def test_encode_bits(self) -> None:
+        self.assertEqual(encode_bits([True, False, True]), b"\x00\x05")
+        self.assertEqual(encode_bits([False] * 15 + [True, True]), b"\x80\x00\x00\x01")
+
+    def test_invalid_range(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_bits(b"\x00\x00", 10, 7)
+
+
+class BitClientTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0)
+        self.simulator.start()
+        self.client = FinsClient(*self.simulator.address, timeout=1)
+        self.client.connect()
+        self.memory = self.simulator.memory
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.simulator.stop()
+
+    def test_read_bits(self) -> None:
+        self.memory.write("CIO100", b"\x00\x08\x00\x01")
+        bits = self.client.read_bits("CIO100.03", 14, use_numpy=False)
+        self.assertEqual(bits, [True] + [False] * 12 + [True])
+        self.assertEqual(self.simulator.requests, 1)
+
+    def test_read_many_bits(self) -> None:
+        self.memory.write("W0", b"\xff\xff" * 250)
+        bits = self.client.read_bits("W0", 4000, use_numpy=False)
+        self.assertEqual(len(bits), 4000)
+        self.assertTrue(all(bits))
+        self.assertEqual(self.simulator.requests, 1)
+
+    def test_write_methods(self) -> None:
+        self.memory.write("D0", b"\xff\xff\xff\xff")
+        for method in ("bit", "read_modify_write", "force"):
+            self.assertTrue(
+                self.client.write_bits("D0.14", [False] * 4, method=method).ok
+            )
+            self.assertEqual(self.memory.read("D0", 2), b"\x3f\xff\xff\xfc")
+            self.memory.write("D0", b"\xff\xff\xff\xff")
+
+    def test_write_words(self) -> None:
+        self.client.write_bits("W10", [True] * 32)
+        self.assertEqual(self.memory.read("W10", 2), b"\xff\xff\xff\xff")
+
+    def test_grouped_multiple_read(self) -> None:
+        self.memory.write("CIO5", b"\x00\x06")
+        addresses = ["CIO5.00", "CIO5.01", "CIO5.02", "D0", "CIO5"]
+        grouped = self.client.multiple_memory_area_read(*addresses, group_bits=True)
+        plain = self.client.multiple_memory_area_read(*addresses)
+        self.assertEqual(grouped.data, plain.data)
+        self.assertEqual(grouped.data[:3], [b"\x00", b"\x01", b"\x01"])
+        self.assertEqual(len(grouped.command.data), 8)
+
+    def test_async(self) -> None:
+        async def main():
+            client = AsyncFinsClient(*self.simulator.address, timeout=1)
+            async with client:
+                await client.write_bits("H1.15", [True, True], method="force")
+                return await client.read_bits("H1.14", 4, use_numpy=False)
+
+        self.assertEqual(asyncio.run(main()), [False, True, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import unittest
+
+from fins.async_client import AsyncFinsClient
+from fins.cache import ReadCache
+from fins.client import FinsClient
+from fins.command import SetResetSpec, SetResetSpecCode
+from fins.memory import MemoryArea, MemoryAreaCode
+from fins.simulator import FinsSimulator
+
+
+class ReadCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.cache = ReadCache(
+            ttl=1.0,
+            area_ttls={MemoryAreaCode.CIO_WORD: 0.1, MemoryAreaCode.WORK_WORD: 0},
+            max_entries=3,
+            clock=lambda: self.now,
+        )
+
+    def test_range_hits(self) -> None:
+        cache = self.cache
+        cache.put(MemoryArea("D0"), 100, bytes(range(200)))
+        self.assertEqual(cache.get(MemoryArea("D0"), 100), bytes(range(200)))
+        self.assertEqual(cache.get(MemoryArea("D10"), 5), bytes(range(20, 30)))
+        self.assertIsNone(cache.get(MemoryArea("D99"), 2))
+        cache.put(MemoryArea("CIO0.05"), 20, bytes(20))
+        self.assertEqual(cache.get(MemoryArea("CIO1.00"), 3), bytes(3))
+        self.assertIsNone(cache.get(MemoryArea("CIO0.04"), 1))
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+
+    def test_ttl(self) -> None:
+        cache = self.cache
+        cache.put(MemoryArea("D0"), 1, b"\x00\x01")
+        cache.put(MemoryArea("CIO0.00"), 1, b"\x01")
+        cache.put(MemoryArea("W0"), 1, b"\x00\x01")
+        self.assertEqual(len(cache), 2)
+        self.now = 0.5
+        self.assertIsNotNone(cache.get(MemoryArea("D0"), 1))
+        self.assertIsNone(cache.get(MemoryArea("CIO0.00"), 1))
+        self.now = 1.0
+        self.assertIsNone(cache.get(MemoryArea("D0"), 1))
+
+    def test_lru(self) -> None:
+        cache = self.cache
+        for word in range(3):
+            cache.put(MemoryArea(f"D{word}"), 1, b"\x00\x00")
+        cache.get(MemoryArea("D0"), 1)
+        cache.put(MemoryArea("D3"), 1, b"\x00\x00")
+        self.assertIsNone(cache.get(MemoryArea("D1"), 1))
+        self.assertIsNotNone(cache.get(MemoryArea("D0"), 1))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_invalidate(self) -> None:
+        cache = self.cache
+        cache.put(MemoryArea("D0"), 10, bytes(20))
+        cache.put(MemoryArea("D20"), 10, bytes(20))
+        cache.put(MemoryArea("D10.03"), 4, bytes(4))
+        cache.invalidate(MemoryArea("D10"), 1)
+        self.assertEqual(len(cache), 2)
+        cache.invalidate(MemoryArea("D29.15"), 1)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNotNone(cache.get(MemoryArea("D0"), 10))
+        self.assertEqual(cache.invalidations, 2)
+
+    def test_generation(self) -> None:
+        cache = self.cache
+        generation = cache.generation(MemoryArea("D0"))
+        other = cache.generation(MemoryArea("H0"))
+        cache.invalidate(MemoryArea("D5.01"), 1)
+        cache.put(MemoryArea("D0"), 1, b"\x00\x01", generation)
+        cache.put(MemoryArea("H0"), 1, b"\x00\x01", other)
+        self.assertIsNone(cache.get(MemoryArea("D0"), 1))
+        self.assertIsNotNone(cache.get(MemoryArea("H0"), 1))
+        self.assertEqual(cache.discarded, 1)
+
+    def test_threads(self) -> None:
+        cache = ReadCache(ttl=60, max_entries=50)
+        errors = []
+
+        def hammer(offset: int) -> None:
+            try:
+                for word in range(2000):
+                    address = MemoryArea(f"D{(word * 7 + offset) % 200}")
+                    cache.put(address, 4, bytes(8), cache.generation(address))
+                    cache.get(MemoryArea(f"D{(word + offset) % 200}"), 2)
+                    if word % 5 == 0:
+                        cache.invalidate(MemoryArea(f"D{word % 200}"), 3)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 50)
+        self.assertEqual(
+            sum(len(keys) for keys in cache._areas.values()), len(cache._entries)
+        )
+
+
+class CachedClientTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.simulator.memory.write("D0", bytes(range(40)))
+        self.client = FinsClient(*self.simulator.address, timeout=1)
+        self.client.connect()
+        self.addCleanup(self.client.close)
+        self.client.cache = ReadCache(ttl=10)
+
+    def test_read_through(self) -> None:
+        client = self.client
+        self.assertEqual(
+            bytes(client.memory_area_read("D0", 20).data), bytes(range(40))
+        )
+        response = client.memory_area_read("D5", 2)
+        self.assertTrue(response.ok)
+        self.assertEqual(bytes(response.data), bytes(range(10, 14)))
+        self.assertEqual(response.sid, response.command.sid)
+        self.assertEqual(self.simulator.requests, 1)
+        self.assertEqual(client.cache.hits, 1)
+
+    def test_invalidation(self) -> None:
+        client = self.client
+        client.memory_area_read("D0", 20)
+        client.memory_area_write("D5", b"\xff\xff")
+        self.assertEqual(bytes(client.memory_area_read("D5").data), b"\xff\xff")
+        client.memory_area_fill("D6", b"\x00\x07", 2)
+        self.assertEqual(bytes(client.memory_area_read("D7").data), b"\x00\x07")
+        client.memory_area_transfer("D0", "D8", 1)
+        self.assertEqual(bytes(client.memory_area_read("D8").data), b"\x00\x01")
+        client.memory_area_read("CIO0", 1)
+        client.forced_set_reset(SetResetSpec(SetResetSpecCode.FORCE_SET, "CIO0.03"))
+        self.assertEqual(bytes(client.memory_area_read("CIO0").data), b"\x00\x08")
+        self.assertEqual(bytes(client.memory_area_read("D9").data), b"\x12\x13")
+        client.write_bits("D9.00", [False])
+        self.assertEqual(bytes(client.memory_area_read("D9").data), b"\x12\x12")
+        self.assertEqual(client.cache.hits, 0)
+
+    def test_async(self) -> None:
+        async def scenario():
+            client = AsyncFinsClient(*self.simulator.address, timeout=1)
+            client.cache = ReadCache(ttl=10)
+            await client.connect()
+            try:
+                await client.memory_area_read("D0", 10)
+                cached = await client.memory_area_read("D1", 2)
+                await client.memory_area_write("D1", b"\x00\x00")
+                fresh = await client.memory_area_read("D1", 2)
+            finally:
+                await client.close()
+            return cached, fresh
+
+        cached, fresh = asyncio.run(scenario())
+        self.assertEqual(bytes(cached.data), bytes(range(2, 6)))
+        self.assertEqual(bytes(fresh.data), b"\x00\x00\x04\x05")
+        self.assertEqual(self.simulator.requests, 3)
+
+    def test_async_read_racing_write(self) -> None:
+        self.simulator.latency = 0.05
+
+        async def scenario():
+            client = AsyncFinsClient(*self.simulator.address, timeout=1)
+            client.cache = ReadCache(ttl=10)
+            await client.connect()
+            try:
+                read = asyncio.ensure_future(client.memory_area_read("D0"))
+                await asyncio.sleep(0.01)
+                await client.memory_area_write("D0", b"\xff\xff")
+                before = await read
+                after = await client.memory_area_read("D0")
+            finally:
+                await client.close()
+            return before, after, client.cache
+
+        before, after, cache = asyncio.run(scenario())
+        self.assertEqual(bytes(before.data), b"\x00\x01")
+        self.assertEqual(bytes(after.data), b"\xff\xff")
+        self.assertEqual(cache.discarded, 1)
+        self.assertEqual(self.simulator.requests, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import socket
+import threading
+import unittest
+from typing import Optional
+
+from fins.client import FinsClient
+from fins.exceptions import FinsTimeoutError
+
+
+def answer(request: bytes, data: Optional[bytes] = None) -> bytes:
+    """Build the response to a memory area read, echoing its word address."""
+    if data is None:
+        data = request[13:15]
+    header = b"\xc0\x00\x02" + request[6:9] + request[3:6] + request[9:10]
+    return header + request[10:12] + b"\x00\x00" + data
+
+
+class ScriptedResponder:
+    """
+    A UDP peer that hands every request to ``script``, which returns the
+    frames to send back right away.
+    """
+
+    def __init__(self, script) -> None:
+        self.script = script
+        self.requests = []
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.settimeout(0.05)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def address(self):
+        return self._socket.getsockname()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self._socket.close()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                request, peer = self._socket.recvfrom(4096)
+            except socket.timeout:
+                continue
+            self.requests.append(request)
+            for frame in self.script(request):
+                self._socket.sendto(frame, peer)
+
+
+class SendManyTest(unittest.TestCase):
+    def connect(self, script, **attributes) -> FinsClient:
+        responder = ScriptedResponder(script)
+        responder.start()
+        self.addCleanup(responder.stop)
+        self.responder = responder
+        client = FinsClient(*responder.address, timeout=0.2)
+        for name, value in attributes.items():
+            setattr(client, name, value)
+        client.connect()
+        self.addCleanup(client.close)
+        return client
+
+    def assertMatches(self, commands, responses) -> None:
+        self.assertEqual(len(responses), len(commands))
+        for index, (command, response) in enumerate(zip(commands, responses)):
+            self.assertIs(response.command, command)
+            self.assertEqual(response.sid, command.sid)
+            self.assertEqual(bytes(response.data), index.to_bytes(2, "big"))
+
+    def test_reordered_and_duplicated(self) -> None:
+        held = []
+
+        def script(request):
+            # Answer requests in pairs, the later one first and the earlier
+            # one twice, preceded by a response to a SID never sent.
+            held.append(request)
+            if len(held) < 2:
+                return []
+            first, second = held
+            held.clear()
+            unknown = bytearray(answer(first, b"\xff\xff"))
+            unknown[9] = (first[9] + 128) & 0xFF
+            return [bytes(unknown), answer(second), answer(first), answer(first)]
+
+        client = self.connect(script)
+        commands = [client._memory_area_read_command(f"D{word}") for word in range(16)]
+        responses = client.send_many(commands, window=4)
+        self.assertMatches(commands, responses)
+        self.assertEqual(len(self.responder.requests), 16)
+
+    def test_dropped_responses_are_retransmitted(self) -> None:
+        seen = set()
+        stale = []
+
+        def script(request):
+            # Drop the first request for odd words, and answer the
+            # retransmission after a late response to the dropped request.
+            word = int.from_bytes(request[13:15], "big")
+            if word % 2 and word not in seen:
+                seen.add(word)
+                stale.append(request)
+                return []
+            frames = [answer(request)]
+            if word in seen:
+                frames.insert(0, answer(stale.pop(0), b"\xff\xff"))
+            return frames
+
+        client = self.connect(script, retries=1)
+        commands = [client._memory_area_read_command(f"D{word}") for word in range(6)]
+        responses = client.send_many(commands, window=8)
+        self.assertMatches(commands, responses)
+        self.assertEqual(len(self.responder.requests), 9)
+        retransmitted = self.responder.requests[6:]
+        self.assertEqual(
+            [int.from_bytes(request[13:15], "big") for request in retransmitted],
+            [1, 3, 5],
+        )
+        original_sids = {request[9] for request in self.responder.requests[:6]}
+        self.assertFalse(original_sids & {request[9] for request in retransmitted})
+
+    def test_dropped_responses_without_retries(self) -> None:
+        def script(request):
+            word = int.from_bytes(request[13:15], "big")
+            return [] if word == 2 else [answer(request)]
+
+        client = self.connect(script)
+        with self.assertRaises(FinsTimeoutError):
+            client.read_many([f"D{word}" for word in range(4)])
+
+    def test_read_many(self) -> None:
+        client = self.connect(lambda request: [answer(request)])
+        addresses = [f"D{word}" for word in range(20)]
+        responses = client.read_many(addresses, window=3)
+        for word, response in enumerate(responses):
+            self.assertEqual(bytes(response.data), word.to_bytes(2, "big"))
+            self.assertEqual(response.command.raw[13:15], word.to_bytes(2, "big"))
+
+
+if __name__ == "__main__":
+    unittest.main()
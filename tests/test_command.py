@@ -0,0 +1,64 @@
+import unittest
+
+from fins.command import Command, CommandCode, CommandTemplate
+from fins.header import Header
+from fins.memory import MemoryArea
+
+
+class CommandTest(unittest.TestCase):
+    def test_header_pack(self) -> None:
+        self.assertEqual(Header.pack(), Header.default().raw)
+        header = Header.from_bytes(Header.pack(sid=0x2A))
+        self.assertEqual(header.sid, b"\x2a")
+        self.assertEqual(list(header), Header.__attrs__)
+
+    def test_template(self) -> None:
+        addr = MemoryArea("D100")
+        template = CommandTemplate(Header.pack(), CommandCode.MEMORY_AREA_READ, "4sH")
+        command = template.build(5, addr.raw, 10)
+        header = Header.default()
+        header.sid = b"\x05"
+        expected = Command(CommandCode.MEMORY_AREA_READ, addr.raw + b"\x00\x0a", header)
+        self.assertEqual(command.raw, expected.raw)
+        self.assertEqual(command.sid, 5)
+        self.assertEqual(command.code, CommandCode.MEMORY_AREA_READ)
+
+        # The template buffer is reused, built commands are not affected.
+        template.build(6, addr.raw, 1)
+        self.assertEqual(command.raw, expected.raw)
+
+    def test_template_data(self) -> None:
+        template = CommandTemplate(Header.pack(), CommandCode.MEMORY_AREA_WRITE, "4sH")
+        command = template.build(1, MemoryArea("D0").raw, 1, data=b"\x12\x34")
+        self.assertEqual(command.data, MemoryArea("D0").raw + b"\x00\x01\x12\x34")
+
+    def test_sid(self) -> None:
+        command = Command.from_raw(Header.pack(sid=1) + CommandCode.STOP)
+        command.sid = 9
+        self.assertEqual(command.raw[9], 9)
+        self.assertEqual(command.header.sid, b"\x09")
+        command.sid = 10
+        self.assertEqual(command.raw, Header.pack(sid=10) + CommandCode.STOP)
+
+    def test_code_and_data_setters(self) -> None:
+        addr = MemoryArea("D0").raw
+        for command in (
+            Command(CommandCode.MEMORY_AREA_READ, addr + b"\x00\x01"),
+            Command.from_raw(
+                Header.pack() + CommandCode.MEMORY_AREA_READ + addr + b"\x00\x01"
+            ),
+        ):
+            command.code = CommandCode.MEMORY_AREA_WRITE
+            command.data = addr + b"\x00\x01\x12\x34"
+            self.assertEqual(command.code, CommandCode.MEMORY_AREA_WRITE)
+            self.assertEqual(
+                command.raw,
+                Header.pack()
+                + CommandCode.MEMORY_AREA_WRITE
+                + addr
+                + b"\x00\x01\x12\x34",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import contextlib
+import io
+import socket
+import time
+import unittest
+
+from fins.discovery import NodeScanner, candidates, main
+from fins.simulator import FinsSimulator
+from fins.target import Target
+
+
+class CandidatesTest(unittest.TestCase):
+    def test_subnet(self) -> None:
+        self.assertEqual(
+            candidates("10.0.0.0/30", sa1=9),
+            [Target("10.0.0.1", da1=1, sa1=9), Target("10.0.0.2", da1=2, sa1=9)],
+        )
+        self.assertEqual(len(candidates("192.168.250.17/24")), 254)
+
+    def test_nodes(self) -> None:
+        targets = candidates("10.0.0.7", range(1, 4), port=9601, dna=2)
+        self.assertEqual(
+            targets, [Target("10.0.0.7", 9601, dna=2, da1=node) for node in (1, 2, 3)]
+        )
+
+
+class NodeScannerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulators = []
+        for node in (10, 11, 12):
+            simulator = FinsSimulator(port=0, node=node, latency=0.01)
+            simulator.start()
+            self.addCleanup(simulator.stop)
+            self.simulators.append(simulator)
+        self.silent = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.silent.bind(("127.0.0.1", 0))
+        self.addCleanup(self.silent.close)
+
+    def targets(self):
+        return [
+            Target(*simulator.address, da1=simulator.node)
+            for simulator in self.simulators
+        ]
+
+    def test_inventory(self) -> None:
+        silent = Target(*self.silent.getsockname(), da1=13)
+        wrong_node = Target(*self.simulators[0].address, da1=14)
+        with NodeScanner(timeout=0.3) as scanner:
+            start = time.monotonic()
+            inventory = scanner.scan([silent] + self.targets() + [wrong_node])
+            elapsed = time.monotonic() - start
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual([node.target for node in inventory], self.targets())
+        node = inventory[0]
+        self.assertTrue(node.ok)
+        self.assertEqual(node.model, "FINS-SIMULATOR")
+        self.assertEqual(node.version, self.simulators[0].version)
+        self.assertEqual((node.iom_size, node.dm_words, node.em_banks), (18, 32768, 16))
+        self.assertGreater(node.rtt, 0.009)
+
+    def test_node_range(self) -> None:
+        host, port = self.simulators[1].address
+        with NodeScanner(timeout=0.3) as scanner:
+            inventory = scanner.scan(candidates(host, range(1, 255), port))
+        self.assertEqual([node.target.da1 for node in inventory], [11])
+
+    def test_max_in_flight(self) -> None:
+        with NodeScanner(timeout=0.3, max_in_flight=1) as scanner:
+            inventory = scanner.scan(self.targets())
+        self.assertEqual(len(inventory), 3)
+
+    def test_error_end_code(self) -> None:
+        simulator = self.simulators[2]
+        simulator.error_rate = 1.0
+        simulator.error_codes = [b"\x04\x01"]
+        with NodeScanner(timeout=0.3) as scanner:
+            (node,) = scanner.scan(self.targets()[2:])
+        self.assertFalse(node.ok)
+        self.assertEqual(node.end_code, 0x0401)
+        self.assertIsNone(node.dm_words)
+
+    def test_main(self) -> None:
+        host, port = self.simulators[0].address
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main([host, "--port", str(port), "--nodes", "9-10", "--timeout", "0.2"])
+        lines = output.getvalue().splitlines()
+        self.assertIn("node 10", lines[0])
+        self.assertIn("FINS-SIMULATOR", lines[0])
+        self.assertEqual(lines[-1], "1 node(s) found")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import socket
+import threading
+import unittest
+
+from fins.command import CommandCode
+from fins.exceptions import FinsTimeoutError
+from fins.fleet import FleetPoller
+from fins.planner import ReadPlanner
+from fins.response import Response
+from fins.target import Target
+
+
+class Responder(threading.Thread):
+    """Answers (multiple) memory area reads with the node number in every word."""
+
+    def __init__(self, node: int, silent: bool = False) -> None:
+        super().__init__(daemon=True)
+        self.node = node
+        self.silent = silent
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.socket.settimeout(5)
+        self.requests = []
+
+    @property
+    def port(self) -> int:
+        return self.socket.getsockname()[1]
+
+    def run(self) -> None:
+        try:
+            while True:
+                raw, address = self.socket.recvfrom(4096)
+                self.requests.append(raw)
+                if self.silent:
+                    continue
+                word = self.node.to_bytes(2, "big")
+                if raw[10:12] == CommandCode.MULTIPLE_MEMORY_AREA_READ:
+                    data = b"".join(
+                        raw[i : i + 1] + word for i in range(12, len(raw), 4)
+                    )
+                else:
+                    data = word * int.from_bytes(raw[16:18], "big")
+                header = bytearray(raw[:10])
+                header[0] = 0xC0
+                header[3:6], header[6:9] = raw[6:9], raw[3:6]
+                self.socket.sendto(
+                    bytes(header) + raw[10:12] + b"\x00\x00" + data, address
+                )
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+class FleetPollerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.responders = [Responder(node) for node in (10, 11, 12)]
+        for responder in self.responders:
+            responder.start()
+        self.targets = [
+            Target("127.0.0.1", responder.port, da1=responder.node)
+            for responder in self.responders
+        ]
+        self.poller = FleetPoller(bind=("127.0.0.1", 0), timeout=0.5)
+
+    def tearDown(self) -> None:
+        self.poller.close()
+        for responder in self.responders:
+            responder.close()
+
+    def test_poll(self) -> None:
+        plan = ReadPlanner().plan(["D0", "D1", "D100", "D200"])
+        values = self.poller.poll({target: plan for target in self.targets})
+        for target in self.targets:
+            expected = target.da1.to_bytes(2, "big")
+            self.assertEqual(
+                values[target],
+                {"D0": expected, "D1": expected, "D100": expected, "D200": expected},
+            )
+
+    def test_node_addresses(self) -> None:
+        self.poller.read_many([(target, "D0", 1) for target in self.targets])
+        for responder in self.responders:
+            self.assertEqual(responder.requests[0][4], responder.node)
+
+    def test_window(self) -> None:
+        target = self.targets[0]
+        responses = self.poller.read_many([(target, f"D{i}", 1) for i in range(20)])
+        self.assertTrue(all(isinstance(r, Response) and r.ok for r in responses))
+        sids = [raw[9] for raw in self.responders[0].requests]
+        self.assertEqual(len(set(sids)), 20)
+        self.assertEqual(responses[0].command.code, CommandCode.MEMORY_AREA_READ)
+
+    def test_timeout(self) -> None:
+        silent = Responder(13, silent=True)
+        silent.start()
+        try:
+            target = Target("127.0.0.1", silent.port, da1=13)
+            responses = self.poller.read_many(
+                [(target, "D0", 1), (self.targets[0], "D0", 1)]
+            )
+        finally:
+            silent.close()
+        self.assertIsInstance(responses[0], FinsTimeoutError)
+        self.assertTrue(responses[1].ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import threading
+import unittest
+
+from fins.client import BaseFinsClient, FinsClient
+from fins.command import CommandCode
+from fins.gateway import FinsGateway
+from fins.simulator import FinsSimulator
+from fins.target import Target
+
+
+class Replies:
+    """Collects the responses of frames submitted to a gateway."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.frames = []
+        self.done = threading.Event()
+
+    def __call__(self, frame: bytes) -> None:
+        self.frames.append(frame)
+        if len(self.frames) == self.count:
+            self.done.set()
+
+    def wait(self) -> list:
+        assert self.done.wait(5), "missing responses"
+        return sorted(self.frames, key=lambda frame: frame[9])
+
+
+class FinsGatewayTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.simulator.memory.write("D0", bytes(range(40)))
+        self.builder = BaseFinsClient()
+
+    def gateway(self, **kwargs) -> FinsGateway:
+        gateway = FinsGateway(
+            Target(*self.simulator.address), host="127.0.0.1", port=0, **kwargs
+        )
+        gateway.start()
+        self.addCleanup(gateway.stop)
+        return gateway
+
+    def read(self, address: str, num_items: int, sid: int) -> bytes:
+        command = self.builder._memory_area_read_command(address, num_items)
+        command.sid = sid
+        return command.raw
+
+    def test_forward(self) -> None:
+        gateway = self.gateway()
+        for mode, address in gateway.addresses.items():
+            with self.subTest(mode=mode):
+                client = FinsClient(*address, mode=mode, timeout=2)
+                client.connect()
+                self.assertTrue(client.memory_area_write("D100", b"\x12\x34").ok)
+                response = client.memory_area_read("D100")
+                self.assertEqual(bytes(response.data), b"\x12\x34")
+                self.assertEqual(response.sid, client.sid)
+                self.assertEqual(response.header.da1, client.sa1.to_bytes(1, "big"))
+                client.close()
+
+    def test_merge_identical_reads(self) -> None:
+        self.simulator.latency = 0.05
+        gateway = self.gateway()
+        replies = Replies(3)
+        for sid in (1, 2, 3):
+            gateway.submit(self.read("D4", 2, sid), replies)
+        frames = replies.wait()
+        self.assertEqual([frame[9] for frame in frames], [1, 2, 3])
+        self.assertEqual({frame[14:] for frame in frames}, {bytes(range(8, 12))})
+        self.assertEqual(self.simulator.requests, 1)
+        self.assertEqual(gateway.merged, 2)
+
+    def test_read_after_write_is_not_merged(self) -> None:
+        self.simulator.latency = 0.05
+        gateway = self.gateway(cache_ttl=10)
+        replies = Replies(4)
+        write = self.builder._memory_area_write_command("D4", b"\xff\xff")
+        write.sid = 2
+        gateway.submit(self.read("D4", 1, 1), replies)
+        gateway.submit(write.raw, replies)
+        gateway.submit(self.read("D4", 1, 3), replies)
+        gateway.submit(self.read("D4", 1, 4), replies)
+        frames = replies.wait()
+        self.assertEqual(frames[0][14:], b"\x08\x09")
+        self.assertEqual(frames[1][12:], b"\x00\x00")
+        self.assertEqual(frames[2][14:], b"\xff\xff")
+        self.assertEqual(frames[3][14:], b"\xff\xff")
+        self.assertEqual(self.simulator.requests, 3)
+        self.assertEqual(gateway.merged, 1)
+
+    def test_batch_reads(self) -> None:
+        gateway = self.gateway(batch_delay=0.05)
+        replies = Replies(3)
+        gateway.submit(self.read("D0", 1, 1), replies)
+        gateway.submit(self.read("D10", 2, 2), replies)
+        gateway.submit(self.read("CIO0.01", 3, 3), replies)
+        frames = replies.wait()
+        self.assertEqual(
+            frames[0][10:], CommandCode.MEMORY_AREA_READ + bytes(2) + b"\x00\x01"
+        )
+        self.assertEqual(frames[1][14:], bytes(range(20, 24)))
+        self.assertEqual(frames[2][14:], b"\x00\x00\x00")
+        self.assertEqual(self.simulator.requests, 1)
+        self.assertEqual(gateway.batched, 3)
+
+    def test_batch_fallback(self) -> None:
+        gateway = self.gateway(batch_delay=0.05)
+        replies = Replies(2)
+        gateway.submit(self.read("D2", 1, 1), replies)
+        gateway.submit(self.read("D32767", 2, 2), replies)
+        frames = replies.wait()
+        self.assertEqual(frames[0][12:], b"\x00\x00\x04\x05")
+        self.assertNotEqual(frames[1][12:14], b"\x00\x00")
+        self.assertEqual(gateway.batched, 0)
+
+    def test_cache(self) -> None:
+        gateway = self.gateway(cache_ttl=10)
+        client = FinsClient(*gateway.addresses["udp"], timeout=2)
+        client.connect()
+        self.addCleanup(client.close)
+        self.assertEqual(bytes(client.memory_area_read("D0").data), b"\x00\x01")
+        self.assertEqual(bytes(client.memory_area_read("D0").data), b"\x00\x01")
+        self.assertEqual(gateway.cache_hits, 1)
+        client.memory_area_write("D0", b"\xff\xff")
+        self.assertEqual(bytes(client.memory_area_read("D0").data), b"\xff\xff")
+        self.assertEqual(self.simulator.requests, 3)
+
+    def test_upstream_timeout(self) -> None:
+        self.simulator.loss = 1.0
+        gateway = self.gateway(timeout=0.1)
+        replies = Replies(1)
+        gateway.submit(self.read("D0", 1, 1), replies)
+        self.assertEqual(replies.wait()[0][12:14], b"\x02\x05")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from fins.adapters import numpy
+from fins.historian import Historian
+
+
+def _read_last(path: str, queue) -> None:
+    with Historian.open(path, use_numpy=False) as historian:
+        samples = historian.latest(1)
+        queue.put((samples.start, bytes(samples.values["D0"]), samples.valid()))
+
+
+class HistorianTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "history.bin")
+
+    def fill(self, use_numpy: bool) -> Historian:
+        historian = Historian.create(
+            self.path, {"D0": 2, "D10": 4}, capacity=8, use_numpy=use_numpy
+        )
+        self.addCleanup(historian.close)
+        for index in range(20):
+            historian.append(
+                [index.to_bytes(2, "big"), bytes([index] * 4)], timestamp=index
+            )
+        return historian
+
+    def test_ring(self) -> None:
+        historian = self.fill(use_numpy=False)
+        self.assertEqual(historian.count, 20)
+        self.assertEqual(len(historian), 7)
+        samples = historian.range()
+        self.assertEqual((samples.start, samples.stop), (13, 20))
+        self.assertEqual(list(samples.timestamps), list(range(13, 20)))
+        self.assertEqual(bytes(samples.values["D10"][:8]), b"\x0d" * 4 + b"\x0e" * 4)
+        self.assertEqual(historian.range(0, 15).start, 13)
+        self.assertTrue(samples.valid())
+        historian.append([b"\x00\x00", bytes(4)])
+        self.assertFalse(samples.valid())
+
+    def test_query(self) -> None:
+        historian = self.fill(use_numpy=False)
+        samples = historian.query(15, 17.5)
+        self.assertEqual(list(samples.timestamps), [15, 16, 17])
+        self.assertEqual(bytes(samples.values["D0"]), b"\x00\x0f\x00\x10\x00\x11")
+        self.assertEqual(len(historian.query(30)), 0)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_views(self) -> None:
+        historian = self.fill(use_numpy=True)
+        samples = historian.query(14)
+        self.assertEqual(samples.timestamps.tolist(), list(range(14, 20)))
+        values = samples.values["D0"]
+        self.assertEqual(values.shape, (6, 2))
+        self.assertEqual(values.view(">u2")[:, 0].tolist(), list(range(14, 20)))
+        self.assertFalse(values.flags.owndata)
+
+    def test_reader_process(self) -> None:
+        self.fill(use_numpy=False)
+        queue = multiprocessing.get_context("spawn").Queue()
+        process = multiprocessing.get_context("spawn").Process(
+            target=_read_last, args=(self.path, queue)
+        )
+        process.start()
+        result = queue.get(timeout=10)
+        process.join()
+        self.assertEqual(result, (19, b"\x00\x13", True))
+
+    def test_invalid(self) -> None:
+        historian = self.fill(use_numpy=False)
+        with self.assertRaises(ValueError):
+            historian.append([b"\x00\x00", b"\x00"])
+        reader = Historian.open(self.path, use_numpy=False)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.tags, {"D0": 2, "D10": 4})
+        with self.assertRaises(ValueError):
+            reader.append([b"\x00\x00", bytes(4)])
+        with self.assertRaises(ValueError):
+            Historian.create(self.path, {"D0": 2}, capacity=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
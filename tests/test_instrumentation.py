@@ -0,0 +1,93 @@
+import socket
+import unittest
+
+from fins.client import FinsClient
+from fins.instrumentation import Histogram, Instrumentation, prometheus_text
+from fins.simulator import FinsSimulator
+
+
+class HistogramTest(unittest.TestCase):
+    def test_percentiles(self) -> None:
+        histogram = Histogram()
+        for value in range(1, 100001):
+            histogram.record(value)
+        self.assertEqual(histogram.count, 100000)
+        self.assertEqual(histogram.min, 1)
+        self.assertEqual(histogram.max, 100000)
+        for percent in (50, 99, 99.9):
+            expected = 100000 * percent / 100
+            self.assertAlmostEqual(
+                histogram.percentile(percent) / expected, 1.0, delta=0.035
+            )
+
+    def test_small_values_are_exact(self) -> None:
+        histogram = Histogram()
+        for value in (3, 3, 7, 9):
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(50), 3)
+        self.assertEqual(histogram.percentile(100), 9)
+        self.assertEqual(histogram.count_below(8), 3)
+
+    def test_merge(self) -> None:
+        first, second = Histogram(), Histogram()
+        first.record(10)
+        second.record(1000)
+        first.merge(second)
+        self.assertEqual((first.count, first.min, first.max), (2, 10, 1000))
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0)
+        self.simulator.start()
+        self.client = FinsClient(*self.simulator.address, timeout=0.2)
+        self.client.connect()
+        self.instrumentation = Instrumentation()
+        self.client.instrumentation = self.instrumentation
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.simulator.stop()
+
+    def test_counters(self) -> None:
+        events = []
+        self.instrumentation.add_pre_send_hook(lambda client, cmd: events.append("pre"))
+        self.instrumentation.add_post_send_hook(
+            lambda client, cmd, response, elapsed: events.append("post")
+        )
+        self.client.memory_area_read("D0", 10)
+        self.client.read_many(["D0", "D1", "D2"])
+        self.client.memory_area_read("D40000")
+        node = "{}:{}/0".format(*self.simulator.address)
+        stats = self.instrumentation.snapshot()[("MEMORY_AREA_READ", node)]
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["responses"], 5)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["bytes_sent"], 5 * 18)
+        self.assertEqual(stats["latency_us"]["count"], 5)
+        self.assertEqual(
+            events, ["pre", "post"] + ["pre"] * 3 + ["post"] * 3 + ["pre", "post"]
+        )
+
+    def test_timeouts(self) -> None:
+        self.simulator.loss = 1.0
+        with self.assertRaises(socket.timeout):
+            self.client.memory_area_read("D0")
+        with self.assertRaises(socket.timeout):
+            self.client.read_many(["D0", "D1"])
+        (stats,) = self.instrumentation.snapshot().values()
+        self.assertEqual(stats["timeouts"], 3)
+        self.assertEqual(stats["responses"], 0)
+
+    def test_prometheus_text(self) -> None:
+        self.client.memory_area_read("D0")
+        text = prometheus_text(self.instrumentation)
+        self.assertIn("# TYPE fins_requests_total counter", text)
+        self.assertIn(
+            'fins_request_duration_seconds_bucket{command="MEMORY_AREA_READ"', text
+        )
+        self.assertIn('le="+Inf"} 1', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
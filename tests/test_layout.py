@@ -0,0 +1,79 @@
+import struct
+import unittest
+
+from fins.adapters import DataType, encode_words, numpy
+from fins.layout import Bit, Layout, String
+
+
+class LayoutTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.layout = Layout(
+            [
+                ("id", DataType.UINT16),
+                ("setpoint", DataType.REAL),
+                ("count", DataType.INT32),
+                ("name", String(5)),
+                ("running", Bit(0)),
+                ("alarm", Bit(3)),
+                ("code", DataType.BCD, 9),
+            ],
+            name="Recipe",
+        )
+
+    def test_offsets(self) -> None:
+        self.assertEqual(self.layout.size, 10)
+        self.assertEqual(
+            self.layout.fields,
+            ["id", "setpoint", "count", "name", "running", "alarm", "code"],
+        )
+
+    def test_unpack(self) -> None:
+        data = (
+            encode_words([7], DataType.UINT16)
+            + encode_words([2.5], DataType.REAL)
+            + encode_words([-100000], DataType.INT32)
+            + b"MIXER\x00"
+            + b"\x00\x09"
+            + b"\x12\x34"
+        )
+        (record,) = self.layout.unpack(data)
+        self.assertEqual(record.id, 7)
+        self.assertEqual(record.setpoint, 2.5)
+        self.assertEqual(record.count, -100000)
+        self.assertEqual(record.name, "MIXER")
+        self.assertTrue(record.running)
+        self.assertTrue(record.alarm)
+        self.assertEqual(record.code, 1234)
+        self.assertEqual(self.layout.pack([record]), data)
+
+    def test_roundtrip(self) -> None:
+        records = [
+            self.layout.record(i, i / 2, -i, f"R{i}", i % 2 == 0, False, i)
+            for i in range(50)
+        ]
+        data = self.layout.pack(records)
+        self.assertEqual(len(data), 50 * 20)
+        self.assertEqual(self.layout.unpack(data), records)
+
+    def test_simple_layout(self) -> None:
+        layout = Layout([("a", DataType.INT16), ("b", DataType.UINT32)])
+        data = layout.pack([{"a": -1, "b": 0x12345678}])
+        self.assertEqual(data, b"\xff\xff\x56\x78\x12\x34")
+        self.assertEqual(layout.unpack(data), [(-1, 0x12345678)])
+
+    def test_overlap(self) -> None:
+        with self.assertRaises(ValueError):
+            Layout([("a", DataType.INT32), ("b", DataType.INT16, 1)])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_unpack_array(self) -> None:
+        records = [self.layout.record(1, 1.5, 2, "AB", True, False, 42)]
+        array = self.layout.unpack_array(self.layout.pack(records))
+        self.assertEqual(array["name"][0], b"AB")
+        self.assertEqual(array["code"][0], 42)
+        self.assertTrue(array["running"][0])
+        self.assertEqual(self.layout.pack(array), self.layout.pack(records))
+
+
+if __name__ == "__main__":
+    unittest.main()
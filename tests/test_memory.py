@@ -36,6 +36,29 @@ class MemoryAreaTest(unittest.TestCase):
         dm = MemoryArea("D100.01")
         self.assertEqual(dm.raw, MemoryAreaCode.DATA_MEMORY_BIT + b"\x00\x64\x01")
 
+    def test_memory_area_offset(self) -> None:
+        dm = MemoryArea("D100").offset(999)
+        self.assertEqual(dm.raw, MemoryAreaCode.DATA_MEMORY_WORD + b"\x04\x4b\x00")
+
+        cio = MemoryArea("CIO100.15").offset(2)
+        self.assertEqual(cio.raw, MemoryAreaCode.CIO_BIT + b"\x00\x65\x01")
+
+    def test_memory_area_value(self) -> None:
+        dm = MemoryArea("D100")
+        self.assertIs(MemoryArea("D100"), dm)
+        self.assertIs(MemoryArea(dm), dm)
+        self.assertEqual(MemoryArea(dm.raw), dm)
+        self.assertEqual({dm: 1}[MemoryArea(dm.raw)], 1)
+        self.assertNotEqual(MemoryArea("D101"), dm)
+        with self.assertRaises(AttributeError):
+            dm.word = b"\x00\x00"
+
+    def test_memory_area_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            MemoryArea("X100")
+        with self.assertRaises(TypeError):
+            MemoryArea(100)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from fins.client import FinsClient
+from fins.command import Command, CommandCode
+from fins.header import Header
+from fins.memory import MemoryAreaCode
+from fins.planner import ReadPlanner
+from fins.response import Response
+
+
+def build_response(data: bytes, adapter=None, code: bytes = b"\x00\x00") -> Response:
+    return Response(
+        header=Header.default(),
+        command_code=CommandCode.MEMORY_AREA_READ,
+        code=code,
+        data=data,
+        command=Command(CommandCode.MEMORY_AREA_READ),
+        adapter=adapter,
+    )
+
+
+class ReadPlannerTest(unittest.TestCase):
+    def test_merge_nearby_words(self) -> None:
+        plan = ReadPlanner(max_gap=4).plan(["D100", "D101", "D104", "D250", "D251"])
+        self.assertEqual(len(plan.spans), 2)
+        self.assertEqual(len(plan.multiples), 0)
+        self.assertEqual(
+            plan.spans[0].address, MemoryAreaCode.DATA_MEMORY_WORD + b"\x00\x64\x00"
+        )
+        self.assertEqual(plan.spans[0].count, 5)
+        self.assertEqual(plan.spans[1].count, 2)
+
+    def test_leftovers_packed_into_multiple_read(self) -> None:
+        plan = ReadPlanner(max_gap=2).plan(["D0", "D100", "W5", "CIO10.03"])
+        self.assertEqual(len(plan.spans), 0)
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(len(plan.multiples[0].addresses), 4)
+
+        plan = ReadPlanner(max_multiple_items=3).plan([f"D{i * 100}" for i in range(7)])
+        self.assertEqual([len(m.addresses) for m in plan.multiples], [3, 3, 1])
+
+    def test_span_limit(self) -> None:
+        plan = ReadPlanner(max_span=10).plan([f"D{i}" for i in range(25)])
+        self.assertEqual([span.count for span in plan.spans], [10, 10, 5])
+
+    def test_scatter(self) -> None:
+        plan = ReadPlanner().plan(["D10", "D11", "D11.02", "H7"])
+        span_response = build_response(b"\x12\x34\x00\x04")
+        commands, adapters = plan.commands(FinsClient())
+        multi_response = build_response(b"\xb2\xab\xcd", adapters[1])
+        values = plan.scatter([span_response, multi_response])
+        self.assertEqual(
+            values,
+            {
+                "D10": b"\x12\x34",
+                "D11": b"\x00\x04",
+                "D11.02": b"\x01",
+                "H7": b"\xab\xcd",
+            },
+        )
+
+        failed = build_response(b"", code=b"\x11\x03")
+        self.assertIsNone(plan.scatter([failed, multi_response])["D10"])
+        self.assertEqual(
+            plan.end_codes([failed, multi_response]),
+            {"D10": 0x1103, "D11": 0x1103, "D11.02": 0x1103},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+import socket
+import unittest
+
+from fins.client import FinsClient
+from fins.exceptions import CircuitOpenError, FinsException, FinsTimeoutError
+from fins.fleet import FleetPoller
+from fins.resilience import CircuitBreaker, RttEstimator
+from fins.simulator import FinsSimulator
+from fins.target import Target
+
+
+class RttEstimatorTest(unittest.TestCase):
+    def test_update(self) -> None:
+        rtt = RttEstimator(initial=1.0, min_timeout=0.001)
+        self.assertEqual(rtt.timeout, 1.0)
+        rtt.update(0.01)
+        self.assertAlmostEqual(rtt.srtt, 0.01)
+        self.assertAlmostEqual(rtt.timeout, 0.03)
+        for _ in range(50):
+            rtt.update(0.01)
+        self.assertLess(rtt.timeout, 0.015)
+
+    def test_backoff(self) -> None:
+        rtt = RttEstimator(initial=0.1, max_timeout=0.3)
+        rtt.backoff()
+        self.assertAlmostEqual(rtt.timeout, 0.2)
+        rtt.backoff()
+        self.assertAlmostEqual(rtt.timeout, 0.3)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_transitions(self) -> None:
+        now = [0.0]
+        breaker = CircuitBreaker(2, reset_timeout=10, clock=lambda: now[0])
+        breaker.failure()
+        self.assertTrue(breaker.allow())
+        breaker.failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        now[0] = 10.0
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        now[0] = 20.0
+        self.assertTrue(breaker.allow())
+        breaker.success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.rejected, 2)
+
+    def test_lost_probe(self) -> None:
+        now = [0.0]
+        breaker = CircuitBreaker(1, reset_timeout=10, clock=lambda: now[0])
+        breaker.failure()
+        now[0] = 10.0
+        self.assertTrue(breaker.allow())
+        now[0] = 15.0
+        self.assertFalse(breaker.allow())
+        now[0] = 20.0
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+
+class ClientResilienceTest(unittest.TestCase):
+    mode = "udp"
+
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0, mode=self.mode, seed=3)
+        self.simulator.start()
+        self.client = FinsClient(*self.simulator.address, timeout=0.1, mode=self.mode)
+        self.client.connect()
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.simulator.stop()
+
+    def test_retransmit_reads(self) -> None:
+        self.simulator.loss = 0.3
+        self.client.retries = 10
+        self.client.rtt = RttEstimator(initial=0.05, min_timeout=0.02)
+        for _ in range(5):
+            self.assertTrue(self.client.memory_area_read("D0").ok)
+        responses = self.client.read_many([f"D{i}" for i in range(10)])
+        self.assertTrue(all(response.ok for response in responses))
+        self.assertGreater(self.simulator.requests, 15)
+
+    def test_writes_are_not_retransmitted(self) -> None:
+        self.simulator.loss = 1.0
+        self.client.retries = 3
+        with self.assertRaises(FinsTimeoutError):
+            self.client.memory_area_write("D0", b"\x00\x01")
+        self.assertEqual(self.simulator.requests, 1)
+
+    def test_circuit_breaker(self) -> None:
+        self.simulator.loss = 1.0
+        self.client.breaker = CircuitBreaker(2, reset_timeout=60)
+        for _ in range(2):
+            with self.assertRaises(socket.timeout):
+                self.client.memory_area_read("D0")
+        with self.assertRaises(CircuitOpenError):
+            self.client.memory_area_read("D0")
+        self.assertEqual(self.simulator.requests, 2)
+
+    def test_probe_raising_fins_exception(self) -> None:
+        now = [0.0]
+        breaker = CircuitBreaker(1, reset_timeout=10, clock=lambda: now[0])
+        self.client.breaker = breaker
+        self.simulator.loss = 1.0
+        with self.assertRaises(FinsTimeoutError):
+            self.client.memory_area_read("D0")
+        self.simulator.loss = 0.0
+
+        def broken_recv():
+            raise FinsException("FINS/TCP error 0x3: The command is not supported")
+
+        for request in (
+            lambda: self.client.memory_area_read("D0"),
+            lambda: self.client.read_many(["D0", "D1"]),
+        ):
+            now[0] += 10
+            self.client._recv_frame = broken_recv
+            with self.assertRaises(FinsException):
+                request()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            del self.client._recv_frame
+            with self.assertRaises(CircuitOpenError):
+                request()
+        now[0] += 10
+        self.assertTrue(self.client.memory_area_read("D0").ok)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class TcpReconnectTest(unittest.TestCase):
+    def test_reconnect(self) -> None:
+        with FinsSimulator(port=0, mode="tcp") as simulator:
+            client = FinsClient(*simulator.address, timeout=1, mode="tcp")
+            client.connect()
+            client.retries = 1
+            self.assertTrue(client.memory_area_read("D0").ok)
+            simulator.drop_connections()
+            self.assertTrue(client.memory_area_read("D0").ok)
+            client.close()
+
+
+class FleetResilienceTest(unittest.TestCase):
+    def test_dead_target_is_skipped(self) -> None:
+        with FinsSimulator(port=0, loss=1.0) as dead, FinsSimulator(port=0) as alive:
+            targets = [Target(*dead.address), Target(*alive.address)]
+            poller = FleetPoller(
+                bind=("127.0.0.1", 0),
+                timeout=0.1,
+                retries=1,
+                adaptive_timeout=True,
+                failure_threshold=1,
+                reset_timeout=60,
+            )
+            with poller:
+                first = poller.read_many([(target, "D0", 1) for target in targets])
+                self.assertIsInstance(first[0], FinsTimeoutError)
+                self.assertTrue(first[1].ok)
+                self.assertEqual(dead.requests, 2)
+                self.assertIsNotNone(poller.rtt(targets[1]).srtt)
+
+                second = poller.read_many([(target, "D0", 1) for target in targets])
+                self.assertIsInstance(second[0], CircuitOpenError)
+                self.assertTrue(second[1].ok)
+                self.assertEqual(dead.requests, 2)
+
+    def test_half_open_sends_one_probe(self) -> None:
+        now = [0.0]
+        with FinsSimulator(port=0, loss=1.0) as simulator:
+            target = Target(*simulator.address)
+            poller = FleetPoller(
+                bind=("127.0.0.1", 0),
+                timeout=0.1,
+                max_in_flight=4,
+                failure_threshold=1,
+                reset_timeout=10,
+            )
+            with poller:
+                poller.add_target(target)
+                breaker = poller.breaker(target)
+                breaker.clock = lambda: now[0]
+                reads = [(target, f"D{word}", 1) for word in range(3)]
+                poller.read_many(reads)
+                self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+                self.assertEqual(simulator.requests, 3)
+
+                now[0] = 10.0
+                results = poller.read_many(reads)
+                self.assertIsInstance(results[0], FinsTimeoutError)
+                self.assertIsInstance(results[1], CircuitOpenError)
+                self.assertIsInstance(results[2], CircuitOpenError)
+                self.assertEqual(simulator.requests, 4)
+
+                now[0] = 20.0
+                simulator.loss = 0.0
+                results = poller.read_many(reads)
+                self.assertTrue(all(result.ok for result in results))
+                self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+                self.assertEqual(simulator.requests, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from fins.adapters import MultipleMemoryAreaReadDataAdapter
+from fins.command import CommandCode
+from fins.header import Header
+from fins.memory import MemoryArea
+from fins.response import Response
+
+
+class ResponseTest(unittest.TestCase):
+    def test_from_bytes(self) -> None:
+        frame = Header.pack(sid=7) + CommandCode.MEMORY_AREA_READ + b"\x00\x00\x12\x34"
+        response = Response.from_bytes(frame, command=None)
+        self.assertTrue(response.ok)
+        self.assertEqual(response.sid, 7)
+        self.assertEqual(response.header.sid, b"\x07")
+        self.assertEqual(response.command_code, CommandCode.MEMORY_AREA_READ)
+        self.assertEqual(response.code, b"\x00\x00")
+        self.assertEqual(response.status_text, "Normal completion")
+        self.assertIsInstance(response.data, memoryview)
+        self.assertEqual(response.data, b"\x12\x34")
+        self.assertEqual(response.raw, frame)
+
+    def test_zero_copy(self) -> None:
+        frame = bytearray(Header.pack() + CommandCode.MEMORY_AREA_READ + bytes(4))
+        response = Response.from_bytes(memoryview(frame), command=None)
+        frame[-1] = 1
+        self.assertEqual(response.data, b"\x00\x01")
+
+    def test_error(self) -> None:
+        addrs = [MemoryArea("D0")]
+        frame = Header.pack() + CommandCode.MULTIPLE_MEMORY_AREA_READ + b"\x11\x03"
+        response = Response.from_bytes(
+            frame, None, MultipleMemoryAreaReadDataAdapter(addrs)
+        )
+        self.assertFalse(response.ok)
+        self.assertEqual(response.data, b"")
+
+    def test_adapter(self) -> None:
+        addrs = [MemoryArea("D0"), MemoryArea("CIO0.01")]
+        frame = (
+            Header.pack()
+            + CommandCode.MULTIPLE_MEMORY_AREA_READ
+            + b"\x00\x00\x82\x12\x34\x30\x01"
+        )
+        response = Response.from_bytes(
+            frame, None, MultipleMemoryAreaReadDataAdapter(addrs)
+        )
+        self.assertEqual(response.data, [b"\x12\x34", b"\x01"])
+        self.assertIs(response.data, response.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import threading
+import unittest
+
+from fins.adapters import DataType
+from fins.client import FinsClient
+from fins.command import CommandCode
+from fins.exceptions import FinsTimeoutError
+from fins.response import Response
+from fins.scheduler import PollScheduler
+
+
+class MemoryClient(FinsClient):
+    """Answers DM reads from a local bytearray instead of a PLC."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.memory = bytearray(2000)
+        self.requests = 0
+        self.failures = 0
+
+    def send_many(self, commands, window=8, adapters=None):
+        if self.failures:
+            self.failures -= 1
+            raise FinsTimeoutError("No response")
+        adapters = adapters or [None] * len(commands)
+        responses = []
+        for command, adapter in zip(commands, adapters):
+            self.requests += 1
+            raw = command.raw
+            if command.code == CommandCode.MEMORY_AREA_READ:
+                word = int.from_bytes(raw[13:15], "big")
+                count = int.from_bytes(raw[16:18], "big")
+                data = bytes(self.memory[word * 2 : (word + count) * 2])
+            else:
+                data = b""
+                for i in range(12, len(raw), 4):
+                    word = int.from_bytes(raw[i + 1 : i + 3], "big")
+                    data += raw[i : i + 1] + self.memory[word * 2 : word * 2 + 2]
+            frame = raw[:12] + b"\x00\x00" + data
+            responses.append(Response.from_bytes(frame, command, adapter))
+        return responses
+
+
+class PollSchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = MemoryClient()
+        self.now = 0.0
+        self.scheduler = PollScheduler(self.client, clock=lambda: self.now)
+
+    def test_merge_due_subscriptions(self) -> None:
+        first, second = [], []
+        self.scheduler.subscribe(["D0", "D1"], 1.0, first.append)
+        self.scheduler.subscribe(["D1", "D2"], 1.0, second.append)
+        self.assertEqual(self.scheduler.poll(), 2)
+        self.assertEqual(self.client.requests, 1)
+        self.assertEqual(first, [{"D0": b"\x00\x00", "D1": b"\x00\x00"}])
+        self.assertEqual(second, [{"D1": b"\x00\x00", "D2": b"\x00\x00"}])
+
+    def test_change_only(self) -> None:
+        changes = []
+        self.scheduler.subscribe(["D0", "D1"], 1.0, changes.append)
+        self.scheduler.poll()
+        self.now = 1.0
+        self.scheduler.poll()
+        self.assertEqual(len(changes), 1)
+
+        self.client.memory[3] = 5
+        self.now = 2.0
+        self.scheduler.poll()
+        self.assertEqual(changes[-1], {"D1": b"\x00\x05"})
+
+    def test_deadband(self) -> None:
+        changes = []
+        self.scheduler.subscribe(["D0"], 1.0, changes.append, deadband=10)
+        self.scheduler.poll()
+        self.client.memory[1] = 10
+        self.now = 1.0
+        self.scheduler.poll()
+        self.assertEqual(len(changes), 1)
+        self.client.memory[1] = 11
+        self.now = 2.0
+        self.scheduler.poll()
+        self.assertEqual(changes[-1], {"D0": b"\x00\x0b"})
+
+    def test_deadband_data_type(self) -> None:
+        subscribe = self.scheduler.subscribe
+        for data_type in (DataType.REAL, DataType.INT32, "STRING"):
+            with self.subTest(data_type=data_type):
+                with self.assertRaises(ValueError):
+                    subscribe(["D0"], 1.0, print, deadband=1, data_type=data_type)
+        with self.assertRaises(ValueError):
+            subscribe(["D0"], 1.0, print, deadband=-1)
+        subscribe(["D0"], 1.0, print, deadband=1, data_type=DataType.INT16)
+        subscribe(["D0"], 1.0, print, data_type=DataType.REAL)
+
+    def test_rates_and_misses(self) -> None:
+        fast = self.scheduler.subscribe(["D0"], 0.1, lambda changes: None)
+        slow = self.scheduler.subscribe(["D100"], 1.0, lambda changes: None)
+        self.scheduler.poll()
+        self.now = 0.1
+        self.assertEqual(self.scheduler.poll(), 1)
+        self.now = 0.55
+        self.scheduler.poll()
+        self.assertEqual(fast.misses, 3)
+        self.assertAlmostEqual(fast.next_due, 0.6)
+        self.assertEqual(slow.misses, 0)
+        self.assertEqual(self.scheduler.next_due(), fast.next_due)
+
+    def test_failure(self) -> None:
+        changes = []
+        scheduler = PollScheduler(self.client, clock=lambda: self.now, backoff=5.0)
+        sub = scheduler.subscribe(["D0", "D1"], 1.0, changes.append)
+        self.client.failures = 1
+        self.assertEqual(scheduler.poll(), 1)
+        self.assertEqual((scheduler.failures, sub.failures, sub.errors), (1, 1, 2))
+        self.assertIsInstance(scheduler.last_error, FinsTimeoutError)
+        self.assertEqual(sub.next_due, 5.0)
+        self.now = 5.0
+        scheduler.poll()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(sub.misses, 0)
+
+    def test_thread_survives_failure(self) -> None:
+        scheduler = PollScheduler(self.client)
+        polled = threading.Event()
+        scheduler.subscribe(["D0"], 0.01, lambda changes: polled.set())
+        self.client.failures = 1
+        scheduler.start()
+        try:
+            self.assertTrue(polled.wait(5))
+        finally:
+            scheduler.stop()
+        self.assertIsNone(scheduler.error)
+        self.assertEqual(scheduler.failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from multiprocessing import shared_memory
+
+from fins.adapters import DataType, encode_words, numpy, swap_word_bytes
+from fins.sharded import ShardedPoller, Tag, shard
+from fins.simulator import FinsSimulator
+from fins.tagtable import TagTable
+from fins.target import Target
+
+
+class TagTableTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = TagTable.create(
+            {"D0": 2, "CIO0.01": 1, "speed": 4},
+            data_types={"speed": DataType.REAL},
+            use_numpy=False,
+        )
+        self.addCleanup(self.table.close)
+
+    def test_write_read(self) -> None:
+        table = self.table
+        self.assertEqual(table.read("D0"), (b"\x00\x00", 0.0, 0, 0))
+        table.write("D0", b"\x12\x34", 5.0)
+        table.write(1, None, 6.0, 0x0101)
+        self.assertEqual(table.read("D0"), (b"\x12\x34", 5.0, 0, 2))
+        self.assertEqual(table.read("CIO0.01"), (b"\x00", 6.0, 0x0101, 2))
+        with self.assertRaises(ValueError):
+            table.write("D0", b"\x00", 7.0)
+
+    def test_attach_view(self) -> None:
+        reader = TagTable.attach(self.table.name, use_numpy=False)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.slots, {"D0": 0, "CIO0.01": 1, "speed": 2})
+        value = encode_words([1.5], DataType.REAL)
+        self.table.write("speed", swap_word_bytes(value).tobytes(), 1.0)
+        sequence = reader.sequence("speed")
+        self.assertEqual(reader.view("speed")[0], 1.5)
+        self.assertTrue(reader.unchanged("speed", sequence))
+        self.table.write("speed", bytes(4), 2.0)
+        self.assertFalse(reader.unchanged("speed", sequence))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_view(self) -> None:
+        reader = TagTable.attach(self.table.name, use_numpy=True)
+        self.addCleanup(reader.close)
+        self.table.write("D0", b"\x00\x07", 1.0)
+        self.assertEqual(reader.view("D0").tolist(), [0, 7])
+
+    def test_attach_from_process(self) -> None:
+        self.table.write("D0", b"\x12\x34", 1.0)
+        script = (
+            "import sys; from fins.tagtable import TagTable; "
+            "table = TagTable.attach(sys.argv[1], use_numpy=False); "
+            "print(table.read('D0').value.hex()); table.close()"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        for _ in range(2):
+            result = subprocess.run(
+                [sys.executable, "-c", script, self.table.name],
+                capture_output=True,
+                text=True,
+                env=env,
+                timeout=30,
+            )
+            self.assertEqual(result.stdout.strip(), "1234", result.stderr)
+            self.assertNotIn("leaked", result.stderr)
+        reader = TagTable.attach(self.table.name, use_numpy=False)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.read("D0").value, b"\x12\x34")
+
+    def test_owner_close_tolerates_unlinked(self) -> None:
+        table = TagTable.create({"D0": 2})
+        shared_memory.SharedMemory(table.name).unlink()
+        table.close()
+
+
+class ShardedPollerTest(unittest.TestCase):
+    def test_shard(self) -> None:
+        targets = [Target("10.0.0.1"), Target("10.0.0.2"), Target("10.0.0.3")]
+        tags = [Tag(f"a{i}", targets[0], f"D{i}") for i in range(4)]
+        tags += [Tag("b", targets[1], "D0"), Tag("c", targets[2], "D0")]
+        groups = shard(tags, 2)
+        self.assertEqual([len(group) for group in groups], [4, 2])
+        self.assertEqual(len(shard(tags, 8)), 3)
+        with self.assertRaises(ValueError):
+            Tag("x", targets[0], "CIO0.01", DataType.REAL)
+
+    def test_poll(self) -> None:
+        with FinsSimulator(port=0) as first, FinsSimulator(port=0) as second:
+            first.memory.write("D100", encode_words([2.5], DataType.REAL))
+            second.memory.write("CIO5", b"\x00\x02")
+            tags = [
+                Tag("temperature", Target(*first.address), "D100", DataType.REAL),
+                Tag("running", Target(*second.address), "CIO5.01"),
+                Tag("count", Target(*second.address), "D0"),
+            ]
+            poller = ShardedPoller(tags, interval=0.05, processes=2, timeout=1)
+            with poller:
+                reader = TagTable.attach(poller.name, use_numpy=False)
+                deadline = time.monotonic() + 10
+                while time.monotonic() < deadline:
+                    values = reader.read_all()
+                    if all(value.timestamp for value in values.values()):
+                        break
+                    time.sleep(0.05)
+                self.assertEqual(len(poller.shards), 2)
+                self.assertEqual(reader.view("temperature")[0], 2.5)
+                self.assertEqual(poller.read("running").value, b"\x01")
+                self.assertEqual(values["count"].value, b"\x00\x00")
+                reader.close()
+
+    def test_failing_tag(self) -> None:
+        with FinsSimulator(port=0) as simulator:
+            target = Target(*simulator.address)
+            tags = [
+                Tag("count", target, "D0"),
+                Tag("overflow", target, "D32767", DataType.REAL),
+            ]
+            with ShardedPoller(tags, interval=0.05, processes=1, timeout=1) as poller:
+                deadline = time.monotonic() + 10
+                while time.monotonic() < deadline:
+                    value = poller.read("overflow")
+                    if value.timestamp:
+                        break
+                    time.sleep(0.05)
+                self.assertEqual(value.end_code, 0x1104)
+                self.assertEqual(value.value, bytes(4))
+                self.assertEqual(poller.read("count").end_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
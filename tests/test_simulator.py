@@ -0,0 +1,136 @@
+import socket
+import threading
+import time
+import unittest
+
+from fins.client import FinsClient
+from fins.command import SetResetSpec, SetResetSpecCode
+from fins.simulator import FinsSimulator, PlcMemory
+
+
+class PlcMemoryTest(unittest.TestCase):
+    def test_words_and_bits(self) -> None:
+        memory = PlcMemory()
+        memory.write("D100", b"\x12\x34")
+        self.assertEqual(memory.read("D100"), b"\x12\x34")
+        self.assertEqual(memory.read("D100.02", 4), b"\x01\x00\x01\x01")
+        memory.write("D100.15", b"\x01")
+        self.assertEqual(memory.read("D100"), b"\x92\x34")
+
+    def test_forced_bits_keep_value(self) -> None:
+        memory = PlcMemory()
+        memory.force(SetResetSpecCode.FORCE_SET, b"\x30", 0, 3)
+        memory.write("CIO0", b"\x00\x00")
+        self.assertEqual(memory.read("CIO0"), b"\x00\x08")
+        memory.release_all()
+        memory.write("CIO0", b"\x00\x00")
+        self.assertEqual(memory.read("CIO0"), b"\x00\x00")
+
+
+class FinsSimulatorTest(unittest.TestCase):
+    mode = "udp"
+
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0, mode=self.mode, seed=1)
+        self.simulator.start()
+        host, port = self.simulator.address
+        self.client = FinsClient(host, port, timeout=1, mode=self.mode)
+        self.client.connect()
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.simulator.stop()
+
+    def test_read_write(self) -> None:
+        response = self.client.memory_area_write("D0", b"\x00\x01\x00\x02", 2)
+        self.assertTrue(response.ok)
+        self.assertEqual(
+            bytes(self.client.memory_area_read("D0", 2).data), b"\x00\x01\x00\x02"
+        )
+
+    def test_chunked_read(self) -> None:
+        self.simulator.memory.write("D2000", b"\x00\x07")
+        data = self.client.memory_area_read("D0", 2500).data
+        self.assertEqual(len(data), 5000)
+        self.assertEqual(bytes(data[4000:4002]), b"\x00\x07")
+
+    def test_fill_transfer(self) -> None:
+        self.assertTrue(self.client.memory_area_fill("W10", b"\xab\xcd", 3).ok)
+        self.assertTrue(self.client.memory_area_transfer("W10", "H0", 3).ok)
+        self.assertEqual(self.simulator.memory.read("H0", 3), b"\xab\xcd" * 3)
+
+    def test_multiple_read(self) -> None:
+        self.simulator.memory.write("D5", b"\x00\x09")
+        response = self.client.multiple_memory_area_read("D5", "D5.00", "CIO0")
+        self.assertEqual(response.data, [b"\x00\x09", b"\x01", b"\x00\x00"])
+
+    def test_run_stop(self) -> None:
+        self.assertTrue(self.client.run("run").ok)
+        self.assertEqual(self.simulator.cpu_mode, "run")
+        self.assertTrue(self.client.stop().ok)
+        self.assertEqual(self.simulator.cpu_mode, "program")
+
+    def test_forced_set_reset(self) -> None:
+        spec = SetResetSpec(SetResetSpecCode.FORCE_SET, "CIO1.00")
+        self.assertTrue(self.client.forced_set_reset(spec).ok)
+        self.assertTrue(self.simulator.memory.is_forced("CIO1.00"))
+        self.assertTrue(self.client.forced_set_reset_cancel().ok)
+        self.assertFalse(self.simulator.memory.is_forced("CIO1.00"))
+
+    def test_address_errors(self) -> None:
+        response = self.client.memory_area_read("D40000")
+        self.assertEqual(response.code, b"\x11\x03")
+        response = self.client.memory_area_read("D32767", 2)
+        self.assertEqual(response.code, b"\x11\x04")
+
+    def test_error_rate(self) -> None:
+        self.simulator.error_rate = 1.0
+        response = self.client.memory_area_read("D0")
+        self.assertEqual(response.code, b"\x02\x05")
+
+    def test_latency(self) -> None:
+        self.simulator.latency = 0.05
+        start = time.monotonic()
+        self.assertTrue(self.client.memory_area_read("D0").ok)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_request_count(self) -> None:
+        host, port = self.simulator.address
+
+        def poll() -> None:
+            client = FinsClient(host, port, timeout=1, mode=self.mode)
+            client.connect()
+            for _ in range(50):
+                client.memory_area_read("D0")
+            client.close()
+
+        threads = [threading.Thread(target=poll) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.simulator.requests, 200)
+
+
+class FinsSimulatorTcpTest(FinsSimulatorTest):
+    mode = "tcp"
+
+    def test_drop_connections(self) -> None:
+        other = FinsClient(*self.simulator.address, timeout=1, mode="tcp")
+        other.connect()
+        other.close()
+        deadline = time.monotonic() + 5
+        while len(self.simulator._connections) > 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.simulator._connections), 1)
+        (live,) = self.simulator._connections
+        dead = socket.socket()
+        dead.close()
+        self.simulator._connections.insert(0, dead)
+        self.simulator.drop_connections()
+        self.assertEqual(live.fileno(), -1)
+        self.assertEqual(self.simulator._connections, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from fins.adapters import numpy
+from fins.client import FinsClient
+from fins.memory import MemoryArea
+from fins.simulator import FinsSimulator
+from fins.snapshot import ChangeEvent, Snapshot
+
+
+class SnapshotTest(unittest.TestCase):
+    def check_word_changes(self, use_numpy: bool) -> None:
+        snapshot = Snapshot("D100", 200, use_numpy=use_numpy)
+        data = bytearray(400)
+        self.assertEqual(snapshot.update(data, timestamp=1.0), [])
+        self.assertEqual(snapshot.update(bytes(data), timestamp=2.0), [])
+        data[0:2] = b"\x00\x01"
+        data[300:302] = b"\x12\x34"
+        events = snapshot.update(data, timestamp=3.0)
+        self.assertEqual(
+            events,
+            [
+                ChangeEvent(MemoryArea("D100"), 0, 1, 3.0),
+                ChangeEvent(MemoryArea("D250"), 0, 0x1234, 3.0),
+            ],
+        )
+        self.assertEqual(snapshot.data, bytes(data))
+        self.assertEqual(snapshot.timestamp, 3.0)
+        self.assertEqual(snapshot.diff(bytes(400)), [0, 150])
+
+    def test_word_changes(self) -> None:
+        self.check_word_changes(use_numpy=False)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_word_changes_numpy(self) -> None:
+        self.check_word_changes(use_numpy=True)
+
+    def test_bit_changes(self) -> None:
+        snapshot = Snapshot("W10", 2, granularity="bit", clock=lambda: 5.0)
+        snapshot.update(b"\x00\x01\x00\x00")
+        events = snapshot.update(b"\x80\x00\x00\x00")
+        self.assertEqual(
+            events,
+            [
+                ChangeEvent(MemoryArea("W10.00"), True, False, 5.0),
+                ChangeEvent(MemoryArea("W10.15"), False, True, 5.0),
+            ],
+        )
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            Snapshot("CIO0.01", 1)
+        with self.assertRaises(ValueError):
+            Snapshot("D0", 1, granularity="byte")
+        snapshot = Snapshot("D0", 2)
+        with self.assertRaises(ValueError):
+            snapshot.update(b"\x00\x00")
+
+    def test_read(self) -> None:
+        with FinsSimulator(port=0) as simulator:
+            client = FinsClient(*simulator.address, timeout=1)
+            client.connect()
+            snapshot = Snapshot("D0", 3000)
+            self.assertEqual(snapshot.read(client), [])
+            simulator.memory.write("D2999", b"\xff\xff")
+            events = snapshot.read(client)
+            client.close()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].address, MemoryArea("D2999"))
+        self.assertEqual(events[0].new, 0xFFFF)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from fins.client import FinsClient
+from fins.exceptions import FinsException
+from fins.simulator import FinsSimulator
+from fins.tagcache import TagCacheClient, TagCachePublisher
+
+
+class TagCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+        self.client = FinsClient(*self.simulator.address, timeout=1)
+        self.client.connect()
+        self.addCleanup(self.client.close)
+        self.simulator.memory.write("D100", bytes(range(20)))
+        self.simulator.memory.write("CIO0", b"\x00\x05")
+        self.publisher = TagCachePublisher(
+            self.client, [("D100", 10), "CIO0.02", ("D0", 1200)]
+        )
+        self.addCleanup(self.publisher.close)
+        self.now = 0.0
+        self.reader = TagCacheClient(
+            self.publisher.name, max_age=1.0, clock=lambda: self.now
+        )
+        self.addCleanup(self.reader.close)
+
+    def test_hits(self) -> None:
+        self.assertTrue(self.publisher.poll())
+        requests = self.simulator.requests
+        self.now = self.reader.table.read(0).timestamp + 0.5
+        response = self.reader.memory_area_read("D100", 10)
+        self.assertTrue(response.ok)
+        self.assertEqual(response.data, bytes(range(20)))
+        self.assertEqual(response.command.raw[-6:], b"\x82\x00\x64\x00\x00\x0a")
+        self.assertEqual(
+            self.reader.memory_area_read("D102", 2).data, bytes(range(4, 8))
+        )
+        self.assertEqual(self.reader.memory_area_read("CIO0.02").data, b"\x01")
+        self.assertEqual(len(self.reader.memory_area_read("D0", 1200).data), 2400)
+        self.assertEqual(self.reader.hits, 4)
+        self.assertEqual(self.simulator.requests, requests)
+
+    def test_misses(self) -> None:
+        with self.assertRaises(FinsException):
+            self.reader.memory_area_read("D100")
+        self.publisher.poll()
+        self.now = self.reader.table.read(0).timestamp + 2
+        with self.assertRaises(FinsException):
+            self.reader.memory_area_read("D100")
+        self.reader.client = self.client
+        self.now -= 1.5
+        self.assertTrue(self.reader.memory_area_read("D1300", 2).ok)
+        self.assertEqual(self.reader.misses, 3)
+        self.assertEqual(self.reader.hits, 0)
+
+    def test_end_code(self) -> None:
+        publisher = TagCachePublisher(self.client, [("D32767", 2)])
+        self.addCleanup(publisher.close)
+        publisher.poll()
+        reader = TagCacheClient(publisher.name)
+        self.addCleanup(reader.close)
+        response = reader.memory_area_read("D32767", 2)
+        self.assertFalse(response.ok)
+        self.assertEqual(response.code, b"\x11\x04")
+
+    def test_thread(self) -> None:
+        self.publisher.interval = 0.01
+        self.publisher.start()
+        try:
+            while not self.publisher.polls:
+                pass
+        finally:
+            self.publisher.stop()
+        self.assertIsNone(self.publisher.error)
+
+    def test_consumer_processes(self) -> None:
+        self.publisher.poll()
+        script = (
+            "import sys; from fins.tagcache import TagCacheClient; "
+            "reader = TagCacheClient(sys.argv[1], max_age=60); "
+            "print(reader.memory_area_read('D101', 2).data.hex()); reader.close()"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        # Each consumer exits before the next one attaches.
+        for _ in range(3):
+            result = subprocess.run(
+                [sys.executable, "-c", script, self.publisher.name],
+                capture_output=True,
+                text=True,
+                env=env,
+                timeout=30,
+            )
+            self.assertEqual(result.stdout.strip(), "02030405", result.stderr)
+            self.assertNotIn("leaked", result.stderr)
+        self.assertTrue(self.publisher.poll())
+        reader = TagCacheClient(self.publisher.name, max_age=60)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.memory_area_read("D100").data, b"\x00\x01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import socket
+import threading
+import unittest
+
+from fins.client import FinsClient
+from fins.exceptions import FinsException
+from fins.tcp import (
+    ENVELOPE,
+    FINS_TCP_MAGIC,
+    FinsTcpCommand,
+    FrameReader,
+    build_frame,
+    build_node_address_request,
+    check_error,
+    parse_envelope,
+    parse_node_address_response,
+)
+
+
+def envelope(command: int, error_code: int, payload: bytes = b"") -> bytes:
+    header = ENVELOPE.pack(FINS_TCP_MAGIC, 8 + len(payload), command, error_code)
+    return header + payload
+
+
+class FramingTest(unittest.TestCase):
+    def test_build_parse(self) -> None:
+        frame = build_frame(b"\x80\x00\x02")
+        self.assertEqual(
+            frame[:16], b"FINS" + bytes.fromhex("0000000b" + "00000002" + "00000000")
+        )
+        self.assertEqual(parse_envelope(frame), (11, FinsTcpCommand.FRAME_SEND, 0))
+        self.assertEqual(
+            build_node_address_request(),
+            b"FINS" + bytes.fromhex("0000000c" + "00000000" + "00000000" + "00000000"),
+        )
+
+    def test_invalid_envelope(self) -> None:
+        with self.assertRaises(FinsException):
+            parse_envelope(b"SNIF" + build_frame(b"")[4:])
+        with self.assertRaises(FinsException):
+            parse_envelope(ENVELOPE.pack(FINS_TCP_MAGIC, 4, 2, 0))
+        with self.assertRaises(FinsException):
+            parse_envelope(ENVELOPE.pack(FINS_TCP_MAGIC, 0x10001, 2, 0))
+
+    def test_node_address_response(self) -> None:
+        payload = (5).to_bytes(4, "big") + (1).to_bytes(4, "big")
+        self.assertEqual(
+            parse_node_address_response(
+                FinsTcpCommand.NODE_ADDRESS_RESPONSE, 0, payload
+            ),
+            (5, 1),
+        )
+        with self.assertRaisesRegex(FinsException, "already connected"):
+            parse_node_address_response(FinsTcpCommand.NODE_ADDRESS_RESPONSE, 0x21, b"")
+        with self.assertRaises(FinsException):
+            parse_node_address_response(FinsTcpCommand.FRAME_SEND, 0, payload)
+        with self.assertRaises(FinsException):
+            parse_node_address_response(
+                FinsTcpCommand.NODE_ADDRESS_RESPONSE, 0, payload[:6]
+            )
+        with self.assertRaisesRegex(FinsException, "0x99: Unknown"):
+            check_error(0x99)
+
+
+class FrameReaderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reader_socket, self.writer_socket = socket.socketpair()
+        self.addCleanup(self.reader_socket.close)
+        self.addCleanup(self.writer_socket.close)
+
+    def test_partial_reads(self) -> None:
+        frames = [build_frame(bytes(range(n))) for n in (3, 0, 40)]
+        data = b"".join(frames)
+
+        def write() -> None:
+            for index in range(len(data)):
+                self.writer_socket.send(data[index : index + 1])
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        reader = FrameReader(self.reader_socket, buffer_size=32)
+        payloads = [bytes(reader.read_frame()[2]) for _ in frames]
+        writer.join()
+        self.assertEqual(payloads, [bytes(range(n)) for n in (3, 0, 40)])
+
+    def test_frames_in_one_read(self) -> None:
+        self.writer_socket.sendall(
+            build_frame(b"\x01\x02") + envelope(FinsTcpCommand.FRAME_SEND_ERROR, 3)
+        )
+        reader = FrameReader(self.reader_socket)
+        command, error_code, payload = reader.read_frame()
+        self.assertEqual((command, error_code), (FinsTcpCommand.FRAME_SEND, 0))
+        self.assertEqual(bytes(payload), b"\x01\x02")
+        command, error_code, payload = reader.read_frame()
+        self.assertEqual((command, error_code), (FinsTcpCommand.FRAME_SEND_ERROR, 3))
+        self.assertEqual(bytes(payload), b"")
+
+    def test_returned_payloads_are_kept(self) -> None:
+        reader = FrameReader(self.reader_socket, buffer_size=24)
+        self.writer_socket.sendall(build_frame(b"abcdef") + build_frame(b"ghijkl"))
+        first = reader.read_frame()[2]
+        second = reader.read_frame()[2]
+        self.assertEqual((bytes(first), bytes(second)), (b"abcdef", b"ghijkl"))
+
+    def test_closed_by_peer(self) -> None:
+        self.writer_socket.sendall(build_frame(b"abc")[:10])
+        self.writer_socket.close()
+        with self.assertRaises(ConnectionError):
+            FrameReader(self.reader_socket).read_frame()
+
+
+class HandshakeTest(unittest.TestCase):
+    def serve(self, response: bytes) -> FinsClient:
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        self.addCleanup(server.close)
+        self.requests = []
+
+        def answer() -> None:
+            connection, _ = server.accept()
+            with connection:
+                self.requests.append(connection.recv(64))
+                connection.sendall(response)
+
+        thread = threading.Thread(target=answer, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        client = FinsClient(*server.getsockname(), timeout=2, mode="tcp")
+        self.addCleanup(client.close)
+        return client
+
+    def test_node_addresses(self) -> None:
+        payload = (0x23).to_bytes(4, "big") + (0x0A).to_bytes(4, "big")
+        client = self.serve(envelope(FinsTcpCommand.NODE_ADDRESS_RESPONSE, 0, payload))
+        client.connect()
+        self.assertEqual(self.requests, [build_node_address_request()])
+        self.assertEqual((client.sa1, client.da1), (0x23, 0x0A))
+
+    def test_error_code(self) -> None:
+        client = self.serve(envelope(FinsTcpCommand.NODE_ADDRESS_RESPONSE, 0x20))
+        with self.assertRaisesRegex(FinsException, "All connections are in use"):
+            client.connect()
+
+
+if __name__ == "__main__":
+    unittest.main()
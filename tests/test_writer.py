@@ -0,0 +1,108 @@
+import time
+import unittest
+
+from fins.client import FinsClient
+from fins.command import CommandCode
+from fins.simulator import FinsSimulator
+from fins.writer import WriteBuffer
+
+
+class WriteBufferTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = FinsSimulator(port=0)
+        self.simulator.start()
+        self.client = FinsClient(*self.simulator.address, timeout=1)
+        self.client.connect()
+        self.sent = []
+        send_many = self.client.send_many
+
+        def record(commands, window=8, adapters=None):
+            self.sent.extend(command.code for command in commands)
+            return send_many(commands, window, adapters)
+
+        self.client.send_many = record
+        self.buffer = WriteBuffer(self.client)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.simulator.stop()
+
+    def test_merge_contiguous_words(self) -> None:
+        writes = [
+            self.buffer.write(f"D{word}", word.to_bytes(2, "big"))
+            for word in (3, 1, 2, 10)
+        ]
+        self.assertEqual(self.buffer.flush(), writes)
+        self.assertEqual(self.sent, [CommandCode.MEMORY_AREA_WRITE] * 2)
+        self.assertTrue(all(write.ok for write in writes))
+        self.assertEqual(
+            self.simulator.memory.read("D1", 3), b"\x00\x01\x00\x02\x00\x03"
+        )
+
+    def test_last_write_wins(self) -> None:
+        first = self.buffer.write("D0", b"\x00\x01\x00\x02", 2)
+        second = self.buffer.write("D0", b"\x00\x09")
+        third = self.buffer.write("D1", b"\x00\x08")
+        self.buffer.flush()
+        self.assertEqual(self.simulator.memory.read("D0", 2), b"\x00\x09\x00\x08")
+        self.assertTrue(first.superseded and first.ok)
+        self.assertFalse(second.superseded)
+        self.assertTrue(third.ok)
+        self.assertEqual(len(self.sent), 1)
+
+    def test_fill_identical_runs(self) -> None:
+        for word in range(100):
+            self.buffer.write(f"D{word}", b"\x12\x34")
+        self.buffer.flush()
+        self.assertEqual(self.sent, [CommandCode.MEMORY_AREA_FILL])
+        self.assertEqual(self.simulator.memory.read("D99"), b"\x12\x34")
+
+    def test_bits(self) -> None:
+        self.buffer.write("W0", b"\xff\xff")
+        self.buffer.write("W0.00", b"\x00")
+        self.buffer.write("W0.01", b"\x00")
+        self.buffer.flush()
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(self.simulator.memory.read("W0"), b"\xff\xfc")
+
+    def test_overlapping_bits_and_words(self) -> None:
+        bit = self.buffer.write("CIO100.03", b"\x01")
+        word = self.buffer.write("CIO100", b"\x12\x30")
+        self.buffer.flush()
+        self.assertEqual(self.simulator.memory.read("CIO100"), b"\x12\x30")
+        self.assertTrue(bit.superseded)
+        self.assertTrue(word.ok)
+        self.assertEqual(len(self.sent), 1)
+
+        self.buffer.write("CIO101", b"\x00\x00")
+        self.buffer.write("CIO101.03", b"\x01")
+        self.buffer.flush()
+        self.assertEqual(self.simulator.memory.read("CIO101"), b"\x00\x08")
+
+    def test_failed_write(self) -> None:
+        good = self.buffer.write("D0", b"\x00\x01")
+        bad = self.buffer.write("D40000", b"\x00\x01")
+        self.buffer.flush()
+        self.assertTrue(good.ok)
+        self.assertFalse(bad.ok)
+        self.assertEqual(bad.response.code, b"\x11\x03")
+
+    def test_large_run_is_split(self) -> None:
+        self.buffer.write("D0", bytes(range(256)) * 10, 1280)
+        self.buffer.flush()
+        self.assertEqual(self.sent, [CommandCode.MEMORY_AREA_WRITE] * 2)
+        self.assertEqual(self.simulator.memory.read("D0", 1280), bytes(range(256)) * 10)
+
+    def test_timer(self) -> None:
+        buffer = WriteBuffer(self.client, interval=0.01)
+        buffer.start()
+        write = buffer.write("D5", b"\x00\x05")
+        deadline = time.monotonic() + 2
+        while not write.done and time.monotonic() < deadline:
+            time.sleep(0.01)
+        buffer.stop()
+        self.assertTrue(write.ok)
+
+
+if __name__ == "__main__":
+    unittest.main()